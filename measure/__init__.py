@@ -0,0 +1,6 @@
+"""Measurement helpers shared by the pipe and Sudoku packages.
+
+Run the games and tools as modules from the repository root (python -m pipe.main,
+python -m sudoku.sudoku_benchmark) so this package imports like any other.
+"""
+from .memory import MEMORY_MODES, MemoryMeter, current_rss, peak_rss
@@ -0,0 +1,85 @@
+"""Memory measurement shared by the pipe and Sudoku solvers.
+
+Both packages import it through the measure package (pipe.profiling, sudoku.sudoku_measure)
+and only say where a solver keeps its own accounting for the "internal" mode.
+"""
+import os
+import sys
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MEMORY_MODES = ("rss", "sampling", "internal", "tracemalloc")
+
+def peak_rss():
+    """Peak resident set size of the process in bytes, from getrusage"""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def current_rss():
+    """Current resident set size in bytes, read from /proc when available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peak_rss()
+
+class MemoryMeter:
+    """Measures the memory of one solve as (current, peak) bytes, like tracemalloc.get_traced_memory()
+
+    rss         - growth of the process peak RSS from getrusage; free, but reads 0 when an
+                  earlier solve already pushed the high-water mark higher
+    sampling    - a thread polling the current RSS every interval seconds
+    internal    - the solver's own accounting of its search structures, a dict of byte
+                  counts in the attribute named by `stats`, without touching the allocator
+    tracemalloc - every Python allocation traced; exact, but slows allocation-heavy solvers
+    """
+    stats = "memory"
+
+    def __init__(self, mode="rss", solver=None, interval=0.001):
+        if mode not in MEMORY_MODES:
+            raise ValueError(f"Unknown memory mode: {mode}")
+        self.mode = mode
+        self.solver = solver
+        self.interval = interval
+        self.usage = (0, 0)
+
+    def __enter__(self):
+        if self.mode == "tracemalloc":
+            import tracemalloc
+            tracemalloc.start()
+        elif self.mode == "rss":
+            self.base_peak = peak_rss()
+            self.base_current = current_rss()
+        elif self.mode == "sampling":
+            import threading
+            self.base_current = self.peak = current_rss()
+            self.stop = threading.Event()
+            self.thread = threading.Thread(target=self._sample, daemon=True)
+            self.thread.start()
+        return self
+
+    def _sample(self):
+        while not self.stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __exit__(self, *exc):
+        if self.mode == "tracemalloc":
+            import tracemalloc
+            self.usage = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        elif self.mode == "rss":
+            self.usage = (max(0, current_rss() - self.base_current), max(0, peak_rss() - self.base_peak))
+        elif self.mode == "sampling":
+            self.stop.set()
+            self.thread.join()
+            current = current_rss()
+            self.peak = max(self.peak, current)
+            self.usage = (max(0, current - self.base_current), self.peak - self.base_current)
+        else:
+            self.usage = (0, sum(getattr(self.solver, self.stats, {}).values()))
+        return False
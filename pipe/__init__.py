@@ -0,0 +1,11 @@
+"""Headless pipe puzzle solvers.
+
+Importing this package does not touch pygame; the game lives in pipe/main.py.
+"""
+from .algorithm import (
+    ContractedGraph, Epoint, Graph, Ipipe, Lpipe, Pipe, PriorityQueue, Tpipe, Transform,
+    compactTransforms, parseGraph, readGraph, verifySolution
+)
+from .profiling import MemoryMeter, NullProfiler, SolverProfiler
+from .spill import SpillingPriorityQueue, SpillingVisitedSet
+from .hint import HintEngine, propagateDomains
@@ -1,8 +1,19 @@
 from abc import ABC, abstractmethod 
 import copy
 import heapq
+import os
+import sys
 import time
 
+try:
+    from .profiling import NullProfiler, SolverProfiler
+    from .spill import SpillingPriorityQueue, SpillingVisitedSet
+except ImportError:
+    from profiling import NullProfiler, SolverProfiler
+    from spill import SpillingPriorityQueue, SpillingVisitedSet
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input")
+
 # Base states for different pipe types
 TPIPE_BASE_STATES = [
     [False, True, True, True],      # |-
@@ -103,9 +114,19 @@ class Transform():
         self.col: int = col
         self.times: int = times
 
+# Bytes allocated per queued node besides its transforms list: the heap tuple and the newest Transform
+ENTRY_BYTES = sys.getsizeof((0, 0, None)) + sys.getsizeof(Transform(0, 0, 0)) + sys.getsizeof(Transform(0, 0, 0).__dict__)
+
 class PriorityQueue:
     def __init__(self):
         self.queue = []
+        self.seq = 0  # Ties go to the entry inserted first, so runs are reproducible
+        self.bytes = 0
+        self.peakBytes = 0
+    
+    @staticmethod
+    def entryBytes(data):
+        return ENTRY_BYTES + sys.getsizeof(data) + sys.getsizeof(data["transforms"])
     
     def len(self):
         return len(self.queue)
@@ -117,15 +138,37 @@ class PriorityQueue:
         if self.queue == []: return -1
         return self.queue[0][0]
 
+    def peek(self):
+        if self.isEmpty():
+            raise IndexError("Queue is empty")
+        return self.queue[0]
+
+    def close(self):
+        pass
+
     def insert(self, connected, data):
-        heapq.heappush(self.queue, (connected, id(data), data))
+        heapq.heappush(self.queue, (connected, self.seq, data))
+        self.seq += 1
+        self.bytes += PriorityQueue.entryBytes(data)
+        self.peakBytes = max(self.peakBytes, self.bytes)
 
     def delete(self):
         if not self.isEmpty():
-            return heapq.heappop(self.queue)
+            entry = heapq.heappop(self.queue)
+            self.bytes -= PriorityQueue.entryBytes(entry[2])
+            return entry
         else:
             raise IndexError("Queue is empty")
 
+def frontierQueue(spillDir: str | None, hotLimit: int):
+    # With a spill directory the low-priority part of the frontier lives in sorted runs on disk
+    if spillDir:
+        return SpillingPriorityQueue(spillDir, hotLimit, Transform)
+    return PriorityQueue()
+
+# Neighbour offsets in value() order, paired with the side of the neighbour that faces back
+SIDES = [(0, -1, 2), (-1, 0, 3), (0, 1, 0), (1, 0, 1)]
+
 def lockAdjacent(graph: list[list[Epoint | Tpipe | Lpipe | Ipipe]], row: int, col: int) -> list[Transform]:
         lockTransforms = []
         t = type(graph[row][col])
@@ -261,13 +304,142 @@ def rightDicretion(graph: list[list[Epoint | Tpipe | Lpipe | Ipipe]], row: int,
 
     transforms += lockAdjacent(graph, row, col)
 
+def matchedSides(graph: list[list[Epoint | Tpipe | Lpipe | Ipipe]], row: int, col: int) -> set[int]:
+    """Sides of a cell whose open end meets an open end of its neighbour"""
+    value = graph[row][col].value()
+    matched = set()
+    for side, (dr, dc, back) in enumerate(SIDES):
+        r, c = row + dr, col + dc
+        if 0 <= r < len(graph) and 0 <= c < len(graph[0]) and value[side] and graph[r][c].value()[back]:
+            matched.add(side)
+    return matched
+
+def compactTransforms(graph: list[list[Epoint | Tpipe | Lpipe | Ipipe]], transforms: list[Transform]) -> list[Transform]:
+    # Rotations of different cells commute, so each cell only needs its net turn modulo its period
+    totals = {}
+    for t in transforms:
+        totals[(t.row, t.col)] = totals.get((t.row, t.col), 0) + t.times
+    
+    compact = []
+    for (row, col), times in totals.items():
+        times %= len(graph[row][col].baseState)
+        if times != 0:
+            compact += [Transform(row, col, times)]
+    return compact
+
+def verifySolution(graph: "Graph", transforms: list[Transform]) -> bool:
+    rows, cols = graph.row, graph.col
+    index = [[cell.index for cell in row] for row in graph.graph]
+    for t in transforms:
+        index[t.row][t.col] += t.times
+    value = [[graph.graph[i][j].baseState[index[i][j] % len(graph.graph[i][j].baseState)] for j in range(cols)] for i in range(rows)]
+    
+    # One pass: every open side must meet an open side, and no edge may close a cycle
+    parent = list(range(rows * cols))
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    
+    edges = 0
+    for i in range(rows):
+        for j in range(cols):
+            v = value[i][j]
+            if (v[0] and j == 0) or (v[1] and i == 0):
+                return False
+            if v[2] != (j + 1 < cols and value[i][j + 1][0]) or v[3] != (i + 1 < rows and value[i + 1][j][1]):
+                return False
+            for isOpen, neighbour in ((v[2], i * cols + j + 1), (v[3], (i + 1) * cols + j)):
+                if not isOpen:
+                    continue
+                a, b = find(i * cols + j), find(neighbour)
+                if a == b:
+                    return False
+                parent[a] = b
+                edges += 1
+    
+    return edges == rows * cols - 1
+
+class ContractedGraph:
+    """Connectivity of a board whose locked cells are collapsed into super-nodes
+
+    Locked cells never rotate, so every connected set of them is one node of a union-find
+    built once. components() then only walks the edges touching unlocked cells, so its
+    cost depends on the unresolved area rather than the board size.
+
+    Only the locks of the board it is built from count: cells the search locks later belong
+    to one node's copy of the board and are treated as free, which keeps the count exact.
+    """
+    def __init__(self, graph: list[list[Epoint | Tpipe | Lpipe | Ipipe]]):
+        self.rows, self.cols = len(graph), len(graph[0])
+        self.parent = list(range(self.rows * self.cols))
+        self.locked = [[cell.locked for cell in row] for row in graph]
+        self.free = {(i, j) for i in range(self.rows) for j in range(self.cols) if not self.locked[i][j]}
+        self.superNodes = self.rows * self.cols - len(self.free)
+        self.edges = None
+        # Union every matched edge between two locked cells, each taken from its left or top end
+        for i in range(self.rows):
+            for j in range(self.cols):
+                if not self.locked[i][j]:
+                    continue
+                value = graph[i][j].value()
+                for side in (2, 3):
+                    dr, dc, back = SIDES[side]
+                    r, c = i + dr, j + dc
+                    if r < self.rows and c < self.cols and self.locked[r][c] and value[side] and graph[r][c].value()[back]:
+                        a, b = self.root(i * self.cols + j), self.root(r * self.cols + c)
+                        if a != b:
+                            self.parent[a] = b
+                            self.superNodes -= 1
+
+    def root(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def components(self, graph: list[list[Epoint | Tpipe | Lpipe | Ipipe]]) -> int:
+        """Same count as Graph.connectedComponent for a board that agrees on every locked cell"""
+        link = {}
+        def find(x):
+            x = self.root(x)
+            while x in link:
+                x = link[x]
+            return x
+
+        if self.edges is None:
+            self.edges = self.freeEdges()
+        merges = 0
+        for row, col, side, r, c, back in self.edges:
+            if graph[row][col].value()[side] and graph[r][c].value()[back]:
+                a, b = find(row * self.cols + col), find(r * self.cols + c)
+                if a != b:
+                    link[a] = b
+                    merges += 1
+        return self.superNodes + len(self.free) - merges
+
+    def freeEdges(self) -> list[tuple]:
+        # Every edge with at least one free end, an edge between two free cells taken from its left or top end only
+        edges = []
+        for row, col in sorted(self.free):
+            for side, (dr, dc, back) in enumerate(SIDES):
+                r, c = row + dr, col + dc
+                if 0 <= r < self.rows and 0 <= c < self.cols and (side >= 2 or self.locked[r][c]):
+                    edges += [(row, col, side, r, c, back)]
+        return edges
+
 class Graph():
     def __init__(self, graph):
         self.graph: list[list[Epoint | Tpipe | Ipipe | Lpipe]] = graph
         self.row = len(graph)
         self.col = len(graph[0])
+        self.profiler: NullProfiler | SolverProfiler = NullProfiler()
+        # Peak bytes held by the last solve's own search structures
+        self.memoryStats: dict[str, int] = {}
 
     def preProcessing(self) -> tuple[list[Transform], int, int]:
+        profiler = self.profiler
         maxElements = 0
         loop = 0
         preTransforms = []
@@ -278,31 +450,31 @@ class Graph():
         for row, col in conners:
             if type(self.graph[row][col]) is Lpipe:
                 count = 0 
-                while noHopeState(self.graph, row, col, True):
+                while profiler.call("noHopeState", noHopeState, self.graph, row, col, True):
                     count += 1
                     self.graph[row][col].leftRotate()
                 self.graph[row][col].locked = True
                 if count != 0:
                     preTransforms += [Transform(row, col, count)]
                     floodFill += [(row, col)]
-                preTransforms += lockAdjacent(self.graph, row, col)
+                preTransforms += profiler.call("lockAdjacent", lockAdjacent, self.graph, row, col)
         
         # Process edges
         for j in range(self.col):
             if type(self.graph[0][j]) is Tpipe:
-                rightDicretion(self.graph, 0, j, 3, preTransforms, floodFill)
+                profiler.call("rightDicretion", rightDicretion, self.graph, 0, j, 3, preTransforms, floodFill)
             if type(self.graph[0][j]) is Ipipe:
-                rightDicretion(self.graph, 0, j, 1, preTransforms, floodFill)
+                profiler.call("rightDicretion", rightDicretion, self.graph, 0, j, 1, preTransforms, floodFill)
             if type(self.graph[self.row - 1][j]) in [Tpipe, Ipipe]:
-                rightDicretion(self.graph, self.row - 1, j, 1, preTransforms, floodFill)
+                profiler.call("rightDicretion", rightDicretion, self.graph, self.row - 1, j, 1, preTransforms, floodFill)
 
         for i in range(1, self.row):
             if type(self.graph[i][0]) in [Tpipe, Ipipe]:
-                rightDicretion(self.graph, i, 0, 0, preTransforms, floodFill)
+                profiler.call("rightDicretion", rightDicretion, self.graph, i, 0, 0, preTransforms, floodFill)
             if type(self.graph[i][self.col - 1]) is Tpipe:
-                rightDicretion(self.graph, i, self.col - 1, 2, preTransforms, floodFill)
+                profiler.call("rightDicretion", rightDicretion, self.graph, i, self.col - 1, 2, preTransforms, floodFill)
             if type(self.graph[i][self.col - 1]) is Ipipe:
-                rightDicretion(self.graph, i, self.col - 1, 0, preTransforms, floodFill)
+                profiler.call("rightDicretion", rightDicretion, self.graph, i, self.col - 1, 0, preTransforms, floodFill)
         
         # Process flood fill
         while floodFill:
@@ -330,12 +502,12 @@ class Graph():
                 
                 for _ in range(max_rotations):
                     self.graph[row + dx][col + dy].leftRotate()
-                    if not noHopeState(self.graph, row + dx, col + dy, True):
+                    if not profiler.call("noHopeState", noHopeState, self.graph, row + dx, col + dy, True):
                         count += 1
             
                 if count == 1:
                     count = 0
-                    while noHopeState(self.graph, row + dx, col + dy, True):
+                    while profiler.call("noHopeState", noHopeState, self.graph, row + dx, col + dy, True):
                         count += 1
                         self.graph[row + dx][col + dy].leftRotate()
                     self.graph[row + dx][col + dy].locked = True
@@ -381,11 +553,13 @@ class Graph():
     def _get_state_hash(self, graph):
         return tuple(cell.index for row in graph for cell in row)
 
-    def blindSolve(self) -> tuple[list[Transform], int, int] | None:
-        priorityQueue = PriorityQueue()
+    def blindSolve(self, spillDir: str | None = None, hotLimit: int = 50000, lazy: bool = False) -> tuple[list[Transform], int, int] | None:
+        # lazy: successors are queued under an optimistic bound and only scored once they reach the front
+        profiler = self.profiler
+        priorityQueue = frontierQueue(spillDir, hotLimit)
         priorityQueue.insert(float('inf'), {"transforms": []})
         
-        visited = set()
+        visited = SpillingVisitedSet(spillDir, hotLimit * 4) if spillDir else set()
         maxElement = 0
         loop = 0
         best_connected = float('inf')
@@ -395,21 +569,40 @@ class Graph():
             while not priorityQueue.isEmpty():
                 loop += 1
                 maxElement = max(maxElement, priorityQueue.len())
+                profiler.frontierSize(priorityQueue.len())
                 
-                current = priorityQueue.delete()
+                with profiler.phase("heap"):
+                    current = priorityQueue.delete()
                 transforms = current[2]["transforms"]
                 
-                temp = copy.deepcopy(self.graph)
-                for t in transforms:
-                    for _ in range(t.times):
-                        temp[t.row][t.col].leftRotate()
+                # Lazy entries carry their board, or their parent's board and the one pipe they turned
+                temp = current[2].pop("board", None)
+                if temp is None and "parent" in current[2]:
+                    row, col, pipe = current[2].pop("move")
+                    temp = [list(cells) for cells in current[2].pop("parent")]
+                    temp[row][col] = pipe
+                if temp is None:
+                    with profiler.phase("materialize"):
+                        # Pipes share their baseState tables, so a shallow copy of each cell is a full copy of the board
+                        temp = [[copy.copy(cell) for cell in row] for row in self.graph]
+                        for t in transforms:
+                            for _ in range(t.times):
+                                temp[t.row][t.col].leftRotate()
                 
-                state_hash = self._get_state_hash(temp)
+                state_hash = profiler.call("hash", self._get_state_hash, temp)
                 if state_hash in visited:
                     continue
+                
+                connected = current[2].get("connected")
+                if connected is None:
+                    connected = profiler.call("connectedComponent", Graph.connectedComponent, temp)
+                if connected > current[0]:
+                    # The bound was too optimistic: queue the node again under its exact score
+                    with profiler.phase("heap"):
+                        priorityQueue.insert(connected, {"transforms": transforms, "connected": connected, "board": temp})
+                    continue
                     
                 visited.add(state_hash)
-                connected = Graph.connectedComponent(temp)
                 
                 if connected == 1:
                     return transforms, maxElement, loop
@@ -423,65 +616,96 @@ class Graph():
                         if temp[i][j].locked:
                             continue
                         
-                        original_pipe = copy.deepcopy(temp[i][j])
+                        original_pipe = temp[i][j]
+                        baseMatched = matchedSides(temp, i, j) if lazy else None
                         max_rotations = 2 if type(temp[i][j]) is Ipipe else 4
                         
                         for rot in range(1, max_rotations):
-                            temp_pipe = copy.deepcopy(original_pipe)
+                            temp_pipe = profiler.call("materialize", copy.copy, original_pipe)
                             for _ in range(rot):
                                 temp_pipe.leftRotate()
                             temp[i][j] = temp_pipe
                             
-                            if noHopeState(temp, i, j):
+                            if profiler.call("noHopeState", noHopeState, temp, i, j):
                                 continue
                                 
-                            new_connected = Graph.connectedComponent(temp)
+                            if lazy:
+                                # Each newly joined edge removes at most one component and dropped edges never remove any
+                                gained = len(matchedSides(temp, i, j) - baseMatched)
+                                new_connected = max(1, connected - gained)
+                            else:
+                                new_connected = profiler.call("connectedComponent", Graph.connectedComponent, temp)
                             new_transforms = transforms + [Transform(i, j, rot)]
-                            priorityQueue.insert(new_connected, {"transforms": new_transforms})
+                            entry = {"transforms": new_transforms, "parent": temp, "move": (i, j, temp_pipe)} if lazy else {"transforms": new_transforms}
+                            with profiler.phase("heap"):
+                                priorityQueue.insert(new_connected, entry)
                         
                         temp[i][j] = original_pipe
                         
         except Exception as e:
             print(f"Error in blindSolve: {e}")
             return None
+        finally:
+            if spillDir:
+                visitedBytes = visited.hotBytes()
+                visited.close()
+            else:
+                visitedBytes = sys.getsizeof(visited) + len(visited) * sys.getsizeof(tuple(range(self.row * self.col)))
+            priorityQueue.close()
+            self.memoryStats = {"frontier": priorityQueue.peakBytes, "visited": visitedBytes}
         
         return best_transforms, maxElement, loop if best_transforms else None
 
-    def heuristicSolve(self) -> tuple[list[Transform], int, int, int, int] | None:
-        preTransforms, preMaxElement, preLoop = self.preProcessing()     
+    def heuristicSolve(self, spillDir: str | None = None, hotLimit: int = 50000) -> tuple[list[Transform], int, int, int, int] | None:
+        profiler = self.profiler
+        with profiler.phase("preProcessing"):
+            preTransforms, preMaxElement, preLoop = self.preProcessing()     
         
-        connectedBase = Graph.connectedComponent(self.graph)
+        with profiler.phase("contract"):
+            contracted = ContractedGraph(self.graph)
+        connectedBase = profiler.call("connectedComponent", contracted.components, self.graph)
         if connectedBase == 1: 
+            self.memoryStats = {"frontier": 0}
             return preTransforms, preMaxElement, 0, preLoop, 0
         
+        priorityQueue = frontierQueue(spillDir, hotLimit)
+        try:
+            return self.heuristicSearch(priorityQueue, contracted, preTransforms, preMaxElement, preLoop)
+        finally:
+            priorityQueue.close()
+            self.memoryStats = {"frontier": priorityQueue.peakBytes}
+
+    def heuristicSearch(self, priorityQueue, contracted: ContractedGraph, preTransforms, preMaxElement, preLoop):
+        profiler = self.profiler
         maxElement = 0
         loop = 0
-        priorityQueue = PriorityQueue()
         allVisited = pow(4, self.row*self.col)
         
         while priorityQueue.minConnected() != 1 or allVisited:
             loop += 1
             maxElement = max(maxElement, priorityQueue.len())
+            profiler.frontierSize(priorityQueue.len())
             
             allVisited -= 1
             if priorityQueue.minConnected() == -1:
                 transfroms = []
             else:
                 while not priorityQueue.isEmpty():
-                    if priorityQueue.queue[0][2]["visited"]:
-                        priorityQueue.delete()
+                    if priorityQueue.peek()[2]["visited"]:
+                        with profiler.phase("heap"):
+                            priorityQueue.delete()
                         continue
-                    transfroms = copy.deepcopy(priorityQueue.queue[0][2]["transforms"])
-                    priorityQueue.queue[0][2]["visited"] = True
+                    transfroms = copy.deepcopy(priorityQueue.peek()[2]["transforms"])
+                    priorityQueue.peek()[2]["visited"] = True
                     break
             
-            temp = copy.deepcopy(self.graph)
+            with profiler.phase("materialize"):
+                temp = copy.deepcopy(self.graph)
+                for t in transfroms:
+                    for _ in range(t.times):
+                        temp[t.row][t.col].leftRotate()
             lockTranforms = []
             
-            for t in transfroms:
-                for _ in range(t.times):
-                    temp[t.row][t.col].leftRotate()
-            
             i = -1 if not transfroms else transfroms[-1].row
             j = self.col if not transfroms else transfroms[-1].col
             
@@ -489,7 +713,7 @@ class Graph():
             j = 0 if j + 1 >= self.col else j + 1
             
             while i < self.row and temp[i][j].locked:
-                lockTranforms += lockAdjacent(temp, i, j)
+                lockTranforms += profiler.call("lockAdjacent", lockAdjacent, temp, i, j)
                 j += 1
                 if j == self.col:
                     j = 0
@@ -501,22 +725,137 @@ class Graph():
             if type(temp[i][j]) is Ipipe:
                 for _ in range(2):
                     temp[i][j].leftRotate()
-                    if noHopeState(temp, i, j):
+                    if profiler.call("noHopeState", noHopeState, temp, i, j):
                         continue
-                    newConnected = Graph.connectedComponent(temp)
+                    newConnected = profiler.call("connectedComponent", contracted.components, temp)
                     newTransfroms = transfroms + lockTranforms + [Transform(i, j, (_ + 1) % 2)]
-                    priorityQueue.insert(newConnected, {"visited": False, "transforms": newTransfroms})
+                    with profiler.phase("heap"):
+                        priorityQueue.insert(newConnected, {"visited": False, "transforms": newTransfroms})
             else:
                 for _ in range(4):
                     temp[i][j].leftRotate()
-                    if noHopeState(temp, i, j):
+                    if profiler.call("noHopeState", noHopeState, temp, i, j):
                         continue
-                    newConnected = Graph.connectedComponent(temp)
+                    newConnected = profiler.call("connectedComponent", contracted.components, temp)
                     newTransfroms = transfroms + lockTranforms + [Transform(i, j, (_ + 1) % 4)]
-                    priorityQueue.insert(newConnected, {"visited": False, "transforms": newTransfroms})
+                    with profiler.phase("heap"):
+                        priorityQueue.insert(newConnected, {"visited": False, "transforms": newTransfroms})
 
-            if not priorityQueue.isEmpty() and priorityQueue.queue[0][0] == 1:
-                result = preTransforms + priorityQueue.queue[0][2]["transforms"]
+            if not priorityQueue.isEmpty() and priorityQueue.peek()[0] == 1:
+                result = preTransforms + priorityQueue.peek()[2]["transforms"]
                 return result, preMaxElement, maxElement, preLoop, loop
         
-        return None
\ No newline at end of file
+        return None
+
+    def frontierSolve(self) -> tuple[list[Transform], int, int] | None:
+        # Sweep cells in row-major order along the long dimension so the frontier spans the short one
+        transpose = self.col > self.row
+        height, width = (self.col, self.row) if transpose else (self.row, self.col)
+        sides = [1, 0, 3, 2] if transpose else [0, 1, 2, 3]
+
+        def cellAt(r, c):
+            return self.graph[c][r] if transpose else self.graph[r][c]
+
+        # A state is (labels of open down-edges across the cut, label of the open edge entering from the left)
+        layers = []
+        states = {((0,) * width, 0): None}
+        maxElement = 1
+        loop = 0
+        last = height * width - 1
+        # Every memoized state is kept until the back-pointers are walked
+        keyBytes = 2 * sys.getsizeof((0, 0)) + sys.getsizeof((0,) * width)
+        layerBytes = 0
+
+        for r in range(height):
+            for c in range(width):
+                cell = cellAt(r, c)
+                period = len(cell.baseState)
+                options = []
+                for index in ([cell.index] if cell.locked else range(period)):
+                    value = cell.baseState[index]
+                    left, top, right, bottom = (value[s] for s in sides)
+                    if (right and c == width - 1) or (bottom and r == height - 1):
+                        continue
+                    options += [(index, left, top, right, bottom)]
+
+                nextStates = {}
+                for state in states:
+                    frontier, leftLabel = state
+                    upLabel = frontier[c]
+                    for index, left, top, right, bottom in options:
+                        loop += 1
+                        if left != (leftLabel != 0) or top != (upLabel != 0):
+                            continue
+                        if leftLabel and upLabel and leftLabel == upLabel:
+                            continue
+
+                        # Merge the labels that meet at this cell into a fresh one
+                        fresh = width + 1
+                        merged = {leftLabel, upLabel} - {0}
+                        cut = [fresh if l in merged else l for l in frontier]
+                        cut[c] = fresh if bottom else 0
+                        rightLabel = fresh if right else 0
+
+                        if fresh not in cut and not rightLabel and (r, c) != (height - 1, width - 1):
+                            # This component has no open edge left, so the board would split
+                            continue
+                        if (r * width + c) == last and any(cut):
+                            continue
+
+                        relabel = {0: 0}
+                        for l in cut + [rightLabel]:
+                            if l not in relabel:
+                                relabel[l] = len(relabel)
+                        key = (tuple(relabel[l] for l in cut), relabel[rightLabel] if c != width - 1 else 0)
+                        if key not in nextStates:
+                            nextStates[key] = (state, index)
+
+                if not nextStates:
+                    return None
+                layers += [(r, c, nextStates)]
+                states = nextStates
+                self.profiler.frontierSize(len(states))
+                layerBytes += sys.getsizeof(states) + len(states) * keyBytes
+                self.memoryStats = {"frontier": layerBytes}
+                maxElement = max(maxElement, len(states))
+
+        # Walk the back-pointers from the single closed state to rebuild the rotations
+        transforms = []
+        state = next(iter(states))
+        for r, c, layer in reversed(layers):
+            state, index = layer[state]
+            cell = cellAt(r, c)
+            times = (index - cell.index) % len(cell.baseState)
+            if times != 0:
+                transforms += [Transform(cell.row, cell.col, times)]
+        transforms.reverse()
+
+        return transforms, maxElement, loop
+
+def parseGraph(data: list[list[dict]]) -> Graph:
+    mainGraph: list[list[Epoint | Tpipe | Lpipe | Ipipe]] = []
+    
+    i = 0
+    for _ in data:
+        row = []
+        j = 0
+        for d in _:
+            if d["type"] == "E":
+                row += [Epoint(i, j, int(d["index"]))]
+            elif d["type"] == "L":
+                row += [Lpipe(i, j, int(d["index"]))]
+            elif d["type"] == "T":
+                row += [Tpipe(i, j, int(d["index"]))]
+            elif d["type"] == "I":
+                row += [Ipipe(i, j, int(d["index"]))]
+            j += 1
+        i += 1
+        mainGraph += [row]
+        
+    return Graph(mainGraph)
+
+def readGraph(fileName: str, directory: str = INPUT_DIR) -> Graph:
+    import json
+    with open(os.path.join(directory, fileName), "r") as file:
+        data = json.load(file)
+    return parseGraph(data)
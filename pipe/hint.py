@@ -0,0 +1,130 @@
+from collections import deque
+
+try:
+    from .algorithm import Graph, Transform
+except ImportError:
+    from algorithm import Graph, Transform
+
+# (row offset, col offset, side of the neighbour facing back) for the sides left, top, right, bottom
+NEIGHBOURS = [(0, -1, 2), (-1, 0, 3), (0, 1, 0), (1, 0, 1)]
+
+def propagateDomains(graph: list[list]) -> list[list[set]]:
+    """Arc-consistent orientation domains of every cell, each orientation given as its value() tuple"""
+    rows, cols = len(graph), len(graph[0])
+    domains = [[{tuple(value) for value in cell.baseState} for cell in row] for row in graph]
+
+    def supported(row, col, value):
+        for side, (dr, dc, back) in enumerate(NEIGHBOURS):
+            r, c = row + dr, col + dc
+            if not (0 <= r < rows and 0 <= c < cols):
+                if value[side]:
+                    return False
+            elif not any(other[back] == value[side] for other in domains[r][c]):
+                return False
+        return True
+
+    queue = deque((i, j) for i in range(rows) for j in range(cols))
+    queued = {(i, j) for i in range(rows) for j in range(cols)}
+    while queue:
+        row, col = queue.popleft()
+        queued.discard((row, col))
+        kept = {value for value in domains[row][col] if supported(row, col, value)}
+        if kept == domains[row][col]:
+            continue
+        domains[row][col] = kept
+        for dr, dc, _ in NEIGHBOURS:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols and (r, c) not in queued:
+                queue.append((r, c))
+                queued.add((r, c))
+    return domains
+
+class HintEngine:
+    """Progress checks and hints for a board the player is rotating by hand
+
+    The propagated domains and a target solution are computed once; every rotation then
+    only touches the four edges around the rotated cell, so hint() and isSolved() stay
+    cheap enough to call every frame. The connectivity check runs only once every open
+    side meets another open side.
+    """
+    def __init__(self, graph: Graph, target: list[list[tuple]] | None = None):
+        self.graph = graph
+        self.row, self.col = graph.row, graph.col
+        self.domains = propagateDomains(graph.graph)
+        self.target = target if target is not None else HintEngine.solveTarget(graph)
+
+        self.mismatches = 0
+        for i in range(self.row):
+            for j in range(self.col):
+                # Each edge is counted once: from its left or top cell, or from the cell on the left or top border
+                sides = [2, 3] + ([0] if j == 0 else []) + ([1] if i == 0 else [])
+                self.mismatches += sum(self.edgeMismatch(i, j, side) for side in sides)
+
+        self.wrong = set()
+        for i in range(self.row):
+            for j in range(self.col):
+                self.updateCell(i, j)
+
+    @staticmethod
+    def solveTarget(graph: Graph) -> list[list[tuple]] | None:
+        # frontierSolve only reads the cells, so it can run on a view sharing the live board
+        result = Graph(graph.graph).frontierSolve()
+        if result is None:
+            return None
+        index = [[cell.index for cell in row] for row in graph.graph]
+        for t in result[0]:
+            index[t.row][t.col] += t.times
+        return [[tuple(cell.baseState[index[i][j] % len(cell.baseState)]) for j, cell in enumerate(row)] for i, row in enumerate(graph.graph)]
+
+    def edgeMismatch(self, row, col, side) -> int:
+        value = self.graph.graph[row][col].value()
+        dr, dc, back = NEIGHBOURS[side]
+        r, c = row + dr, col + dc
+        if not (0 <= r < self.row and 0 <= c < self.col):
+            return int(value[side])
+        return int(value[side] != self.graph.graph[r][c].value()[back])
+
+    def cellGoal(self, row, col) -> tuple | None:
+        domain = self.domains[row][col]
+        if len(domain) == 1:
+            return next(iter(domain))
+        return self.target[row][col] if self.target else None
+
+    def updateCell(self, row, col):
+        goal = self.cellGoal(row, col)
+        if goal is not None and tuple(self.graph.graph[row][col].value()) != goal:
+            self.wrong.add((row, col))
+        else:
+            self.wrong.discard((row, col))
+
+    def rotate(self, row: int, col: int, left: bool = True):
+        """Rotates one cell of the live board and updates the counters of its four edges"""
+        before = sum(self.edgeMismatch(row, col, side) for side in range(4))
+        cell = self.graph.graph[row][col]
+        if left:
+            cell.leftRotate()
+        else:
+            cell.rightRotate()
+        self.mismatches += sum(self.edgeMismatch(row, col, side) for side in range(4)) - before
+        self.updateCell(row, col)
+
+    def isSolved(self) -> bool:
+        if self.mismatches:
+            return False
+        # Every side matches, so the board is solved iff the pipes form one tree
+        edges = sum(self.graph.graph[i][j].value()[2] + self.graph.graph[i][j].value()[3] for i in range(self.row) for j in range(self.col))
+        return edges == self.row * self.col - 1 and Graph.connectedComponent(self.graph.graph) == 1
+
+    def hint(self) -> Transform | None:
+        """The next left rotation towards a solution, preferring cells whose orientation is forced"""
+        if not self.wrong:
+            return None
+        forced = [cell for cell in self.wrong if len(self.domains[cell[0]][cell[1]]) == 1]
+        row, col = min(forced or self.wrong)
+        cell = self.graph.graph[row][col]
+        goal = self.cellGoal(row, col)
+        period = len(cell.baseState)
+        for times in range(1, period):
+            if tuple(cell.baseState[(cell.index + times) % period]) == goal:
+                return Transform(row, col, times)
+        return None
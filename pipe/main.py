@@ -1,22 +1,25 @@
 # Databricks notebook source
 import sys, pygame
-import resource
-import tracemalloc
 import time
 import json
-from algorithm import *
+# Run from the repository root, python -m pipe.main, so the shared measure package imports
+try:
+    from .algorithm import *
+    from .profiling import MemoryMeter, SolverProfiler
+    from .hint import HintEngine
+except ImportError:
+    from algorithm import *
+    from profiling import MemoryMeter, SolverProfiler
+    from hint import HintEngine
 import os
 import copy
 
 os.environ['SDL_WINDOW_CENTERED'] = '1'  # Center all pygame windows
 
-pygame.init()
-size = width, height = 1200, 960
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
 
-pygame.display.set_caption("PIPES PUZZLE")
-icon = pygame.image.load("assets/icon.png")
-pygame.display.set_icon(icon)
-screen = pygame.display.set_mode(size)
+size = width, height = 1200, 960
+screen = None  # Opened by initDisplay so importing this module stays headless
 
 # Default cell width for drawing the puzzle
 CELL_WIDTH = 50  # This will be dynamically adjusted based on puzzle size
@@ -31,10 +34,8 @@ BUTTON_HOVER = (108, 195, 171) # Lighter teal for hover states
 GAME_AREA = (34, 44, 77)      # Slightly lighter than background for game area
 ERROR_COLOR = (255, 99, 71)   # Tomato red for error messages
 
-# Fonts
-TITLE_FONT = pygame.font.SysFont('Corbel', 72)
-MENU_FONT = pygame.font.SysFont('Corbel', 36)
-INFO_FONT = pygame.font.SysFont('Corbel', 24)
+# Fonts (loaded by initDisplay)
+TITLE_FONT = MENU_FONT = INFO_FONT = None
 
 # Menu states
 MAIN_MENU = 0
@@ -59,19 +60,55 @@ GRAPHS = [
 blind_stats = {'start_time': 0, 'end_time': 0, 'max_nodes': 0, 'loop': 0, 'mem_storage': [0, 0], 'status': ''}
 heuristic_stats = {'start_time': 0, 'end_time': 0, 'pre_max_nodes': 0, 'pre_loop': 0, 
                   'max_nodes': 0, 'loop': 0, 'mem_storage': [0, 0], 'status': ''}
+frontier_stats = {'start_time': 0, 'end_time': 0, 'max_nodes': 0, 'loop': 0, 'mem_storage': [0, 0], 'status': ''}
+
+BLIND_SOLVE = HEURISTIC_SOLVE = None
+
+# Frame pacing: redraws are capped at FPS, and the loop sleeps in pygame.event.wait() while idle
+FPS = 60
+ANIMATION_STEP_MS = 200
+clock = None
 
-BLIND_SOLVE = pygame.font.SysFont('Corbel', 20) .render('Blind Solve' , True , (0, 0, 0))
-HEURISTIC_SOLVE = pygame.font.SysFont('Corbel', 20) .render('Heuristic Solve' , True , (0, 0, 0))
+# Hints for the board the player is rotating, built on first use
+hintEngine = None
+hintMove = None
+
+def initDisplay():
+    """Start pygame, open the window and load the fonts"""
+    global screen, TITLE_FONT, MENU_FONT, INFO_FONT, BLIND_SOLVE, HEURISTIC_SOLVE, clock
+    pygame.init()
+    clock = pygame.time.Clock()
+    
+    pygame.display.set_caption("PIPES PUZZLE")
+    icon = pygame.image.load(os.path.join(ASSETS_DIR, "icon.png"))
+    pygame.display.set_icon(icon)
+    screen = pygame.display.set_mode(size)
+    
+    TITLE_FONT = pygame.font.SysFont('Corbel', 72)
+    MENU_FONT = pygame.font.SysFont('Corbel', 36)
+    INFO_FONT = pygame.font.SysFont('Corbel', 24)
+    
+    BLIND_SOLVE = pygame.font.SysFont('Corbel', 20) .render('Blind Solve' , True , (0, 0, 0))
+    HEURISTIC_SOLVE = pygame.font.SysFont('Corbel', 20) .render('Heuristic Solve' , True , (0, 0, 0))
+
+PIPE_IMAGES = {}
 
 def pipeImage(type, index, width):
+    # Tinted images are loaded once per pipe type, rotation and size instead of on every blit
+    key = (type, index, width)
+    if key not in PIPE_IMAGES:
+        PIPE_IMAGES[key] = loadPipeImage(type, index, width)
+    return PIPE_IMAGES[key]
+
+def loadPipeImage(type, index, width):
     if type is Tpipe:
-        image = pygame.image.load(f"assets/Tpipe{index}.png")
+        image = pygame.image.load(os.path.join(ASSETS_DIR, f"Tpipe{index}.png"))
     elif type is Lpipe:
-        image = pygame.image.load(f"assets/Lpipe{index}.png")
+        image = pygame.image.load(os.path.join(ASSETS_DIR, f"Lpipe{index}.png"))
     elif type is Ipipe:
-        image = pygame.image.load(f"assets/Ipipe{index}.png")
+        image = pygame.image.load(os.path.join(ASSETS_DIR, f"Ipipe{index}.png"))
     else:
-        image = pygame.image.load(f"assets/Epoint{index}.png")
+        image = pygame.image.load(os.path.join(ASSETS_DIR, f"Epoint{index}.png"))
 
     image = pygame.transform.scale(image, (width, width))
     
@@ -81,30 +118,6 @@ def pipeImage(type, index, width):
     
     return colored_surface
 
-def readGraph(fileName: str):
-    mainGraph: list[list[Epoint | Tpipe | Lpipe | Ipipe]] = []
-    
-    with open(f"input/{fileName}", "r") as file:
-        data = json.load(file)
-    i = 0
-    for _ in data:
-        row = []
-        j = 0
-        for d in _:
-            if d["type"] == "E":
-                row += [Epoint(i, j, int(d["index"]))]
-            elif d["type"] == "L":
-                row += [Lpipe(i, j, int(d["index"]))]
-            elif d["type"] == "T":
-                row += [Tpipe(i, j, int(d["index"]))]
-            elif d["type"] == "I":
-                row += [Ipipe(i, j, int(d["index"]))]
-            j += 1
-        i += 1
-        mainGraph += [row]
-        
-    return Graph(mainGraph)
-
 def drawGraph(graph: Graph, BaseX, BaseY):
     baseY = BaseY
     
@@ -208,31 +221,76 @@ def draw_game_result(stats, result_message, success=True):
     # Wait for user to click continue
     waiting_for_click = True
     while waiting_for_click:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONUP:
-                if continue_button.collidepoint(pygame.mouse.get_pos()):
-                    waiting_for_click = False
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            sys.exit()
+        elif event.type == pygame.MOUSEBUTTONUP:
+            if continue_button.collidepoint(pygame.mouse.get_pos()):
+                waiting_for_click = False
+
+def verifiedResult(graph, result, stats):
+    """Fold the solver's transforms per cell and check them against the unsolved board"""
+    transforms = compactTransforms(graph.graph, result[0] or [])
+    if verifySolution(graph, transforms):
+        stats['status'] = "Solution found"
+    else:
+        stats['status'] = "Solution failed verification"
+    return (transforms,) + tuple(result[1:])
+
+def measuredRun(graph, solve, stats, **kwargs):
+    """Time a solver and measure its memory in the PIPE_MEMORY mode, printing a profile when PIPE_PROFILE is set"""
+    mode = os.environ.get("PIPE_PROFILE")
+    if mode:
+        graph.profiler = SolverProfiler(mode if mode in ("cprofile", "sampling") else None)
+    
+    meter = MemoryMeter(os.environ.get("PIPE_MEMORY", "rss"), graph)
+    stats['start_time'] = time.perf_counter()
+    with meter:
+        result = graph.profiler.run(solve, **kwargs)
+    stats['end_time'] = time.perf_counter()
+    stats['mem_storage'] = meter.usage
+    
+    if mode:
+        print(json.dumps(graph.profiler.report(), indent=2))
+    return result
+
+def spillOptions():
+    """PIPE_SPILL=<directory> keeps only a hot window of the search frontier in RAM and spills the rest there"""
+    spillDir = os.environ.get("PIPE_SPILL")
+    if not spillDir:
+        return {}
+    return {"spillDir": spillDir, "hotLimit": int(os.environ.get("PIPE_SPILL_HOT", 50000))}
+
+def blindOptions():
+    """PIPE_LAZY=1 scores blind-search successors only once they reach the front of the queue"""
+    options = spillOptions()
+    if os.environ.get("PIPE_LAZY"):
+        options["lazy"] = True
+    return options
 
 def solvedGraph(graph, type: str):
     solvedGraph: Graph = copy.deepcopy(graph)
     if type == 'blind':
-        result = solvedGraph.blindSolve()
+        result = measuredRun(solvedGraph, solvedGraph.blindSolve, blind_stats, **blindOptions())
         if result is None:
             blind_stats['status'] = "Could not find solution (limits reached)"
             return None
         else:
-            blind_stats['status'] = "Solution found"
-            return result
+            return verifiedResult(graph, result, blind_stats)
+    elif type == 'frontier':
+        result = measuredRun(solvedGraph, solvedGraph.frontierSolve, frontier_stats)
+        if result is None:
+            frontier_stats['status'] = "Puzzle has no solution"
+            return None
+        else:
+            return verifiedResult(graph, result, frontier_stats)
     else:
-        result = solvedGraph.heuristicSolve()
+        result = measuredRun(solvedGraph, solvedGraph.heuristicSolve, heuristic_stats, **spillOptions())
         if result is None:
             heuristic_stats['status'] = "Could not find solution (limits reached)"
             return None
         else:
-            heuristic_stats['status'] = "Solution found"
-            return result
+            return verifiedResult(graph, result, heuristic_stats)
     
 def draw_menu_button(text, rect, hover=False):
     color = BUTTON_HOVER if hover else SECONDARY
@@ -250,7 +308,8 @@ def draw_algorithm_menu():
     buttons = [
         ('Blind Search (DFS)', pygame.Rect((width - 300) // 2, 300, 300, 60)),
         ('Heuristic Search (A*)', pygame.Rect((width - 300) // 2, 400, 300, 60)),
-        ('Exit', pygame.Rect((width - 300) // 2, 500, 300, 60))
+        ('Frontier DP (Exact)', pygame.Rect((width - 300) // 2, 500, 300, 60)),
+        ('Exit', pygame.Rect((width - 300) // 2, 600, 300, 60))
     ]
     
     mouse_pos = pygame.mouse.get_pos()
@@ -335,6 +394,20 @@ def draw_game_screen():
             index = mainGraph.graph[i][j].index
             screen.blit(pipeImage(t, index, CELL_WIDTH), (x, y))
     
+    # Highlight the hinted pipe and report progress
+    if hintMove:
+        highlight_rect = pygame.Rect(base_x + hintMove.col * CELL_WIDTH, base_y + hintMove.row * CELL_WIDTH, CELL_WIDTH, CELL_WIDTH)
+        pygame.draw.rect(screen, ACCENT, highlight_rect, 3)
+    if hintEngine and hintEngine.graph is mainGraph:
+        if hintEngine.isSolved():
+            message = "Solved!"
+        elif hintMove:
+            message = f"Hint: rotate ({hintMove.row+1},{hintMove.col+1}) left {hintMove.times} time(s)"
+        else:
+            message = "Press H for a hint"
+        status = INFO_FONT.render(message, True, TEXT_COLOR)
+        screen.blit(status, ((width - status.get_width()) // 2, base_y + puzzle_height + 30))
+    
     # Draw back button
     back_button = pygame.Rect(20, 20, 100, 40)
     draw_menu_button('Back', back_button)
@@ -345,6 +418,7 @@ def animate_solution(transforms, base_x, base_y, cell_size):
     """Animate the solution by showing each transformation step by step"""
     # Make a copy of the current graph to animate
     graph_copy = copy.deepcopy(mainGraph)
+    clock.tick()  # Start the step timer now, not at the last idle frame
     
     for t in transforms:
         row, col = t.row, t.col
@@ -383,109 +457,136 @@ def animate_solution(transforms, base_x, base_y, cell_size):
             screen.blit(status, ((width - status.get_width()) // 2, base_y + graph_copy.row * cell_size + 30))
             
             pygame.display.flip()
-            pygame.time.delay(200)  # Slightly faster animation for better UX
+            pygame.event.pump()  # Keep the window responsive while animating
+            clock.tick(1000 / ANIMATION_STEP_MS)
 
 mainGraph = readGraph(FILENAMES[0])
 
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
-        elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-            if current_state == GAME_SCREEN:
-                current_state = ALGORITHM_MENU
-        elif event.type == pygame.MOUSEBUTTONUP:
-            mouse_pos = pygame.mouse.get_pos()
-            
+def gameHints():
+    """The hint engine of the current board, kept alive across clicks"""
+    global hintEngine
+    if hintEngine is None or hintEngine.graph is not mainGraph:
+        hintEngine = HintEngine(mainGraph)
+    return hintEngine
+
+def main():
+    global current_state, selected_algorithm, mainGraph, hintEngine, hintMove
+    initDisplay()
+    dirty = True
+    
+    while True:
+        if dirty:
             if current_state == ALGORITHM_MENU:
-                buttons = draw_algorithm_menu()
-                for text, rect in buttons:
-                    if rect.collidepoint(mouse_pos):
-                        if text == 'Exit':
-                            sys.exit()
-                        elif text == 'Blind Search (DFS)':
-                            selected_algorithm = 'blind'
-                            current_state = PUZZLE_SIZE_MENU
-                        elif text == 'Heuristic Search (A*)':
-                            selected_algorithm = 'heuristic'
-                            current_state = PUZZLE_SIZE_MENU
-            
+                draw_algorithm_menu()
             elif current_state == PUZZLE_SIZE_MENU:
-                buttons = draw_puzzle_size_menu()
-                for text, rect in buttons:
-                    if rect.collidepoint(mouse_pos):
-                        if text == 'Back':
-                            current_state = ALGORITHM_MENU if selected_algorithm else MAIN_MENU
-                        else:
-                            idx = GRAPHS.index(text)
-                            mainGraph = readGraph(FILENAMES[idx])
-                            current_state = GAME_SCREEN
+                draw_puzzle_size_menu()
+            elif current_state == GAME_SCREEN:
+                draw_game_screen()
+            pygame.display.update()
+            dirty = False
+            clock.tick(FPS)
+        
+        # Sleep until something happens, then handle everything that queued up meanwhile
+        for event in [pygame.event.wait()] + pygame.event.get():
+            if event.type == pygame.MOUSEMOTION:
+                # Only the menus have hover effects
+                dirty = dirty or current_state != GAME_SCREEN
+                continue
+            dirty = True
+            
+            if event.type == pygame.QUIT:
+                sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                if current_state == GAME_SCREEN:
+                    current_state = ALGORITHM_MENU
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                if current_state == GAME_SCREEN:
+                    hintMove = gameHints().hint()
+            elif event.type == pygame.MOUSEBUTTONUP:
+                mouse_pos = pygame.mouse.get_pos()
+            
+                if current_state == ALGORITHM_MENU:
+                    buttons = draw_algorithm_menu()
+                    for text, rect in buttons:
+                        if rect.collidepoint(mouse_pos):
+                            if text == 'Exit':
+                                sys.exit()
+                            elif text == 'Blind Search (DFS)':
+                                selected_algorithm = 'blind'
+                                current_state = PUZZLE_SIZE_MENU
+                            elif text == 'Heuristic Search (A*)':
+                                selected_algorithm = 'heuristic'
+                                current_state = PUZZLE_SIZE_MENU
+                            elif text == 'Frontier DP (Exact)':
+                                selected_algorithm = 'frontier'
+                                current_state = PUZZLE_SIZE_MENU
+            
+                elif current_state == PUZZLE_SIZE_MENU:
+                    buttons = draw_puzzle_size_menu()
+                    for text, rect in buttons:
+                        if rect.collidepoint(mouse_pos):
+                            if text == 'Back':
+                                current_state = ALGORITHM_MENU if selected_algorithm else MAIN_MENU
+                            else:
+                                idx = GRAPHS.index(text)
+                                mainGraph = readGraph(FILENAMES[idx])
+                                hintEngine = hintMove = None
+                                current_state = GAME_SCREEN
                             
-                            if selected_algorithm:
-                                back_button, base_x, base_y, cell_size = draw_game_screen()
-                                pygame.display.flip()
+                                if selected_algorithm:
+                                    back_button, base_x, base_y, cell_size = draw_game_screen()
+                                    pygame.display.flip()
                                 
-                                if selected_algorithm == 'blind':
-                                    draw_loading_screen("Running Blind Search")
-                                    blind_stats['start_time'] = time.time()
-                                    tracemalloc.start()
-                                    
-                                    result = solvedGraph(mainGraph, "blind")
+                                    if selected_algorithm == 'blind':
+                                        draw_loading_screen("Running Blind Search")
+                                        result = solvedGraph(mainGraph, "blind")
                                     
-                                    blind_stats['mem_storage'] = tracemalloc.get_traced_memory()
-                                    tracemalloc.stop()
-                                    blind_stats['end_time'] = time.time()
+                                        if result:
+                                            transforms, blind_stats['max_nodes'], blind_stats['loop'] = result
+                                            animate_solution(transforms, base_x, base_y, cell_size)
+                                            draw_game_result(blind_stats, "Blind Search Complete", True)
+                                        else:
+                                            draw_game_result(blind_stats, "Blind Search Failed", False)
+                                
+                                    elif selected_algorithm == 'frontier':
+                                        draw_loading_screen("Running Frontier DP")
+                                        result = solvedGraph(mainGraph, "frontier")
                                     
-                                    if result:
-                                        transforms, blind_stats['max_nodes'], blind_stats['loop'] = result
-                                        animate_solution(transforms, base_x, base_y, cell_size)
-                                        draw_game_result(blind_stats, "Blind Search Complete", True)
-                                    else:
-                                        draw_game_result(blind_stats, "Blind Search Failed", False)
+                                        if result:
+                                            transforms, frontier_stats['max_nodes'], frontier_stats['loop'] = result
+                                            animate_solution(transforms, base_x, base_y, cell_size)
+                                            draw_game_result(frontier_stats, "Frontier DP Complete", True)
+                                        else:
+                                            draw_game_result(frontier_stats, "Frontier DP Failed", False)
                                         
-                                else:
-                                    draw_loading_screen("Running Heuristic Search")
-                                    heuristic_stats['start_time'] = time.time()
-                                    tracemalloc.start()
-                                    
-                                    result = solvedGraph(mainGraph, "heuristic")
-                                    
-                                    heuristic_stats['mem_storage'] = tracemalloc.get_traced_memory()
-                                    tracemalloc.stop()
-                                    heuristic_stats['end_time'] = time.time()
-                                    
-                                    if result:
-                                        transforms, heuristic_stats['pre_max_nodes'], heuristic_stats['max_nodes'], heuristic_stats['pre_loop'], heuristic_stats['loop'] = result
-                                        animate_solution(transforms, base_x, base_y, cell_size)
-                                        draw_game_result(heuristic_stats, "Heuristic Search Complete", True)
                                     else:
-                                        draw_game_result(heuristic_stats, "Heuristic Search Failed", False)
+                                        draw_loading_screen("Running Heuristic Search")
+                                        result = solvedGraph(mainGraph, "heuristic")
+                                    
+                                        if result:
+                                            transforms, heuristic_stats['pre_max_nodes'], heuristic_stats['max_nodes'], heuristic_stats['pre_loop'], heuristic_stats['loop'] = result
+                                            animate_solution(transforms, base_x, base_y, cell_size)
+                                            draw_game_result(heuristic_stats, "Heuristic Search Complete", True)
+                                        else:
+                                            draw_game_result(heuristic_stats, "Heuristic Search Failed", False)
                                         
-                                current_state = ALGORITHM_MENU
+                                    current_state = ALGORITHM_MENU
             
-            elif current_state == GAME_SCREEN:
-                back_button, base_x, base_y, cell_size = draw_game_screen()
+                elif current_state == GAME_SCREEN:
+                    back_button, base_x, base_y, cell_size = draw_game_screen()
                 
-                if back_button.collidepoint(mouse_pos):
-                    current_state = ALGORITHM_MENU
-                else:
-                    # Handle puzzle piece rotation
-                    puzzle_width = cell_size * mainGraph.col
-                    puzzle_height = cell_size * mainGraph.row
-                    if (base_x <= mouse_pos[0] <= base_x + puzzle_width and 
-                        base_y <= mouse_pos[1] <= base_y + puzzle_height):
-                        col = (mouse_pos[0] - base_x) // cell_size
-                        row = (mouse_pos[1] - base_y) // cell_size
-                        if event.button == 1:  # Left click
-                            mainGraph.graph[row][col].leftRotate()
-                        else:  # Right click
-                            mainGraph.graph[row][col].rightRotate()
-    
-    if current_state == ALGORITHM_MENU:
-        draw_algorithm_menu()
-    elif current_state == PUZZLE_SIZE_MENU:
-        draw_puzzle_size_menu()
-    elif current_state == GAME_SCREEN:
-        draw_game_screen()
-    
-    pygame.display.update()
\ No newline at end of file
+                    if back_button.collidepoint(mouse_pos):
+                        current_state = ALGORITHM_MENU
+                    else:
+                        # Handle puzzle piece rotation
+                        puzzle_width = cell_size * mainGraph.col
+                        puzzle_height = cell_size * mainGraph.row
+                        if (base_x <= mouse_pos[0] <= base_x + puzzle_width and 
+                            base_y <= mouse_pos[1] <= base_y + puzzle_height):
+                            col = (mouse_pos[0] - base_x) // cell_size
+                            row = (mouse_pos[1] - base_y) // cell_size
+                            gameHints().rotate(row, col, event.button == 1)  # Left click rotates left, right click right
+                            hintMove = None
+
+if __name__ == "__main__":
+    main()
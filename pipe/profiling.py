@@ -0,0 +1,147 @@
+import sys
+import time
+from collections import Counter
+
+import measure
+
+class NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_PHASE = NullPhase()
+
+class NullProfiler:
+    """Default profiler of a Graph: every hook is a pass-through"""
+    def phase(self, name: str):
+        return NULL_PHASE
+
+    def call(self, name: str, fn, *args):
+        return fn(*args)
+
+    def frontierSize(self, size: int):
+        pass
+
+    def run(self, solve, *args, **kwargs):
+        return solve(*args, **kwargs)
+
+class Phase:
+    def __init__(self, entry: list):
+        self.entry = entry
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.entry[0] += 1
+        self.entry[1] += time.perf_counter() - self.start
+        return False
+
+class SolverProfiler(NullProfiler):
+    """Per-phase timers, call counters and a frontier histogram for one solver run
+
+    mode can be None (phase timers only), "cprofile" for a full cProfile of the run,
+    or "sampling" for a background thread that samples the solver's stack.
+    """
+    def __init__(self, mode: str | None = None, sampleInterval: float = 0.005):
+        if mode not in (None, "cprofile", "sampling"):
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.sampleInterval = sampleInterval
+        self.phases: dict[str, list] = {}
+        self.timers: dict[str, Phase] = {}
+        self.frontier = Counter()
+        self.samples = Counter()
+        self.stats = None
+        self.solver = None
+        self.total = 0.0
+
+    def phase(self, name: str):
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Phase(self.phases.setdefault(name, [0, 0.0]))
+        return timer
+
+    def call(self, name: str, fn, *args):
+        entry = self.phases.setdefault(name, [0, 0.0])
+        start = time.perf_counter()
+        result = fn(*args)
+        entry[0] += 1
+        entry[1] += time.perf_counter() - start
+        return result
+
+    def frontierSize(self, size: int):
+        # Power-of-two buckets: 0, 1, 2-3, 4-7, ...
+        self.frontier[size.bit_length()] += 1
+
+    def run(self, solve, *args, **kwargs):
+        self.solver = getattr(solve, "__name__", str(solve))
+        profile = None
+        if self.mode == "cprofile":
+            import cProfile
+            profile = cProfile.Profile()
+        sampler = None
+        if self.mode == "sampling":
+            import threading
+            stop = threading.Event()
+            filename = getattr(getattr(solve, "__code__", None), "co_filename", "")
+            sampler = threading.Thread(target=self.sample, args=(threading.get_ident(), filename, stop), daemon=True)
+            sampler.start()
+
+        start = time.perf_counter()
+        try:
+            if profile:
+                return profile.runcall(solve, *args, **kwargs)
+            return solve(*args, **kwargs)
+        finally:
+            self.total += time.perf_counter() - start
+            if profile:
+                import pstats
+                self.stats = pstats.Stats(profile)
+            if sampler:
+                stop.set()
+                sampler.join()
+
+    def sample(self, ident: int, filename: str, stop):
+        # Attribute each sample to the innermost line of the solver's own module
+        while not stop.wait(self.sampleInterval):
+            frame = sys._current_frames().get(ident)
+            while frame is not None and frame.f_code.co_filename != filename:
+                frame = frame.f_back
+            if frame is not None:
+                self.samples[f"{frame.f_code.co_name} (line {frame.f_lineno})"] += 1
+
+    def report(self, top: int = 20) -> dict:
+        phases = {}
+        for name, (calls, seconds) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            phases[name] = {
+                "calls": calls,
+                "seconds": seconds,
+                "share": seconds / self.total if self.total else 0.0
+            }
+
+        frontier = {}
+        for bucket in sorted(self.frontier):
+            low, high = (0, 0) if bucket == 0 else (1 << (bucket - 1), (1 << bucket) - 1)
+            frontier[f"{low}-{high}" if low != high else str(low)] = self.frontier[bucket]
+
+        report = {"solver": self.solver, "mode": self.mode, "seconds": self.total, "phases": phases, "frontier": frontier}
+
+        if self.stats is not None:
+            functions = []
+            for (file, line, name), (_, calls, tottime, cumtime, _) in self.stats.stats.items():
+                functions += [{"function": f"{name} ({file.rsplit('/', 1)[-1]}:{line})", "calls": calls, "tottime": tottime, "cumtime": cumtime}]
+            report["cprofile"] = sorted(functions, key=lambda f: -f["cumtime"])[:top]
+        if self.samples:
+            report["samples"] = dict(self.samples.most_common(top))
+        return report
+
+MEMORY_MODES = measure.MEMORY_MODES
+
+class MemoryMeter(measure.MemoryMeter):
+    """measure.MemoryMeter reading a Graph's memoryStats in "internal" mode"""
+    stats = "memoryStats"
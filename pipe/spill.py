@@ -0,0 +1,292 @@
+import heapq
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+# mmap and tempfile (which pulls in shutil, random and re) are imported by the methods that
+# spill, so importing the package stays cheap for searches that never touch the disk
+
+# A spilled queue entry: priority, insertion order, flags, number of transforms
+RECORD = struct.Struct("<dqBI")
+TRANSFORM = struct.Struct("<HHH")
+HAS_VISITED = 1
+
+MAX_RUNS = 64
+CHUNK = 1 << 16  # Hashes written per array.tofile call when a visited run is streamed to disk
+
+def mappedFile(path: str):
+    import mmap
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+def newRunFile(directory: str, suffix: str):
+    import tempfile
+    fd, path = tempfile.mkstemp(dir=directory, suffix=suffix)
+    return path, os.fdopen(fd, "wb")
+
+def distinct(keys):
+    """Drops repeats from a sorted stream"""
+    last = None
+    for key in keys:
+        if key != last:
+            yield key
+            last = key
+
+class Run:
+    """One sorted run of spilled entries, read back front to back through a memory map"""
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.map = mappedFile(path) if self.size else None
+        self.pos = 0
+        self.remaining = 0
+
+    def head(self):
+        connected, seq, _, _ = RECORD.unpack_from(self.map, self.pos)
+        return connected, seq
+
+    def read(self):
+        connected, seq, flags, count = RECORD.unpack_from(self.map, self.pos)
+        self.pos += RECORD.size
+        transforms = []
+        for _ in range(count):
+            row, col, times = TRANSFORM.unpack_from(self.map, self.pos)
+            self.pos += TRANSFORM.size
+            transforms += [(row, col, times)]
+        self.remaining -= 1
+        return connected, seq, flags, transforms
+
+    def readRaw(self):
+        """The next entry still encoded, as (connected, seq, record bytes)"""
+        connected, seq, _, count = RECORD.unpack_from(self.map, self.pos)
+        end = self.pos + RECORD.size + count * TRANSFORM.size
+        record = self.map[self.pos:end]
+        self.pos = end
+        self.remaining -= 1
+        return connected, seq, record
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+class SpillingPriorityQueue:
+    """Best-first queue with the PriorityQueue interface that keeps at most hotLimit entries in RAM
+
+    When the in-RAM heap overflows, its worse half is written to a sorted run file. Runs
+    are merged back lazily: before the top is read, any run whose head beats the in-RAM
+    minimum refills the heap, so entries still come out in exact priority order.
+    """
+    def __init__(self, directory: str, hotLimit: int = 50000, makeTransform=None):
+        self.directory = directory
+        self.hotLimit = max(hotLimit, 2)
+        self.makeTransform = makeTransform
+        self.hot = []
+        self.runs: list[Run] = []
+        self.runHeap = []
+        self.seq = 0
+        self.spilled = 0
+        self.bytes = 0
+        self.peakBytes = 0
+        self.diskBytes = 0
+
+    def len(self):
+        return len(self.hot) + self.spilled
+
+    def isEmpty(self):
+        return self.len() == 0
+
+    def minConnected(self):
+        if self.isEmpty(): return -1
+        return self.peek()[0]
+
+    def insert(self, connected, data):
+        heapq.heappush(self.hot, (connected, self.seq, data))
+        self.seq += 1
+        self.bytes += self.entryBytes(data)
+        self.peakBytes = max(self.peakBytes, self.bytes)
+        if len(self.hot) > self.hotLimit:
+            self.spill()
+
+    def peek(self):
+        self.refill()
+        if not self.hot:
+            raise IndexError("Queue is empty")
+        return self.hot[0]
+
+    def delete(self):
+        self.refill()
+        if not self.hot:
+            raise IndexError("Queue is empty")
+        entry = heapq.heappop(self.hot)
+        self.bytes -= self.entryBytes(entry[2])
+        return entry
+
+    @staticmethod
+    def entryBytes(data):
+        return sys.getsizeof(data) + sys.getsizeof(data["transforms"]) + 64
+
+    def spill(self):
+        self.hot.sort()
+        keep = self.hotLimit // 2
+        # Entries already marked visited are dead weight, so they are dropped instead of written
+        cold = [entry for entry in self.hot[keep:] if not entry[2].get("visited")]
+        self.hot = self.hot[:keep]
+        self.bytes = sum(self.entryBytes(entry[2]) for entry in self.hot)
+        if cold:
+            self.writeRun(self.encode(*entry) for entry in cold)
+        if len(self.runs) > MAX_RUNS:
+            self.mergeRuns()
+
+    @staticmethod
+    def encode(connected, seq, data) -> bytes:
+        flags = HAS_VISITED if "visited" in data else 0
+        transforms = data["transforms"]
+        return RECORD.pack(connected, seq, flags, len(transforms)) + b"".join(TRANSFORM.pack(t.row, t.col, t.times) for t in transforms)
+
+    def writeRun(self, records):
+        """Writes encoded entries, already in priority order, to a new run"""
+        path, file = newRunFile(self.directory, ".run")
+        count = 0
+        with file:
+            for record in records:
+                file.write(record)
+                count += 1
+        if count == 0:
+            os.unlink(path)
+            return
+        run = Run(path)
+        run.remaining = count
+        self.runs += [run]
+        self.spilled += count
+        self.diskBytes += run.size
+        heapq.heappush(self.runHeap, (run.head(), len(self.runs) - 1))
+
+    def mergeRuns(self):
+        # Collapse every open run into one so the number of mapped files stays bounded. Records are
+        # streamed from the inputs to the new run still encoded, so none is decoded into RAM here
+        def drain(run):
+            while run.remaining:
+                yield run.readRaw()
+        old = self.runs
+        merged = heapq.merge(*(drain(run) for run in old if run.remaining), key=lambda record: record[:2])
+        self.runs, self.runHeap, self.spilled = [], [], 0
+        self.writeRun(record for _, _, record in merged)
+        for run in old:
+            run.close()
+
+    def decode(self, flags, transforms):
+        data = {"transforms": [self.makeTransform(row, col, times) for row, col, times in transforms]}
+        if flags & HAS_VISITED:
+            data = {"visited": False, **data}
+        return data
+
+    def refill(self):
+        # Pull from runs until the in-RAM heap holds the global minimum, never past hotLimit + 1
+        # entries: a full heap takes one entry and then spills its worse half again
+        batch = max(1, self.hotLimit // 4)
+        while self.runHeap and (not self.hot or self.runHeap[0][0] < self.hot[0][:2]):
+            _, index = heapq.heappop(self.runHeap)
+            run = self.runs[index]
+            room = max(1, self.hotLimit - len(self.hot))
+            for _ in range(min(batch, room, run.remaining)):
+                connected, seq, flags, transforms = run.read()
+                data = self.decode(flags, transforms)
+                heapq.heappush(self.hot, (connected, seq, data))
+                self.bytes += self.entryBytes(data)
+                self.spilled -= 1
+            if run.remaining:
+                heapq.heappush(self.runHeap, (run.head(), index))
+            else:
+                run.close()
+            self.peakBytes = max(self.peakBytes, self.bytes)
+            if len(self.hot) > self.hotLimit:
+                self.spill()
+
+    def close(self):
+        for run in self.runs:
+            run.close()
+        self.runs, self.runHeap, self.hot, self.spilled = [], [], [], 0
+
+class SpillingVisitedSet:
+    """Set of visited state hashes that keeps the newest hotLimit hashes in RAM
+
+    Older hashes live in sorted memory-mapped runs of 64-bit integers and are found by
+    binary search; past MAX_RUNS runs they are streamed into one merged run on disk.
+    States are reduced to 64-bit hashes, so the set trades an astronomically small
+    chance of a false "already visited" for a fixed footprint.
+    """
+    MASK = (1 << 64) - 1
+
+    def __init__(self, directory: str, hotLimit: int = 200000):
+        self.directory = directory
+        self.hotLimit = max(hotLimit, 1)
+        self.hot = set()
+        self.runs = []
+        self.count = 0
+        self.diskBytes = 0
+
+    @staticmethod
+    def key(state) -> int:
+        return hash(state) & SpillingVisitedSet.MASK
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, state):
+        key = self.key(state)
+        if key in self.hot:
+            return True
+        for _, _, values in self.runs:
+            i = bisect_left(values, key)
+            if i < len(values) and values[i] == key:
+                return True
+        return False
+
+    def add(self, state):
+        if state in self:
+            return
+        self.hot.add(self.key(state))
+        self.count += 1
+        if len(self.hot) >= self.hotLimit:
+            self.runs += [self.writeRun(sorted(self.hot))]
+            self.hot = set()
+            if len(self.runs) > MAX_RUNS:
+                # k-way merge of the mapped runs into a new file; only CHUNK hashes are buffered
+                merged = self.writeRun(distinct(heapq.merge(*(values for _, _, values in self.runs))))
+                self.closeRuns()
+                self.runs = [merged]
+
+    def writeRun(self, keys):
+        """Writes sorted hashes to a new run and maps it for lookups"""
+        path, file = newRunFile(self.directory, ".visited")
+        with file:
+            chunk = array("Q")
+            for key in keys:
+                chunk.append(key)
+                if len(chunk) >= CHUNK:
+                    chunk.tofile(file)
+                    self.diskBytes += len(chunk) * 8
+                    chunk = array("Q")
+            chunk.tofile(file)
+            self.diskBytes += len(chunk) * 8
+        mapped = mappedFile(path)
+        return path, mapped, memoryview(mapped).cast("Q")
+
+    def hotBytes(self):
+        return sys.getsizeof(self.hot) + len(self.hot) * sys.getsizeof(1 << 62)
+
+    def closeRuns(self):
+        for path, mapped, values in self.runs:
+            values.release()
+            mapped.close()
+            os.unlink(path)
+        self.runs = []
+
+    def close(self):
+        self.closeRuns()
+        self.hot = set()
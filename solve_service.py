@@ -0,0 +1,230 @@
+"""Local solve service for the pipe and Sudoku solvers.
+
+Clients send one JSON request per line over a Unix socket (or TCP) and get one JSON
+response per line back, in the same order:
+
+    {"id": 1, "puzzle": "pipe", "board": [[{"type": "E", "index": 0}, ...], ...]}
+    {"id": 2, "puzzle": "sudoku", "board": [[5, 3, 0, ...], ...]}
+
+Pipe boards use the readGraph schema and may name an "algorithm" (frontier, heuristic
+or blind); the answer is a list of [row, col, times] left rotations. Sudoku boards are
+N²xN² grids (9x9, 16x16, 25x25, ...) with 0 for empty cells; the answer is the filled grid.
+
+Requests are solved in a process pool. Identical requests already in flight share one
+solve, recent answers are served from an LRU cache, and requests arriving within a
+short window are shipped to the pool together.
+
+    python solve_service.py --socket /tmp/solver.sock
+    python solve_service.py --host 127.0.0.1 --port 8765
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from pipe import compactTransforms, parseGraph, verifySolution
+from sudoku import Cell, SudokuSolver, box_size_of, geometry
+
+PIPE_ALGORITHMS = ("frontier", "heuristic", "blind")
+LINE_LIMIT = 1 << 24  # Large pipe boards do not fit asyncio's default 64 KiB line limit
+
+def solve_pipe(board, algorithm="frontier"):
+    if algorithm not in PIPE_ALGORITHMS:
+        raise ValueError(f"Unknown pipe algorithm: {algorithm}")
+    graph = parseGraph(board)
+    result = getattr(graph, f"{algorithm}Solve")()
+    if result is None or result[0] is None:
+        raise ValueError("No solution found")
+
+    original = parseGraph(board)
+    transforms = compactTransforms(original.graph, result[0])
+    if not verifySolution(original, transforms):
+        raise ValueError("Solver returned an invalid solution")
+    return [[t.row, t.col, t.times] for t in transforms]
+
+def solve_sudoku(board):
+    geo = geometry(box_size_of(board))
+    if any(len(row) != geo.size for row in board):
+        raise ValueError(f"Sudoku board must be {geo.size}x{geo.size}")
+    cells = [[Cell(x, y, int(board[x][y])) for y in range(geo.size)] for x in range(geo.size)]
+    for row in cells:
+        for cell in row:
+            cell.fixed = cell.value != 0
+
+    SudokuSolver(cells).solve_by_dfs(propagate=True)  # Plain MRV stalls on 25x25 boards
+    flat = [cell.value for row in cells for cell in row]
+    digits = set(range(1, geo.size + 1))
+    if any({flat[cell] for cell in unit} != digits for unit in geo.units):
+        raise ValueError("No solution found")
+    return [flat[x * geo.size:(x + 1) * geo.size] for x in range(geo.size)]
+
+def solve_request(request):
+    try:
+        if request.get("puzzle") == "pipe":
+            solution = solve_pipe(request["board"], request.get("algorithm", "frontier"))
+        elif request.get("puzzle") == "sudoku":
+            solution = solve_sudoku(request["board"])
+        else:
+            raise ValueError(f"Unknown puzzle: {request.get('puzzle')}")
+        return {"ok": True, "solution": solution}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+def solve_batch(requests):
+    """Runs in a pool worker: one round trip for a whole batch"""
+    return [solve_request(request) for request in requests]
+
+def request_key(request):
+    fields = {"puzzle": request.get("puzzle"), "board": request.get("board")}
+    if request.get("puzzle") == "pipe":
+        fields["algorithm"] = request.get("algorithm", "frontier")
+    return json.dumps(fields, sort_keys=True, separators=(",", ":"))
+
+class SolveService:
+    def __init__(self, workers=None, cache_size=1024, batch_window=0.002, max_batch=32):
+        self.workers = workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(self.workers)
+        self.cache_size = cache_size
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.cache = OrderedDict()
+        self.inflight = {}
+        self.pending = []
+        self.flush_handle = None
+        self.stats = {"requests": 0, "cached": 0, "coalesced": 0, "batches": 0, "solved": 0}
+
+    async def solve(self, request):
+        self.stats["requests"] += 1
+        key = request_key(request)
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats["cached"] += 1
+            return dict(self.cache[key], cached=True)
+
+        future = self.inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self.inflight[key] = future
+            self.pending.append((key, request))
+            self.schedule_flush()
+        return dict(await asyncio.shield(future), cached=False)
+
+    def schedule_flush(self):
+        loop = asyncio.get_running_loop()
+        if len(self.pending) >= self.max_batch:
+            if self.flush_handle is not None:
+                self.flush_handle.cancel()
+                self.flush_handle = None
+            loop.create_task(self.flush())
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.batch_window, lambda: loop.create_task(self.flush()))
+
+    async def flush(self):
+        self.flush_handle = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        self.stats["batches"] += 1
+
+        pool = self.pool
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(pool, solve_batch, [request for _, request in batch])
+        except BrokenProcessPool as e:
+            # A dead worker breaks the pool for good; replace it (once, if several batches saw it) so later batches run
+            if self.pool is pool:
+                self.pool = ProcessPoolExecutor(self.workers)
+                pool.shutdown(wait=False, cancel_futures=True)
+            results = [{"ok": False, "error": f"Worker failed: {e}"}] * len(batch)
+        except Exception as e:
+            results = [{"ok": False, "error": f"Worker failed: {e}"}] * len(batch)
+
+        for (key, _), result in zip(batch, results):
+            future = self.inflight.pop(key)
+            if result["ok"]:
+                self.stats["solved"] += 1
+                self.cache[key] = result
+                if len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+            if not future.done():
+                future.set_result(result)
+
+    async def handle_client(self, reader, writer):
+        # Replies go out in request order while later requests are already being solved
+        replies = asyncio.Queue()
+
+        async def write_replies():
+            while True:
+                reply = await replies.get()
+                if reply is None:
+                    break
+                writer.write(json.dumps(await reply).encode() + b"\n")
+                await writer.drain()
+
+        writer_task = asyncio.create_task(write_replies())
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    await replies.put(asyncio.create_task(self.answer(line)))
+            await replies.put(None)
+            await writer_task
+        except ConnectionError:
+            pass
+        finally:
+            writer_task.cancel()
+            writer.close()
+
+    async def answer(self, line):
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {"ok": False, "error": f"Invalid JSON: {e}"}
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Request must be a JSON object"}
+
+        response = await self.solve(request)
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+async def serve(service, socket_path=None, host="127.0.0.1", port=8765):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(service.handle_client, path=socket_path, limit=LINE_LIMIT)
+    else:
+        server = await asyncio.start_server(service.handle_client, host, port, limit=LINE_LIMIT)
+
+    print(f"Solve service listening on {socket_path or f'{host}:{port}'}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the pipe and Sudoku solvers over a local socket")
+    parser.add_argument("--socket", help="Unix socket path (default: TCP on --host/--port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: CPU count)")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--batch-window", type=float, default=0.002, help="seconds to wait while filling a batch")
+    parser.add_argument("--max-batch", type=int, default=32)
+    args = parser.parse_args()
+
+    service = SolveService(args.workers, args.cache_size, args.batch_window, args.max_batch)
+    try:
+        asyncio.run(serve(service, args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
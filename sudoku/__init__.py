@@ -0,0 +1,13 @@
+"""Headless Sudoku board and solvers.
+
+Importing this package loads neither pygame nor NumPy; the game lives in sudoku/sudoku_game.py.
+"""
+from .sudoku_initialization import BOARD_SIZE, BOX_SIZE, Board, Cell, CellView, Geometry, box_size_of, decode_values, encode_values, geometry
+from .sudoku_batch import bounded_map, solve_stream
+from .sudoku_dlx import DancingLinks
+from .sudoku_generator import DIFFICULTIES, PuzzleGenerator, count_solutions, rate
+from .sudoku_measure import MemoryMeter
+from .sudoku_propagation import Propagator
+from .sudoku_solver import SOLVE_METHODS, SudokuSolver, compare_algorithms
+from .sudoku_trace import Playback, StepTrace
+from .sudoku_vectorized import propagate_batch, solve_batch, unit_name, validate_batch
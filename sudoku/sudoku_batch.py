@@ -0,0 +1,135 @@
+"""Giải hàng loạt đề Sudoku dạng một dòng mỗi đề (81 ký tự cho 9x9, '.' hoặc '0' là ô trống)
+
+    python sudoku_batch.py puzzles.txt --output solutions.txt --workers 4
+    cat puzzles.txt | python sudoku_batch.py - --method dlx
+
+Mỗi dòng ra tương ứng một dòng vào, cùng thứ tự: "lời_giải solved mili_giây"; đề vô nghiệm
+hoặc sai định dạng cho "đề unsolvable ..." hoặc "- invalid ...". Dòng trống và dòng bắt đầu
+bằng '#' được bỏ qua; chỉ đọc cột đầu tiên nên đọc được cả tệp của sudoku_generator.py.
+"""
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+try:
+    from .sudoku_initialization import Board, decode_values, encode_values, numpy
+    from .sudoku_solver import SOLVE_METHODS, SudokuSolver
+except ImportError:
+    from sudoku_initialization import Board, decode_values, encode_values, numpy
+    from sudoku_solver import SOLVE_METHODS, SudokuSolver
+
+VECTORIZED = "vectorized"  # Giải cả nhóm đề một lần bằng sudoku_vectorized.solve_batch
+
+def bounded_map(pool, function, items, chunk, window, *args):
+    """Như pool.map theo từng nhóm chunk phần tử, nhưng chỉ giữ tối đa window nhóm đang chạy
+
+    function(nhóm, *args) trả về một danh sách; kết quả được sinh lần lượt theo thứ tự vào,
+    nên bộ nhớ không tăng theo số phần tử.
+    """
+    items = iter(items)
+    pending = deque()
+
+    def submit():
+        batch = list(islice(items, chunk))
+        if batch:
+            pending.append(pool.submit(function, batch, *args))
+
+    for _ in range(window):
+        submit()
+    while pending:
+        yield from pending.popleft().result()
+        submit()
+
+def solve_line(line, method="propagation"):
+    """Một dòng kết quả cho một dòng đề"""
+    puzzle = line.split()[0]
+    start = time.perf_counter()
+    try:
+        board = Board.from_string(puzzle)
+    except ValueError:
+        return f"- invalid {(time.perf_counter() - start) * 1000:.3f}\n"
+    solved = SOLVE_METHODS[method](SudokuSolver(board)) and board.is_solved()
+    elapsed = (time.perf_counter() - start) * 1000
+    if not solved:
+        return f"{puzzle} unsolvable {elapsed:.3f}\n"
+    return f"{board.to_string()} solved {elapsed:.3f}\n"
+
+def solve_chunk(lines, method="propagation"):
+    """Chạy trong tiến trình con"""
+    if method == VECTORIZED:
+        return solve_chunk_vectorized(lines)
+    return [solve_line(line, method) for line in lines]
+
+def solve_chunk_vectorized(lines):
+    """Các đề cùng kích thước trong nhóm được giải chung; thời gian mỗi đề là thời gian của cả
+    lô chia đều"""
+    try:
+        from .sudoku_vectorized import solve_batch
+    except ImportError:
+        from sudoku_vectorized import solve_batch
+    np = numpy()
+    results = [None] * len(lines)
+    groups = {}
+    for i, line in enumerate(lines):
+        start = time.perf_counter()
+        try:
+            values = decode_values(line.split()[0])
+        except ValueError:
+            results[i] = f"- invalid {(time.perf_counter() - start) * 1000:.3f}\n"
+            continue
+        groups.setdefault(len(values), []).append((i, values))
+
+    for group in groups.values():
+        start = time.perf_counter()
+        solutions, solved, _ = solve_batch(np.array([np.frombuffer(values, dtype=np.uint8) for _, values in group]))
+        elapsed = (time.perf_counter() - start) * 1000 / len(group)
+        for (i, values), solution, ok in zip(group, solutions, solved):
+            if ok:
+                results[i] = f"{encode_values(solution.tolist())} solved {elapsed:.3f}\n"
+            else:
+                results[i] = f"{encode_values(values)} unsolvable {elapsed:.3f}\n"
+    return results
+
+def puzzle_lines(source):
+    for line in source:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+def solve_stream(source, out, method="propagation", workers=None, chunk=64):
+    """Giải các đề đọc từ source, ghi kết quả theo thứ tự ra out; trả về (số đề, số đề giải được)"""
+    if method not in SOLVE_METHODS and method != VECTORIZED:
+        raise ValueError(f"Unknown method: {method}")
+    from concurrent.futures import ProcessPoolExecutor  # Nặng (multiprocessing, logging), chỉ nạp khi thật sự giải
+    workers = workers or os.cpu_count()
+    total = solved = 0
+    with ProcessPoolExecutor(workers) as pool:
+        for result in bounded_map(pool, solve_chunk, puzzle_lines(source), chunk, 2 * workers, method):
+            out.write(result)
+            total += 1
+            solved += " solved " in result
+    return total, solved
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Solve one-line Sudoku puzzles from a file or stdin")
+    parser.add_argument("input", nargs="?", default="-", help="puzzle file, '-' for stdin")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--method", choices=sorted(SOLVE_METHODS) + [VECTORIZED], default="propagation")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=64, help="puzzles per task sent to a worker")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == "-" else open(args.input)
+    out = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        total, solved = solve_stream(source, out, args.method, args.workers, args.chunk)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{solved}/{total} solved in {time.perf_counter() - start:.2f} s", file=sys.stderr)
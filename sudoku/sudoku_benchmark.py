@@ -0,0 +1,200 @@
+"""Benchmark các cách giải trên các bộ đề cố định trong corpora/ (easy, medium, hard, pathological)
+
+    python -m sudoku.sudoku_benchmark --output bench.json
+    python -m sudoku.sudoku_benchmark --solvers mrv,dlx --baseline bench.json --tolerance 0.2
+
+Mỗi đề được giải trên một bảng mới, đo bằng perf_counter; lấy thời gian nhỏ nhất qua --repeat
+lần chạy sau --warmup lần chạy không tính. Đề vượt --timeout giây bị dừng và ghi là timeout.
+Kết quả JSON có phân vị thời gian, số nút tìm kiếm và bộ nhớ đỉnh theo từng cách giải và bộ đề.
+Với --baseline, so sánh với một tệp JSON cũ và trả mã thoát 1 nếu có hồi quy.
+"""
+import argparse
+import gc
+import json
+import platform
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    from .sudoku_initialization import Board, decode_values
+    from .sudoku_measure import MEMORY_MODES, MemoryMeter
+    from .sudoku_solver import SOLVE_METHODS, SudokuSolver
+except ImportError:
+    from sudoku_initialization import Board, decode_values
+    from sudoku_measure import MEMORY_MODES, MemoryMeter
+    from sudoku_solver import SOLVE_METHODS, SudokuSolver
+
+CORPORA_DIR = Path(__file__).parent / "corpora"
+CORPORA = ("easy", "medium", "hard", "pathological")
+PERCENTILES = (50, 90, 99)
+
+class SolveTimeout(Exception):
+    pass
+
+def load_corpus(name):
+    """Danh sách (đề, lời giải) của một bộ đề, mỗi phần tử là bytearray"""
+    entries = []
+    with open(CORPORA_DIR / f"{name}.txt") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                puzzle, solution = line.split()[:2]
+                entries.append((decode_values(puzzle), decode_values(solution)))
+    return entries
+
+def percentile(values, q):
+    """Phân vị q theo thứ hạng gần nhất của một danh sách đã sắp xếp"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, -(-q * len(values) // 100) - 1))]
+
+def summarize(values):
+    values = sorted(values)
+    summary = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+    summary["max"] = values[-1] if values else None
+    summary["mean"] = sum(values) / len(values) if values else None
+    return summary
+
+def use_alarm(timeout):
+    """timeout được canh bằng SIGALRM, mà Python chỉ cho đặt handler và nhận tín hiệu ở luồng chính"""
+    if not timeout or not hasattr(signal, "setitimer"):
+        return False
+    if threading.current_thread() is not threading.main_thread():
+        raise RuntimeError("Benchmark timeouts use SIGALRM and only work in the main thread; pass timeout=0 to benchmark from another thread")
+    return True
+
+def run_once(method, puzzle, timeout, memory):
+    """(giây, số nút, byte đỉnh, bảng kết quả) của một lần giải; SolveTimeout nếu quá timeout"""
+    board = Board(int(len(puzzle) ** 0.25 + 0.5), bytearray(puzzle))
+    solver = SudokuSolver(board)
+    alarm = use_alarm(timeout)
+    if alarm:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    gc.disable()  # Như timeit: bộ thu gom rác chạy lúc nào là ngẫu nhiên, làm nhiễu thời gian
+    try:
+        with MemoryMeter(memory, solver) as meter:
+            start = time.perf_counter()
+            SOLVE_METHODS[method](solver)
+            elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return elapsed, solver.nodes, meter.usage[1], board.values
+
+def bench(method, entries, timeout=10.0, repeat=3, warmup=1, memory="internal"):
+    """Kết quả của một cách giải trên một bộ đề"""
+    times, nodes, peaks = [], [], []
+    timeouts = failures = 0
+    for puzzle, solution in entries:
+        try:
+            for _ in range(warmup):
+                run_once(method, puzzle, timeout, memory)
+            best = None
+            for _ in range(max(1, repeat)):
+                result = run_once(method, puzzle, timeout, memory)
+                if best is None or result[0] < best[0]:
+                    best = result
+        except SolveTimeout:
+            timeouts += 1
+            continue
+        elapsed, count, peak, values = best
+        if values != solution:
+            failures += 1
+            continue
+        times.append(elapsed)
+        nodes.append(count)
+        peaks.append(peak)
+    return {
+        "puzzles": len(entries),
+        "solved": len(times),
+        "timeouts": timeouts,
+        "failures": failures,
+        "seconds": summarize(times),
+        "nodes": summarize(nodes),
+        "peak_bytes": max(peaks) if peaks else None,
+    }
+
+def compare(results, baseline, tolerance=0.2, min_delta=0.001):
+    """Danh sách mô tả hồi quy so với baseline: giải được ít hơn, thêm timeout, phân vị số nút tăng
+    quá tolerance, hoặc phân vị thời gian chậm hơn quá tolerance (và quá min_delta giây, để bỏ qua
+    nhiễu ở các đề rất nhanh)"""
+    regressions = []
+    for method, corpora in results.items():
+        for corpus, current in corpora.items():
+            old = baseline.get(method, {}).get(corpus)
+            if old is None:
+                continue
+            where = f"{method}/{corpus}"
+            if current["solved"] < old["solved"]:
+                regressions.append(f"{where}: solved {old['solved']} -> {current['solved']}")
+            if current["timeouts"] > old["timeouts"]:
+                regressions.append(f"{where}: timeouts {old['timeouts']} -> {current['timeouts']}")
+            for key in (f"p{q}" for q in PERCENTILES):
+                before, after = old["seconds"].get(key), current["seconds"].get(key)
+                if before is not None and after is not None and after > before * (1 + tolerance) and after - before > min_delta:
+                    regressions.append(f"{where}: {key} {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+                # Số nút không phụ thuộc máy, nên bắt được hồi quy của thuật toán cả khi thời gian nhiễu
+                before, after = old["nodes"].get(key), current["nodes"].get(key)
+                if before is not None and after is not None and after > before * (1 + tolerance):
+                    regressions.append(f"{where}: {key} nodes {before} -> {after}")
+    return regressions
+
+def run(methods, corpora, timeout=10.0, repeat=3, warmup=1, memory="internal", log=None):
+    if use_alarm(timeout):
+        def on_alarm(signum, frame):
+            raise SolveTimeout()
+        signal.signal(signal.SIGALRM, on_alarm)
+    loaded = {name: load_corpus(name) for name in corpora}
+    results = {}
+    for method in methods:
+        results[method] = {}
+        for name, entries in loaded.items():
+            start = time.perf_counter()
+            results[method][name] = result = bench(method, entries, timeout, repeat, warmup, memory)
+            if log:
+                p50 = result["seconds"]["p50"]
+                log(f"{method:20} {name:13} {result['solved']:3}/{result['puzzles']:<3} timeouts {result['timeouts']:<3}"
+                    f" p50 {p50 * 1000 if p50 is not None else float('nan'):9.2f} ms   ({time.perf_counter() - start:.1f} s)")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Sudoku solvers on the fixed corpora")
+    parser.add_argument("--solvers", default=",".join(SOLVE_METHODS), help="comma-separated, from: " + ", ".join(SOLVE_METHODS))
+    parser.add_argument("--corpora", default=",".join(CORPORA), help="comma-separated, from: " + ", ".join(CORPORA))
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per solve, 0 for none")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--memory", choices=MEMORY_MODES, default="internal")
+    parser.add_argument("--output", help="JSON results file")
+    parser.add_argument("--baseline", help="JSON results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown of each percentile")
+    args = parser.parse_args()
+
+    methods = args.solvers.split(",")
+    corpora = args.corpora.split(",")
+    for method in methods:
+        if method not in SOLVE_METHODS:
+            parser.error(f"unknown solver: {method}")
+    for corpus in corpora:
+        if corpus not in CORPORA:
+            parser.error(f"unknown corpus: {corpus}")
+
+    results = run(methods, corpora, args.timeout, args.repeat, args.warmup, args.memory, log=lambda line: print(line, file=sys.stderr))
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"timeout": args.timeout, "repeat": args.repeat, "warmup": args.warmup, "memory": args.memory},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
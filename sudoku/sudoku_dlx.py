@@ -0,0 +1,159 @@
+try:
+    from .sudoku_initialization import box_size_of, geometry
+except ImportError:
+    from sudoku_initialization import box_size_of, geometry
+
+def cover_columns(geometry, x, y, num):
+    """4 cột ràng buộc (đánh số từ 1) mà phương án "đặt num tại (x, y)" phủ:
+    ô có số, hàng có số num, cột có số num, khối có số num"""
+    size, cells = geometry.size, geometry.cells
+    d = num - 1
+    return (1 + x * size + y,
+            1 + cells + x * size + d,
+            1 + 2 * cells + y * size + d,
+            1 + 3 * cells + geometry.box_of(x, y) * size + d)
+
+class DancingLinks:
+    """Thuật toán X của Knuth trên ma trận phủ chính xác, liên kết lưu bằng mảng chỉ số
+
+    Với bảng 9x9: nút 0 là đầu danh sách cột, nút 1..324 là đầu cột, các nút sau là phần tử
+    của 729 phương án. Mỗi đối tượng chỉ tìm kiếm được một lần.
+    """
+    def __init__(self, values):
+        self.geometry = geometry(box_size_of(values))
+        size, cells = self.geometry.size, self.geometry.cells
+        columns = 4 * cells
+        n = columns + 1
+        self.left = [i - 1 for i in range(n)]
+        self.right = [i + 1 for i in range(n)]
+        self.up = list(range(n))
+        self.down = list(range(n))
+        self.column = list(range(n))
+        self.option = [-1] * n  # Phương án ((x * size + y) * size + num - 1) của mỗi nút
+        self.size = [0] * n
+        self.left[0], self.right[columns] = columns, 0
+        self.first = []  # Nút đầu tiên của mỗi phương án
+        self.solution = []
+        self.updates = 0
+        self.nodes = 0  # Số phương án đã thử trong search
+        self.consistent = True
+
+        for x in range(size):
+            for y in range(size):
+                for num in range(1, size + 1):
+                    self.add_option((x * size + y) * size + num - 1, cover_columns(self.geometry, x, y, num))
+
+        # Chọn sẵn các phương án ứng với số cho trước
+        covered = set()
+        for x in range(size):
+            for y in range(size):
+                num = int(values[x][y])
+                if not num:
+                    continue
+                option_columns = cover_columns(self.geometry, x, y, num)
+                if covered & set(option_columns):
+                    self.consistent = False
+                    return
+                covered.update(option_columns)
+                self.select(self.first[(x * size + y) * size + num - 1])
+
+    def add_option(self, option, columns):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        start = len(left)
+        self.first.append(start)
+        for k, col in enumerate(columns):
+            node = start + k
+            left.append(start + (k - 1) % len(columns))
+            right.append(start + (k + 1) % len(columns))
+            up.append(up[col])
+            down.append(col)
+            down[up[col]] = node
+            up[col] = node
+            self.column.append(col)
+            self.option.append(option)
+            self.size[col] += 1
+
+    def cover(self, col):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                self.updates += 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, col):
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def select(self, node):
+        """Đưa phương án chứa node vào lời giải và phủ mọi cột của nó"""
+        self.solution.append(self.option[node])
+        self.cover(self.column[node])
+        j = self.right[node]
+        while j != node:
+            self.cover(self.column[j])
+            j = self.right[j]
+
+    def unselect(self, node):
+        j = self.left[node]
+        while j != node:
+            self.uncover(self.column[j])
+            j = self.left[j]
+        self.uncover(self.column[node])
+        self.solution.pop()
+
+    def solutions(self):
+        """Sinh lần lượt mọi lời giải, mỗi lời giải là một bảng giá trị"""
+        if not self.consistent:
+            return
+        yield from self.search()
+
+    def search(self):
+        right, size, down = self.right, self.size, self.down
+        if right[0] == 0:
+            yield self.grid()
+            return
+
+        # Cột còn ít phương án nhất (heuristic S của Knuth)
+        best, best_size = 0, self.geometry.cells + 1
+        col = right[0]
+        while col:
+            if size[col] < best_size:
+                best, best_size = col, size[col]
+                if best_size <= 1:
+                    break
+            col = right[col]
+        if best_size == 0:
+            return
+
+        node = down[best]
+        while node != best:
+            self.nodes += 1
+            self.select(node)
+            yield from self.search()
+            self.unselect(node)
+            node = down[node]
+
+    def grid(self):
+        size, cells = self.geometry.size, self.geometry.cells
+        values = [[0] * size for _ in range(size)]
+        for option in self.solution:
+            values[option // cells][option // size % size] = option % size + 1
+        return values
@@ -1,10 +1,34 @@
+import threading
+
 import pygame
-from sudoku_initialization import *
-from sudoku_solver import *
+
+try:
+    from .sudoku_initialization import *
+    from .sudoku_solver import *
+    from .sudoku_trace import Playback, StepTrace
+except ImportError:
+    from sudoku_initialization import *
+    from sudoku_solver import *
+    from sudoku_trace import Playback, StepTrace
 
 # Kích thước
-CELL_SIZE = 60
-WINDOW_SIZE = CELL_SIZE * BOARD_SIZE  
+MAX_CELL_SIZE = 60
+MAX_BOARD_PIXELS = 750  # Bảng lớn (16x16, 25x25) thu nhỏ ô để vừa cửa sổ
+
+# Phát lại lời giải
+FPS = 60
+PLAYBACK_RATE = 30  # Số bước mỗi giây; phím lên/xuống nhân/chia đôi, Space/Enter nhảy tới kết quả
+
+# Cách giải (tên trong SOLVE_METHODS) của từng nút: (bảng 9x9, bảng lớn hơn). DFS, greedy và A*
+# thuần không giải nổi 25x25 trong nhiều phút, nên bảng lớn dùng bản có lan truyền ràng buộc
+GAME_METHODS = {
+    "solving_by_dfs": ("dfs", "propagation"),
+    "solving_by_greedy": ("greedy", "greedy-propagation"),
+    "solving_by_astar": ("astar", "astar-propagation"),
+}
+
+def game_method(state, box_size):
+    return GAME_METHODS[state][box_size > BOX_SIZE]
 
 # Màu sắc
 WHITE = (255, 255, 255)
@@ -15,17 +39,24 @@ RED = (255, 0, 0)
 GREEN = (0, 200, 0)
 
 class Game:
-    def __init__(self):
+    def __init__(self, box_size=BOX_SIZE, playback_rate=PLAYBACK_RATE):
         pygame.init()
-        self.screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE + 100))  # Thêm không gian cho nút
+        self.box_size = box_size
+        self.playback_rate = playback_rate
+        self.size = box_size * box_size
+        self.cell_size = min(MAX_CELL_SIZE, MAX_BOARD_PIXELS // self.size)
+        self.window_size = self.cell_size * self.size
+        self.screen = pygame.display.set_mode((self.window_size, self.window_size + 100))  # Thêm không gian cho nút
         pygame.display.set_caption("Sudoku")
         self.font = pygame.font.Font(None, 40)
+        self.cell_font = pygame.font.Font(None, self.cell_size * 2 // 3)
         self.running = True
-        self.board = Board()
+        self.board = Board(box_size)
         self.selected_cell = None
         self.state = "start"  # "start", "playing", "end", "solving"
         self.win = False
-        self.solver = SudokuSolver(self.board.board, self)
+        self.playback = None  # Playback đang phát các bước của lần giải gần nhất
+        self.submitting = False  # Đã bấm Submit khi luồng giải chưa xong: chấm điểm khi phát xong
 
     def draw_button(self, text, x, y, width, height, color, action=None):
         """Vẽ nút bấm"""
@@ -40,40 +71,41 @@ class Game:
         """Vẽ bảng Sudoku"""
         self.screen.fill(WHITE)
         
-        for x in range(BOARD_SIZE):
-            for y in range(BOARD_SIZE):
+        cell_size, window_size = self.cell_size, self.window_size
+        for x in range(self.size):
+            for y in range(self.size):
                 cell = self.board.board[x][y]
-                rect = pygame.Rect(y * CELL_SIZE, x * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+                rect = pygame.Rect(y * cell_size, x * cell_size, cell_size, cell_size)
                 pygame.draw.rect(self.screen, GRAY, rect, 1)
 
                 if cell.value != 0:
                     color = BLACK if cell.fixed else BLUE
-                    text_surface = self.font.render(str(cell.value), True, color)
-                    self.screen.blit(text_surface, (y * CELL_SIZE + 20, x * CELL_SIZE + 15))
+                    text_surface = self.cell_font.render(SYMBOLS[cell.value - 1], True, color)
+                    self.screen.blit(text_surface, text_surface.get_rect(center=rect.center))
 
-        for i in range(0, BOARD_SIZE+1, 3):
-            pygame.draw.line(self.screen, BLACK, (0, i * CELL_SIZE), (WINDOW_SIZE, i * CELL_SIZE), 3)
-            pygame.draw.line(self.screen, BLACK, (i * CELL_SIZE, 0), (i * CELL_SIZE, WINDOW_SIZE), 3)
+        for i in range(0, self.size + 1, self.box_size):
+            pygame.draw.line(self.screen, BLACK, (0, i * cell_size), (window_size, i * cell_size), 3)
+            pygame.draw.line(self.screen, BLACK, (i * cell_size, 0), (i * cell_size, window_size), 3)
 
         if self.selected_cell:
             x, y = self.selected_cell
-            rect = pygame.Rect(y * CELL_SIZE, x * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            rect = pygame.Rect(y * cell_size, x * cell_size, cell_size, cell_size)
             pygame.draw.rect(self.screen, BLUE, rect, 3)
 
         # Vẽ nút Submit
-        self.submit_button = self.draw_button("Submit", (WINDOW_SIZE - 300) // 2, WINDOW_SIZE + 20, 300, 50, GREEN)
+        self.submit_button = self.draw_button("Submit", (window_size - 300) // 2, window_size + 20, 300, 50, GREEN)
 
     def draw_start_screen(self):
         """Vẽ màn hình bắt đầu"""
         self.screen.fill(WHITE)
         text_surface = self.font.render("SUDOKU GAME", True, BLACK)
-        text_rect = text_surface.get_rect(center=(WINDOW_SIZE // 2, WINDOW_SIZE // 3))
+        text_rect = text_surface.get_rect(center=(self.window_size // 2, self.window_size // 3))
         self.screen.blit(text_surface, text_rect)
-        self.start_button = self.draw_button("Start Game", (WINDOW_SIZE - 300) // 2, WINDOW_SIZE // 2, 300, 50, BLUE)
-        self.dfs_button = self.draw_button("Solving by DFS", (WINDOW_SIZE - 300) // 2, WINDOW_SIZE // 2 + 70, 300, 50, BLUE)
-        self.astar_button = self.draw_button("Solving by Astar", (WINDOW_SIZE - 300) // 2, WINDOW_SIZE // 2 + 140, 300, 50, BLUE)
-        # self.greedy_button = self.draw_button("Solving by Greedy", (WINDOW_SIZE - 300) // 2, WINDOW_SIZE // 2 + 210, 300, 50, BLUE)
-        self.greedy_button = self.draw_button("Solving by Greedy", (WINDOW_SIZE - 300) // 2, WINDOW_SIZE // 2 + 210, 0, 0, BLUE)
+        self.start_button = self.draw_button("Start Game", (self.window_size - 300) // 2, self.window_size // 2, 300, 50, BLUE)
+        self.dfs_button = self.draw_button("Solving by DFS", (self.window_size - 300) // 2, self.window_size // 2 + 70, 300, 50, BLUE)
+        self.astar_button = self.draw_button("Solving by Astar", (self.window_size - 300) // 2, self.window_size // 2 + 140, 300, 50, BLUE)
+        # self.greedy_button = self.draw_button("Solving by Greedy", (self.window_size - 300) // 2, self.window_size // 2 + 210, 300, 50, BLUE)
+        self.greedy_button = self.draw_button("Solving by Greedy", (self.window_size - 300) // 2, self.window_size // 2 + 210, 0, 0, BLUE)
 
     def draw_end_screen(self):
         """Vẽ màn hình kết thúc"""
@@ -81,9 +113,9 @@ class Game:
         text = "YOU WIN!" if self.win else "YOU LOSE!"
         color = GREEN if self.win else RED
         text_surface = self.font.render(text, True, color)
-        text_rect = text_surface.get_rect(center=(WINDOW_SIZE // 2, WINDOW_SIZE // 3))
+        text_rect = text_surface.get_rect(center=(self.window_size // 2, self.window_size // 3))
         self.screen.blit(text_surface, text_rect)
-        self.restart_button = self.draw_button("Restart", (WINDOW_SIZE - 300) // 2, WINDOW_SIZE // 2, 300, 50, BLUE)
+        self.restart_button = self.draw_button("Restart", (self.window_size - 300) // 2, self.window_size // 2, 300, 50, BLUE)
 
     def handle_mouse_click(self, pos):
         """Xử lý sự kiện nhấn chuột"""
@@ -91,36 +123,73 @@ class Game:
             if self.start_button.collidepoint(pos):
                 self.state = "playing"
             elif self.dfs_button.collidepoint(pos):
-                self.state = "solving_by_dfs"
-                self.solver.solve_by_dfs()
+                self.start_solving("solving_by_dfs")
             elif self.greedy_button.collidepoint(pos):
-                self.state = "solving_by_greedy"
-                self.solver.solve_by_greedy()
+                self.start_solving("solving_by_greedy")
             elif self.astar_button.collidepoint(pos):
-                self.state = "solving_by_astar"
-                self.solver.solve_by_astar()
+                self.start_solving("solving_by_astar")
         elif self.state == "playing" or self.state == "solving_by_dfs" or self.state == "solving_by_greedy" or self.state == "solving_by_astar":
             if self.submit_button.collidepoint(pos):
-                self.win = self.board.is_solved()
-                self.state = "end"
+                self.submit()
             else:
-                x, y = pos[1] // CELL_SIZE, pos[0] // CELL_SIZE
-                self.selected_cell = (x, y)
+                x, y = pos[1] // self.cell_size, pos[0] // self.cell_size
+                if x < self.size and y < self.size:
+                    self.selected_cell = (x, y)
         elif self.state == "end":
             if self.restart_button.collidepoint(pos):
-                self.__init__()
+                self.__init__(self.box_size, self.playback_rate)
+
+    def start_solving(self, state):
+        """Giải bằng cách giải game_method của nút, trên bản sao của bảng trong một luồng riêng; vòng
+        lặp chính phát các bước đã ghi trong khi luồng đó vẫn chạy, nên cửa sổ không bị treo khi
+        thuật toán chạy lâu"""
+        solve = SOLVE_METHODS[game_method(state, self.box_size)]
+        trace = StepTrace()
+        board = self.board.copy()
+        self.playback = Playback(self.board, trace, bytes(self.board.values), self.playback_rate, running=True)
+        playback = self.playback
+
+        def work():
+            try:
+                solve(SudokuSolver(board, trace))
+            finally:
+                playback.complete(board.values)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.state = state
+
+    def submit(self):
+        """Chấm điểm bảng hiện tại; nếu còn đang giải thì nhảy tới kết quả và chấm khi có"""
+        if self.playback:
+            self.playback.finish()
+            if self.playback.solving():
+                self.submitting = True
+                return
+            self.playback = None
+        self.win = self.board.is_solved()
+        self.state = "end"
 
     def handle_keypress(self, key):
-        """Xử lý nhập số"""
-        if self.state == "playing" and self.selected_cell:
+        """Xử lý nhập số; số lớn hơn 9 nhập bằng chữ cái A, B, ..."""
+        if self.playback:
+            if key in (pygame.K_SPACE, pygame.K_RETURN):
+                self.playback.finish()
+            elif key == pygame.K_UP:
+                self.playback_rate = self.playback.rate = self.playback.rate * 2
+            elif key == pygame.K_DOWN:
+                self.playback_rate = self.playback.rate = max(1, self.playback.rate / 2)
+        elif self.state == "playing" and self.selected_cell:
             x, y = self.selected_cell
             cell = self.board.board[x][y]
-            if not cell.fixed and key in range(pygame.K_1, pygame.K_9 + 1):
-                cell.value = key - pygame.K_0
+            symbol = pygame.key.name(key).upper()
+            if not cell.fixed and len(symbol) == 1 and symbol in SYMBOLS[:self.size]:
+                cell.value = SYMBOLS.index(symbol) + 1
 
     def run(self):
         """Vòng lặp chính của trò chơi"""
+        clock = pygame.time.Clock()
         while self.running:
+            seconds = clock.tick(FPS) / 1000
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
@@ -129,9 +198,16 @@ class Game:
                 elif event.type == pygame.KEYDOWN:
                     self.handle_keypress(event.key)
 
+            # Mỗi khung hình áp dụng mọi bước đến hạn rồi chỉ vẽ một lần
+            if self.playback and not self.playback.advance(seconds):
+                self.playback = None
+                if self.submitting:
+                    self.submitting = False
+                    self.submit()
+
             if self.state == "start":
                 self.draw_start_screen()
-            elif self.state == "playing":
+            elif self.state == "playing" or self.state.startswith("solving"):
                 self.draw_board()
             elif self.state == "end":
                 self.draw_end_screen()
@@ -140,7 +216,8 @@ class Game:
 
         pygame.quit()
 
-# Chạy game
+# Chạy game; tham số dòng lệnh là bậc khối (3 cho 9x9, 4 cho 16x16, 5 cho 25x25) và số bước phát lại mỗi giây
 if __name__ == "__main__":
-    game = Game()
+    import sys
+    game = Game(int(sys.argv[1]) if len(sys.argv) > 1 else BOX_SIZE, float(sys.argv[2]) if len(sys.argv) > 2 else PLAYBACK_RATE)
     game.run()
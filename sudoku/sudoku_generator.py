@@ -0,0 +1,126 @@
+import os
+import random
+import sys
+
+try:
+    from .sudoku_batch import bounded_map
+    from .sudoku_initialization import BOX_SIZE, Board, encode_values, geometry
+    from .sudoku_propagation import Propagator, digits
+except ImportError:
+    from sudoku_batch import bounded_map
+    from sudoku_initialization import BOX_SIZE, Board, encode_values, geometry
+    from sudoku_propagation import Propagator, digits
+
+# Độ khó theo kỹ thuật khó nhất cần dùng: naked single, hidden single, naked pair/triple,
+# pointing/claiming; "search" là đề phải rẽ nhánh mới giải được
+DIFFICULTIES = ("easy", "medium", "hard", "expert", "search")
+
+def rows_of(values, size):
+    return [values[x * size:(x + 1) * size] for x in range(size)]
+
+def count_solutions(values, limit=2):
+    """Số lời giải của bảng (mảng size * size giá trị), dừng khi đếm đủ limit"""
+    size = int(len(values) ** 0.5 + 0.5)
+    return Propagator(rows_of(values, size)).count(limit)
+
+def rate(values):
+    """Chỉ số trong DIFFICULTIES của đề có đúng một lời giải
+
+    Mỗi bước chỉ áp dụng luật rẻ nhất còn loại được ứng viên, như cách người chơi giải tay.
+    """
+    size = int(len(values) ** 0.5 + 0.5)
+    propagator = Propagator(rows_of(values, size))
+    if not propagator.consistent:
+        raise ValueError("Puzzle has conflicting clues")
+    steps = (propagator.propagate_singles, propagator.hidden_singles, propagator.naked_subsets, propagator.pointing)
+    hardest = 0
+    while not propagator.solved():
+        for level, step in enumerate(steps):
+            mark = len(propagator.trail)
+            if not step():
+                raise ValueError("Puzzle has no solution")
+            if len(propagator.trail) > mark:
+                hardest = max(hardest, level)
+                break
+        else:
+            return len(steps)
+    return hardest
+
+class PuzzleGenerator:
+    """Sinh đề có đúng một lời giải, mỗi đối tượng có RNG riêng nên cùng seed cho cùng dãy đề"""
+    def __init__(self, box_size=BOX_SIZE, seed=None):
+        self.geometry = geometry(box_size)
+        self.random = random.Random(seed)
+
+    def solution(self):
+        """Một bảng đầy đủ ngẫu nhiên: tìm kiếm có lan truyền, thử các số theo thứ tự xáo trộn"""
+        size = self.geometry.size
+        propagator = Propagator([[0] * size for _ in range(size)])
+
+        def shuffled(propagator, cell):
+            nums = digits(propagator.candidates[cell])
+            self.random.shuffle(nums)
+            return nums
+
+        propagator.search(shuffled)
+        return bytearray(mask.bit_length() for mask in propagator.candidates)
+
+    def puzzle(self, solution, max_difficulty=None):
+        """Xóa lần lượt các ô theo thứ tự ngẫu nhiên, giữ lại ô nào mà xóa đi thì đề mất tính duy nhất
+
+        max_difficulty (chỉ số trong DIFFICULTIES) giữ lại cả các ô mà xóa đi thì đề khó hơn mức đó.
+        """
+        values = bytearray(solution)
+        cells = list(range(self.geometry.cells))
+        self.random.shuffle(cells)
+        for cell in cells:
+            num = values[cell]
+            values[cell] = 0
+            if count_solutions(values) != 1 or (max_difficulty is not None and rate(values) > max_difficulty):
+                values[cell] = num
+        return values
+
+    def generate(self, max_difficulty=None):
+        """(Board của đề, lời giải, chỉ số độ khó)"""
+        solution = self.solution()
+        values = self.puzzle(solution, max_difficulty)
+        return Board(self.geometry.box_size, values), solution, rate(values)
+
+def generate_chunk(seeds, box_size=BOX_SIZE, max_difficulty=None):
+    """Chạy trong tiến trình con: một dòng "đề lời_giải độ_khó" cho mỗi seed"""
+    lines = []
+    for seed in seeds:
+        board, solution, level = PuzzleGenerator(box_size, seed).generate(max_difficulty)
+        lines.append(f"{board.to_string()} {encode_values(solution)} {DIFFICULTIES[level]}\n")
+    return lines
+
+def generate_to_file(out, count, box_size=BOX_SIZE, seed=0, workers=None, chunk=16, max_difficulty=None):
+    """Sinh count đề bằng nhiều tiến trình và ghi dần ra out theo thứ tự seed
+
+    Đề thứ i dùng seed + i. Chỉ giữ tối đa 2 * workers nhóm đang chạy nên bộ nhớ không tăng theo count.
+    """
+    from concurrent.futures import ProcessPoolExecutor  # Nặng (multiprocessing, logging), chỉ nạp khi sinh đề
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(workers) as pool:
+        for line in bounded_map(pool, generate_chunk, range(seed, seed + count), chunk, 2 * workers, box_size, max_difficulty):
+            out.write(line)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate Sudoku puzzles with a unique solution, one per line")
+    parser.add_argument("count", type=int)
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--box-size", type=int, default=BOX_SIZE, help="3 for 9x9, 4 for 16x16")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=16)
+    parser.add_argument("--max-difficulty", choices=DIFFICULTIES)
+    args = parser.parse_args()
+
+    max_difficulty = DIFFICULTIES.index(args.max_difficulty) if args.max_difficulty else None
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        generate_to_file(out, args.count, args.box_size, args.seed, args.workers, args.chunk, max_difficulty)
+    finally:
+        if out is not sys.stdout:
+            out.close()
@@ -1,13 +1,85 @@
 import random
-import numpy as np
 import sys
 
-BOARD_SIZE = 9 # Kích thước của bảng sudoku
+BOX_SIZE = 3 # Bậc của khối, bảng có BOX_SIZE * BOX_SIZE hàng
+BOARD_SIZE = BOX_SIZE * BOX_SIZE # Kích thước của bảng sudoku
 
-random.seed(0)
-np.random.seed(0)
+SYMBOLS = "123456789ABCDEFGHIJKLMNOP"  # Ký hiệu của số 1..25, số lớn hơn 9 viết bằng chữ cái
+_np = None
+
+def numpy():
+    """Chỉ nạp NumPy khi tạo bảng lần đầu để import module không tốn thời gian"""
+    global _np
+    if _np is None:
+        import numpy as np
+        _np = np
+    return _np
+
+class Geometry:
+    """Các nhóm ô của bảng có khối bậc box_size; chỉ số ô là x * size + y"""
+    def __init__(self, box_size):
+        n = box_size
+        size = n * n
+        self.box_size, self.size, self.cells = n, size, size * size
+        self.full_mask = (1 << size) - 1  # Bit (num - 1) ứng với số num
+        self.rows = [[x * size + y for y in range(size)] for x in range(size)]
+        self.cols = [[x * size + y for x in range(size)] for y in range(size)]
+        self.boxes = [[(bx + i) * size + by + j for i in range(n) for j in range(n)] for bx in range(0, size, n) for by in range(0, size, n)]
+        self.units = self.rows + self.cols + self.boxes
+        # 3 nhóm (hàng, cột, khối) của mỗi ô, theo chỉ số trong units
+        self.cell_units = [[x, size + y, 2 * size + self.box_of(x, y)] for x in range(size) for y in range(size)]
+        self.peers = [sorted(set().union(*(self.units[u] for u in units)) - {cell}) for cell, units in enumerate(self.cell_units)]
+
+        # Mỗi giao của một khối với một hàng/cột: (phần giao, phần còn lại của khối, phần còn lại của hàng/cột)
+        self.intersections = []
+        for b, box in enumerate(self.boxes):
+            bx, by = (b // n) * n, (b % n) * n
+            for line in self.rows[bx:bx + n] + self.cols[by:by + n]:
+                common = [cell for cell in box if cell in line]
+                self.intersections.append((common, [cell for cell in box if cell not in common], [cell for cell in line if cell not in common]))
+
+    def box_of(self, x, y):
+        return (x // self.box_size) * self.box_size + y // self.box_size
+
+_geometries = {}
+
+def geometry(box_size=BOX_SIZE):
+    """Geometry dùng chung cho mỗi bậc khối"""
+    if box_size not in _geometries:
+        _geometries[box_size] = Geometry(box_size)
+    return _geometries[box_size]
+
+def box_size_of(board):
+    """Bậc khối của một bảng size x size (size phải là số chính phương)"""
+    n = int(len(board) ** 0.5 + 0.5)
+    if n * n != len(board):
+        raise ValueError(f"Board size {len(board)} is not a perfect square")
+    return n
+
+def encode_values(values):
+    """Bảng (mảng size * size giá trị) thành một dòng ký tự, '.' cho ô trống"""
+    return "".join(SYMBOLS[num - 1] if num else "." for num in values)
+
+def decode_values(text):
+    """Ngược của encode_values; ô trống là '.' hoặc '0'"""
+    text = text.strip()
+    n = int(len(text) ** 0.25 + 0.5)
+    if n < 1 or n ** 4 != len(text):
+        raise ValueError(f"Puzzle line has {len(text)} characters, not N^4")
+    symbols = SYMBOLS[:n * n]
+    values = bytearray(len(text))
+    for i, ch in enumerate(text.upper()):
+        if ch in ".0":
+            continue
+        if ch not in symbols:
+            raise ValueError(f"Invalid symbol {ch!r} at position {i}")
+        values[i] = symbols.index(ch) + 1
+    return values
 
 class Cell:
+    """Ô độc lập, dùng khi bảng không do Board quản lý"""
+    __slots__ = ("x", "y", "value", "fixed")
+
     def __init__(self, x, y, value):
         self.x = x
         self.y = y
@@ -17,62 +89,123 @@ class Cell:
     def __lt__(self, other):
         return (self.x, self.y) < (other.x, other.y)
 
+class CellView:
+    """Ô của một Board: giá trị và cờ cố định đọc/ghi thẳng vào mảng của bảng"""
+    __slots__ = ("grid", "x", "y", "index")
+
+    def __init__(self, grid, x, y):
+        self.grid = grid
+        self.x = x
+        self.y = y
+        self.index = x * grid.size + y
+
+    @property
+    def value(self):
+        return self.grid.values[self.index]
+
+    @value.setter
+    def value(self, value):
+        self.grid.values[self.index] = value
+
+    @property
+    def fixed(self):
+        return bool(self.grid.fixed >> self.index & 1)
+
+    @fixed.setter
+    def fixed(self, fixed):
+        if fixed:
+            self.grid.fixed |= 1 << self.index
+        else:
+            self.grid.fixed &= ~(1 << self.index)
+
+    def __lt__(self, other):
+        return (self.x, self.y) < (other.x, other.y)
+
 class Board:
-    def __init__(self):
-        self.board = [[Cell(x, y, 0) for y in range(BOARD_SIZE)] for x in range(BOARD_SIZE)]
+    """Bảng Sudoku lưu giá trị trong một bytearray (ô x * size + y) và các ô cố định trong một mặt nạ bit
+
+    Không truyền values thì sinh đề mới từ seed (None: seed ngẫu nhiên); truyền values (và fixed)
+    thì chỉ bọc mảng đó.
+    """
+    def __init__(self, box_size=BOX_SIZE, values=None, fixed=None, seed=None):
+        self.box_size = box_size
+        self.size = box_size * box_size
+        self._board = None
+        if values is not None:
+            self.values = values
+            self.fixed = fixed if fixed is not None else sum(1 << i for i, num in enumerate(values) if num)
+            return
+        self.values = bytearray(self.size * self.size)
+        self.fixed = (1 << (self.size * self.size)) - 1
+        self.random = random.Random(seed)  # RNG riêng của bảng, chỉ cần khi sinh đề
         self.generate_board()
-        self.remove_numbers(40)
+        self.remove_numbers(self.size * self.size * 40 // 81)
+
+    @classmethod
+    def from_string(cls, text):
+        """Bảng từ một dòng encode_values"""
+        values = decode_values(text)
+        return cls(int(len(values) ** 0.25 + 0.5), values)
+
+    def to_string(self):
+        return encode_values(self.values)
+
+    @property
+    def board(self):
+        """Lưới CellView cho giao diện và các solver đọc theo ô, chỉ dựng khi cần"""
+        if self._board is None:
+            self._board = [[CellView(self, x, y) for y in range(self.size)] for x in range(self.size)]
+        return self._board
+
+    def rows(self):
+        """Giá trị từng hàng, mỗi hàng là một lát cắt của mảng"""
+        return [self.values[x * self.size:(x + 1) * self.size] for x in range(self.size)]
     
     def generate_board(self):
         """Tạo một bảng Sudoku hợp lệ"""
-        base = np.array([[((i * 3 + i // 3 + j) % 9) + 1 for j in range(9)] for i in range(9)])  
-        for i in range(0, 9, 3):
-            np.random.shuffle(base[i:i+3, :])
+        np = numpy()
+        rng = np.random.default_rng(self.random.getrandbits(64))
+        n, size = self.box_size, self.size
+        base = np.array([[((i * n + i // n + j) % size) + 1 for j in range(size)] for i in range(size)])  
+        for i in range(0, size, n):
+            rng.shuffle(base[i:i+n, :])
         base = base.T
-        for i in range(0, 9, 3):
-            np.random.shuffle(base[i:i+3, :])
+        for i in range(0, size, n):
+            rng.shuffle(base[i:i+n, :])
         base = base.T  
 
-        for x in range(BOARD_SIZE):
-            for y in range(BOARD_SIZE):
-                self.board[x][y].value = base[x, y]
+        self.values[:] = base.astype(np.uint8).tobytes()
 
     def remove_numbers(self, num_to_remove=40):
         """Xóa số ngẫu nhiên để tạo Sudoku"""
-        positions = [(x, y) for x in range(BOARD_SIZE) for y in range(BOARD_SIZE)]
-        random.shuffle(positions)
+        positions = [(x, y) for x in range(self.size) for y in range(self.size)]
+        self.random.shuffle(positions)
         for i in range(num_to_remove):
             x, y = positions[i]
-            self.board[x][y].value = 0
-            self.board[x][y].fixed = False  # Những ô trống có thể chỉnh sửa
+            self.values[x * self.size + y] = 0
+            self.fixed &= ~(1 << (x * self.size + y))  # Những ô trống có thể chỉnh sửa
 
     def is_solved(self):
-        """Kiểm tra xem Sudoku đã hoàn thành đúng chưa"""
-        for row in range(BOARD_SIZE):
-            if len(set(self.board[row][col].value for col in range(BOARD_SIZE))) != BOARD_SIZE:
-                return False
-        for col in range(BOARD_SIZE):
-            if len(set(self.board[row][col].value for row in range(BOARD_SIZE))) != BOARD_SIZE:
-                return False
-        return True
+        """Kiểm tra xem Sudoku đã hoàn thành đúng chưa: mọi hàng, cột, khối chứa đủ 1..size"""
+        digits = set(range(1, self.size + 1))
+        values = self.values
+        return all({values[cell] for cell in unit} == digits for unit in geometry(self.box_size).units)
     
     def copy(self):
-        """Tạo một bản sao của bảng"""
-        new_board = Board()
-        for x in range(BOARD_SIZE):
-            for y in range(BOARD_SIZE):
-                new_board.board[x][y].value = self.board[x][y].value
-                new_board.board[x][y].fixed = self.board[x][y].fixed
-        return new_board
+        """Tạo một bản sao của bảng, chỉ sao chép mảng giá trị"""
+        return Board(self.box_size, bytearray(self.values), self.fixed)
     
     def show_values(self):
         """Hiển thị giá trị các ô"""
-        for row in self.board:
-            print([cell.value for cell in row])
+        for row in self.rows():
+            print(list(row))
 
     def memory_usage(self):
         """Tính toán độ tiêu tốn bộ nhớ của bảng Sudoku"""
-        return sys.getsizeof(self.board) + sum(sys.getsizeof(cell) for row in self.board for cell in row)
+        usage = sys.getsizeof(self.values) + sys.getsizeof(self.fixed)
+        if self._board is not None:
+            usage += sys.getsizeof(self._board) + sum(sys.getsizeof(row) + sum(sys.getsizeof(cell) for cell in row) for row in self._board)
+        return usage
 
 if __name__ == "__main__":
     sudoku = Board()
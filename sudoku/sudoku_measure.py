@@ -0,0 +1 @@
+from measure import MEMORY_MODES, MemoryMeter, current_rss, peak_rss
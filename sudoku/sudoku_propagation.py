@@ -0,0 +1,203 @@
+from itertools import combinations
+
+try:
+    from .sudoku_initialization import box_size_of, geometry
+except ImportError:
+    from sudoku_initialization import box_size_of, geometry
+
+def digits(mask):
+    """Các số (từ 1) có bit bật trong mask, theo thứ tự tăng dần"""
+    result = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        result.append(bit.bit_length())
+    return result
+
+class Propagator:
+    """Tập ứng viên của mọi ô, lan truyền ràng buộc tới điểm bất động và hoàn tác được qua trail
+
+    Luật: naked single, hidden single, naked pair/triple, pointing/claiming giữa khối và hàng/cột.
+    """
+    def __init__(self, values):
+        self.geometry = geometry(box_size_of(values))
+        self.size = self.geometry.size
+        self.candidates = [self.geometry.full_mask] * self.geometry.cells
+        self.trail = []  # (ô, mặt nạ cũ) theo thứ tự thay đổi
+        self.singles = []  # Ô vừa còn một ứng viên, chờ loại số đó khỏi các ô cùng nhóm
+        self.branches = 0
+        self.consistent = True
+        for x in range(self.size):
+            for y in range(self.size):
+                num = int(values[x][y])
+                if num and not self.assign(x * self.size + y, num):
+                    self.consistent = False
+
+    def checkpoint(self):
+        return len(self.trail)
+
+    def undo(self, mark):
+        """Khôi phục mọi ứng viên về thời điểm checkpoint() trả về mark"""
+        trail, candidates = self.trail, self.candidates
+        while len(trail) > mark:
+            cell, mask = trail.pop()
+            candidates[cell] = mask
+        self.singles.clear()
+
+    def eliminate(self, cell, mask):
+        """Loại các số trong mask khỏi ô; False nếu ô hết ứng viên"""
+        old = self.candidates[cell]
+        if not old & mask:
+            return True
+        self.trail.append((cell, old))
+        new = old & ~mask
+        self.candidates[cell] = new
+        if new == 0:
+            return False
+        if new.bit_count() == 1:
+            self.singles.append(cell)
+        return True
+
+    def assign(self, cell, num):
+        return self.eliminate(cell, self.geometry.full_mask & ~(1 << (num - 1))) and self.candidates[cell] != 0
+
+    def propagate(self):
+        """Áp dụng các luật tới khi không còn thay đổi; False nếu gặp mâu thuẫn"""
+        while True:
+            if not self.propagate_singles():
+                return False
+            mark = len(self.trail)
+            if not (self.hidden_singles() and self.propagate_singles() and self.naked_subsets() and self.pointing()):
+                return False
+            if len(self.trail) == mark:
+                return True
+
+    def propagate_singles(self):
+        candidates = self.candidates
+        while self.singles:
+            cell = self.singles.pop()
+            mask = candidates[cell]
+            for peer in self.geometry.peers[cell]:
+                if candidates[peer] & mask and not self.eliminate(peer, mask):
+                    return False
+        return True
+
+    def hidden_singles(self):
+        candidates = self.candidates
+        for unit in self.geometry.units:
+            seen_once = seen_twice = 0
+            for cell in unit:
+                mask = candidates[cell]
+                seen_twice |= seen_once & mask
+                seen_once |= mask
+            if seen_once != self.geometry.full_mask:
+                return False  # Có số không còn chỗ nào trong nhóm
+            only = seen_once & ~seen_twice
+            if not only:
+                continue
+            for cell in unit:
+                mask = candidates[cell] & only
+                if mask and candidates[cell].bit_count() > 1:
+                    if mask.bit_count() > 1 or not self.eliminate(cell, candidates[cell] & ~mask):
+                        return False
+        return True
+
+    def naked_subsets(self):
+        candidates = self.candidates
+        for unit in self.geometry.units:
+            open_cells = [cell for cell in unit if 1 < candidates[cell].bit_count() <= 3]
+            for size in (2, 3):
+                for group in combinations(open_cells, size):
+                    union = 0
+                    for cell in group:
+                        union |= candidates[cell]
+                    if union.bit_count() != size:
+                        continue
+                    for cell in unit:
+                        if cell not in group and candidates[cell] & union and not self.eliminate(cell, union):
+                            return False
+        return True
+
+    def pointing(self):
+        candidates = self.candidates
+        for common, box_rest, line_rest in self.geometry.intersections:
+            inside = box_only = line_only = 0
+            for cell in common:
+                inside |= candidates[cell]
+            for cell in box_rest:
+                box_only |= candidates[cell]
+            for cell in line_rest:
+                line_only |= candidates[cell]
+            # Pointing: số chỉ nằm ở phần giao trong khối thì bị loại khỏi phần còn lại của hàng/cột
+            pointing = inside & ~box_only
+            # Claiming: số chỉ nằm ở phần giao trong hàng/cột thì bị loại khỏi phần còn lại của khối
+            claiming = inside & ~line_only
+            for cell in line_rest:
+                if candidates[cell] & pointing and not self.eliminate(cell, pointing):
+                    return False
+            for cell in box_rest:
+                if candidates[cell] & claiming and not self.eliminate(cell, claiming):
+                    return False
+        return True
+
+    def solved(self):
+        return all(mask.bit_count() == 1 for mask in self.candidates)
+
+    def values(self):
+        """Bảng giá trị hiện tại, 0 cho ô chưa chắc chắn"""
+        size = self.size
+        return [[mask.bit_length() if mask.bit_count() == 1 else 0 for mask in self.candidates[x * size:(x + 1) * size]] for x in range(size)]
+
+    def search(self, order_values=None, on_step=None):
+        """DFS có lan truyền sau mỗi phép gán; rẽ nhánh tại ô ít ứng viên nhất
+
+        order_values(propagator, cell) sắp thứ tự các số thử tại ô, mặc định tăng dần.
+        on_step(propagator) được gọi sau mỗi lần lan truyền thành công.
+        """
+        if not self.consistent or not self.propagate():
+            return False
+        if on_step:
+            on_step(self)
+        open_cells = [cell for cell in range(self.geometry.cells) if self.candidates[cell].bit_count() > 1]
+        if not open_cells:
+            return True
+
+        cell = min(open_cells, key=lambda cell: self.candidates[cell].bit_count())
+        choices = order_values(self, cell) if order_values else digits(self.candidates[cell])
+        for num in choices:
+            self.branches += 1
+            mark = self.checkpoint()
+            if self.assign(cell, num) and self.search(order_values, on_step):
+                return True
+            self.undo(mark)
+        return False
+
+    def count(self, limit=2):
+        """Số lời giải, dừng khi đếm đủ limit; ứng viên được khôi phục sau khi đếm"""
+        if not self.consistent:
+            return 0
+        mark = self.checkpoint()
+        pending = list(self.singles)  # undo() bỏ hàng đợi, nên giữ lại các ô (số đề) chưa lan truyền
+        found = self.count_from(limit)
+        self.undo(mark)
+        self.singles.extend(pending)
+        return found
+
+    def count_from(self, limit):
+        if not self.propagate():
+            return 0
+        open_cells = [cell for cell in range(self.geometry.cells) if self.candidates[cell].bit_count() > 1]
+        if not open_cells:
+            return 1
+
+        cell = min(open_cells, key=lambda cell: self.candidates[cell].bit_count())
+        found = 0
+        for num in digits(self.candidates[cell]):
+            self.branches += 1
+            mark = self.checkpoint()
+            if self.assign(cell, num):
+                found += self.count_from(limit - found)
+            self.undo(mark)
+            if found >= limit:
+                break
+        return found
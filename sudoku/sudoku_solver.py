@@ -1,72 +1,256 @@
-import pygame
+import sys
 import time
-import tracemalloc
 import heapq
-from sudoku_initialization import *
+
+try:
+    from .sudoku_initialization import *
+    from .sudoku_propagation import Propagator, digits
+    from .sudoku_dlx import DancingLinks
+    from .sudoku_tracker import CandidateTracker
+except ImportError:
+    from sudoku_initialization import *
+    from sudoku_propagation import Propagator, digits
+    from sudoku_dlx import DancingLinks
+    from sudoku_tracker import CandidateTracker
 
 class SudokuSolver:
-    def __init__(self, board, game=None):
+    def __init__(self, board, trace=None):
+        if isinstance(board, Board):
+            self.grid, board = board, board.board  # Bảng dạng mảng, để sao chép/nạp cả bảng một lần
+        else:
+            self.grid = None
         self.board = board
-        self.game = game  # Thêm tham chiếu đến game để cập nhật giao diện
-
-    def show_values(self, board=None):
-        """Hiển thị giá trị trên bảng Sudoku"""
-        if board != None:
-            for x in range(BOARD_SIZE):
-                for y in range(BOARD_SIZE):
-                    self.board[x][y].value = board[x][y].value
-
-        if self.game != None:
-            self.game.draw_board()
-            pygame.display.flip()
-            time.sleep(0.1)
+        self.geometry = geometry(box_size_of(board))  # Bảng size x size với khối box_size x box_size
+        self.size, self.box_size = self.geometry.size, self.geometry.box_size
+        self.trace = trace  # StepTrace nhận các bước khi giải (None: không ghi), giao diện phát lại sau
+        self.memory = {}  # Số byte cấp phát cho cấu trúc tìm kiếm ở lần giải gần nhất
+        self.nodes = 0  # Số nút tìm kiếm (phép gán thử hoặc trạng thái mở rộng) ở lần giải gần nhất
+
+    def value_rows(self):
+        """Giá trị từng hàng của bảng đang giải"""
+        if self.grid is not None:
+            return self.grid.rows()
+        return [[cell.value for cell in row] for row in self.board]
+
+    def snapshot(self):
+        """Giá trị cả bảng dạng size * size byte"""
+        if self.grid is not None:
+            return bytes(self.grid.values)
+        return bytes(int(cell.value) for row in self.board for cell in row)
+
+    def record(self, x, y, num):
+        """Ghi bước gán num (0 là xóa) vào ô (x, y)"""
+        if self.trace is not None:
+            self.trace.set(x * self.size + y, num)
+
+    def working_values(self):
+        """Mảng giá trị để solver đọc/ghi thẳng: mảng của Board, hoặc bản sao của lưới Cell (chép lại bằng store_values)"""
+        return self.grid.values if self.grid is not None else bytearray(self.snapshot())
+
+    def store_values(self, values):
+        """Chép mảng của working_values về lưới Cell; mảng của Board đã chính là bảng"""
+        if self.grid is None:
+            self.load_state(values)
+
+    def record_board(self, values=None):
+        """Ghi bước nạp cả bảng (mặc định là bảng hiện tại)"""
+        if self.trace is not None:
+            self.trace.load(self.snapshot() if values is None else values)
     
     def is_valid(self, x, y, num):
-        for i in range(BOARD_SIZE):
+        n = self.box_size
+        for i in range(self.size):
             if self.board[x][i].value == num or self.board[i][y].value == num:
                 return False
-        box_x, box_y = (x // 3) * 3, (y // 3) * 3
-        for i in range(3):
-            for j in range(3):
+        box_x, box_y = (x // n) * n, (y // n) * n
+        for i in range(n):
+            for j in range(n):
                 if self.board[box_x + i][box_y + j].value == num:
                     return False
         return True
     
     def get_empty_cells(self):
-        return [(x, y) for x in range(BOARD_SIZE) for y in range(BOARD_SIZE) if self.board[x][y].value == 0]
+        return [(x, y) for x in range(self.size) for y in range(self.size) if self.board[x][y].value == 0]
+
+    def init_masks(self):
+        """Dựng mặt nạ bit các số đã dùng của từng hàng, cột, khối; False nếu đề bài mâu thuẫn"""
+        self.row_masks = [0] * self.size
+        self.col_masks = [0] * self.size
+        self.box_masks = [0] * self.size
+        for cell, num in enumerate(self.values):
+            if num == 0:
+                continue
+            x, y = divmod(cell, self.size)
+            bit = 1 << (num - 1)
+            if (self.row_masks[x] | self.col_masks[y] | self.box_masks[self.geometry.box_of(x, y)]) & bit:
+                return False
+            self.place(x, y, num)
+        return True
+
+    def place(self, x, y, num):
+        bit = 1 << (num - 1)
+        self.row_masks[x] |= bit
+        self.col_masks[y] |= bit
+        self.box_masks[self.geometry.box_of(x, y)] |= bit
+        self.values[x * self.size + y] = num
+
+    def unplace(self, x, y, num):
+        bit = ~(1 << (num - 1))
+        self.row_masks[x] &= bit
+        self.col_masks[y] &= bit
+        self.box_masks[self.geometry.box_of(x, y)] &= bit
+        self.values[x * self.size + y] = 0
+
+    def candidate_mask(self, x, y):
+        """Mặt nạ các số còn đặt được tại (x, y)"""
+        return ~(self.row_masks[x] | self.col_masks[y] | self.box_masks[self.geometry.box_of(x, y)]) & self.geometry.full_mask
+
+    def solve_by_mrv(self):
+        """DFS trên mặt nạ bit, mỗi bước chọn ô còn ít lựa chọn nhất (MRV)"""
+        self.values = self.working_values()  # init_masks, place và unplace dùng mảng này
+        if not self.init_masks():
+            return False
+        empty_cells = [divmod(cell, self.size) for cell, num in enumerate(self.values) if num == 0]
+        self.memory = {"empty_cells": sys.getsizeof(empty_cells) + sum(sys.getsizeof(cell) for cell in empty_cells)}
+        self.nodes = 0
 
-    def solve_by_dfs(self):
-        empty_cells = self.get_empty_cells()
-        
         def dfs(index):
             if index == len(empty_cells):
                 return True
+            # Đưa ô có ít ứng viên nhất lên vị trí index để quay lui không cần hoàn tác danh sách
+            best, best_count, best_mask = index, self.size + 1, 0
+            for i in range(index, len(empty_cells)):
+                mask = self.candidate_mask(*empty_cells[i])
+                if mask.bit_count() < best_count:
+                    best, best_count, best_mask = i, mask.bit_count(), mask
+                    if best_count <= 1:
+                        break
+            if best_count == 0:
+                return False
+            empty_cells[index], empty_cells[best] = empty_cells[best], empty_cells[index]
             x, y = empty_cells[index]
-            for num in range(1, 10):
-                if self.is_valid(x, y, num):
-                    self.board[x][y].value = num
-                    self.show_values()
+
+            mask = best_mask
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                num = bit.bit_length()
+                self.nodes += 1
+                self.place(x, y, num)
+                self.record(x, y, num)
+
+                if dfs(index + 1):
+                    return True
+
+                self.unplace(x, y, num)
+                self.record(x, y, 0)
+            return False
+
+        found = dfs(0)
+        self.store_values(self.values)
+        return found
+
+    def solve_by_propagation(self, order_values=None):
+        """DFS có lan truyền ràng buộc tới điểm bất động sau mỗi phép gán (Propagator)"""
+        propagator = Propagator(self.value_rows())
+        found = propagator.search(order_values, self.record_propagation if self.trace is not None else None)
+        self.branches = self.nodes = propagator.branches
+        self.memory = {"candidates": sys.getsizeof(propagator.candidates), "trail": sys.getsizeof(propagator.trail)}
+        if found:
+            self.load_state(bytes(num for row in propagator.values() for num in row))
+            self.record_board()
+        return found
+
+    def record_propagation(self, propagator):
+        self.record_board(bytes(num for row in propagator.values() for num in row))
+
+    @staticmethod
+    def least_constraining(propagator, cell):
+        """Thử trước số loại ít ứng viên nhất khỏi các ô cùng nhóm (Degree Heuristic)"""
+        candidates = propagator.candidates
+        return sorted(digits(candidates[cell]), key=lambda num: sum(1 for peer in propagator.geometry.peers[cell] if candidates[peer] >> (num - 1) & 1))
+
+    def solve_by_dlx(self, mode="first", limit=2):
+        """Giải bằng Dancing Links (phủ chính xác)
+
+        mode="first": điền lời giải đầu tiên vào bảng, trả về True/False
+        mode="count": trả về số lời giải, dừng khi đếm đủ limit
+        mode="all": trả về danh sách mọi lời giải (bảng size x size), không sửa bảng
+        """
+        if mode not in ("first", "count", "all"):
+            raise ValueError(f"Unknown DLX mode: {mode}")
+        dlx = DancingLinks(self.value_rows())
+        self.memory = {"links": sum(sys.getsizeof(links) for links in (dlx.left, dlx.right, dlx.up, dlx.down, dlx.column, dlx.option))}
+
+        if mode == "all":
+            solutions = list(dlx.solutions())
+            self.nodes = dlx.nodes
+            return solutions
+        if mode == "count":
+            count = 0
+            for _ in dlx.solutions():
+                count += 1
+                if count >= limit:
+                    break
+            self.nodes = dlx.nodes
+            return count
+
+        solution = next(dlx.solutions(), None)
+        self.nodes = dlx.nodes
+        if solution is None:
+            return False
+        self.load_state(bytes(num for row in solution for num in row))
+        self.record_board()
+        return True
+
+    def solve_by_dfs(self, mrv=False, propagate=False):
+        """DFS theo thứ tự hàng; mrv=True dùng mặt nạ bit và chọn ô động, propagate=True thêm lan truyền ràng buộc"""
+        if propagate:
+            return self.solve_by_propagation()
+        if mrv:
+            return self.solve_by_mrv()
+        values = self.working_values()
+        peers, size, trace = self.geometry.peers, self.size, self.trace
+        empty_cells = [cell for cell, num in enumerate(values) if num == 0]
+        self.memory = {"empty_cells": sys.getsizeof(empty_cells) + sum(sys.getsizeof(cell) for cell in empty_cells)}
+        self.nodes = 0
+        
+        def dfs(index):
+            if index == len(empty_cells):
+                return True
+            cell = empty_cells[index]
+            used = {values[peer] for peer in peers[cell]}  # Như is_valid; các ô cùng nhóm không đổi trong vòng lặp
+            for num in range(1, size + 1):
+                if num not in used:
+                    self.nodes += 1
+                    values[cell] = num
+                    if trace is not None:
+                        trace.set(cell, num)
 
                     if dfs(index + 1):
                         return True
                     
-                    self.board[x][y].value = 0
-                    self.show_values()
+                    values[cell] = 0
+                    if trace is not None:
+                        trace.set(cell, 0)
             return False
         
-        dfs(0)
+        found = dfs(0)
+        self.store_values(values)
+        return found
 
     def possible_values(self, x, y):
         """Trả về tập hợp số có thể đặt tại (x, y)"""
         if self.board[x][y].value != 0:
             return set()  # Nếu ô đã có giá trị thì không còn lựa chọn nào
 
-        box_x, box_y = (x // 3) * 3, (y // 3) * 3
-        used_values = {self.board[x][i].value for i in range(BOARD_SIZE)} | \
-                    {self.board[i][y].value for i in range(BOARD_SIZE)} | \
-                    {self.board[box_x + i][box_y + j].value for i in range(3) for j in range(3)}
+        n = self.box_size
+        box_x, box_y = (x // n) * n, (y // n) * n
+        used_values = {self.board[x][i].value for i in range(self.size)} | \
+                    {self.board[i][y].value for i in range(self.size)} | \
+                    {self.board[box_x + i][box_y + j].value for i in range(n) for j in range(n)}
         
-        return {num for num in range(1, 10) if num not in used_values}
+        return {num for num in range(1, self.size + 1) if num not in used_values}
 
     def heuristic_num_value(self, x, y):
         """Trả về số lượng giá trị có thể điền vào ô (x, y)"""
@@ -77,50 +261,64 @@ class SudokuSolver:
         count = 0
 
         # Ảnh hưởng đến hàng
-        for i in range(BOARD_SIZE):
+        for i in range(self.size):
             if self.board[x][i].value == 0 and num in self.possible_values(x, i):
                 count += 1
 
         # Ảnh hưởng đến cột
-        for i in range(BOARD_SIZE):
+        for i in range(self.size):
             if self.board[i][y].value == 0 and num in self.possible_values(i, y):
                 count += 1
 
-        # Ảnh hưởng đến khối 3x3
-        box_x, box_y = (x // 3) * 3, (y // 3) * 3
-        for i in range(3):
-            for j in range(3):
+        # Ảnh hưởng đến khối
+        n = self.box_size
+        box_x, box_y = (x // n) * n, (y // n) * n
+        for i in range(n):
+            for j in range(n):
                 cell_x, cell_y = box_x + i, box_y + j
                 if self.board[cell_x][cell_y].value == 0 and num in self.possible_values(cell_x, cell_y):
                     count += 1
 
         return count
 
-    def solve_by_greedy(self):
+    def solve_by_greedy(self, propagate=False):
         """Giải Sudoku bằng greedy search"""
-        empty_cells = [(x, y) for x in range(BOARD_SIZE) for y in range(BOARD_SIZE) if self.board[x][y].value == 0]
-        if not empty_cells:
-            return True  # Hoàn thành
+        if propagate:
+            return self.solve_by_propagation(SudokuSolver.least_constraining)
 
-        # Chọn ô có ít lựa chọn nhất (MRV - Minimum Remaining Values)
-        x, y = min(empty_cells, key=lambda cell: self.heuristic_num_value(cell[0], cell[1]))
+        # MRV và Degree Heuristic đọc từ CandidateTracker thay vì dựng lại tập ứng viên mỗi bước
+        tracker = CandidateTracker(self.value_rows())
+        values = self.working_values()
+        self.memory = {"tracker": sys.getsizeof(tracker.masks) + sum(sys.getsizeof(counts) for counts in tracker.counts)}
+        self.nodes = 0
+        if not tracker.consistent:
+            return False
 
-        # Lấy danh sách giá trị có thể điền, ưu tiên Degree Heuristic
-        possible_values = sorted(self.possible_values(x, y), key=lambda val: self.heuristic_degree(x, y, val))
+        def greedy():
+            cell = tracker.mrv_cell()
+            if cell is None:
+                return True  # Hoàn thành
+            x, y = divmod(cell, self.size)
 
-        for num in possible_values:
-            if self.is_valid(x, y, num):
-                self.board[x][y].value = num
-                self.show_values()
+            # Chọn ô có ít lựa chọn nhất (MRV), thử trước số ảnh hưởng ít ô nhất (Degree Heuristic)
+            for num in sorted(digits(tracker.masks[cell]), key=lambda num: tracker.degree(cell, num)):
+                self.nodes += 1
+                changed = tracker.assign(cell, num)
+                values[cell] = num
+                self.record(x, y, num)
 
-                if self.solve_by_greedy():
+                if greedy():
                     return True
 
                 # Nếu điền sai, quay lui
-                self.board[x][y].value = 0
-                self.show_values()
+                tracker.unassign(cell, num, changed)
+                values[cell] = 0
+                self.record(x, y, 0)
+            return False
 
-        return False
+        found = greedy()
+        self.store_values(values)
+        return found
     
     def heuristic_cost(self, x, y, num):
         """Trả về số lượng ô chưa điền và số lượng giá trị có thể trong ô và số lượng ô bị điền sai"""
@@ -133,76 +331,186 @@ class SudokuSolver:
         return empty_cell_count*10 + possible_values_count
 
     def copy_board(self):
-        """Tạo một bản sao của bảng"""
-        new_board = [[Cell(x, y, self.board[x][y].value) for y in range(BOARD_SIZE)] for x in range(BOARD_SIZE)]
-        return new_board
-    
-    def generate_next_states(self):
-        """Sinh các trạng thái kế tiếp và thêm vào hàng đợi"""
-        empty_cells = self.get_empty_cells()
-        if not empty_cells:
-            return []
-        
-        queue = []
-        for x, y in empty_cells:
-            for num in self.possible_values(x, y):
-                new_board = self.copy_board()                
-                new_board[x][y].value = num
-                cost = self.heuristic_cost(x, y, num)
-                if cost != float("inf"):
-                    heapq.heappush(queue, (cost, new_board))
-        return queue
-
-    def solve_by_astar(self):
-        """Giải Sudoku bằng thuật toán A*"""
-        queue = self.generate_next_states()
-        
-        if not queue:
-            return False  # Không có giá trị hợp lệ để thử
+        """Tạo một bản sao của bảng dạng Board (mảng giá trị), không dựng đối tượng cho từng ô"""
+        if self.grid is not None:
+            return self.grid.copy()
+        return Board(self.box_size, bytearray(cell.value for row in self.board for cell in row))
+
+    def analyze_state(self, state):
+        """Với trạng thái size * size byte: (ô ít lựa chọn nhất, mặt nạ ứng viên của ô đó, số ô trống)
+
+        Ô là None khi bảng đã đầy; mặt nạ bằng 0 khi trạng thái là ngõ cụt.
+        """
+        size, box_of = self.size, self.geometry.box_of
+        rows, cols, boxes = [0] * size, [0] * size, [0] * size
+        empties = []
+        for cell, num in enumerate(state):
+            x, y = divmod(cell, size)
+            if num == 0:
+                empties.append(cell)
+                continue
+            bit = 1 << (num - 1)
+            if (rows[x] | cols[y] | boxes[box_of(x, y)]) & bit:
+                return -1, 0, len(empties)  # Hai số trùng nhau trong một nhóm
+            rows[x] |= bit
+            cols[y] |= bit
+            boxes[box_of(x, y)] |= bit
+
+        best, best_mask, best_count = None, 0, size + 1
+        for cell in empties:
+            x, y = divmod(cell, size)
+            mask = ~(rows[x] | cols[y] | boxes[box_of(x, y)]) & self.geometry.full_mask
+            if mask.bit_count() < best_count:
+                best, best_mask, best_count = cell, mask, mask.bit_count()
+                if best_count <= 1:
+                    break
+        return best, best_mask, len(empties)
+
+    def load_state(self, state):
+        if self.grid is not None:
+            self.grid.values[:] = state
+        else:
+            for cell, num in enumerate(state):
+                self.board[cell // self.size][cell % self.size].value = num
+
+    def solve_by_astar(self, propagate=False):
+        """Giải Sudoku bằng thuật toán A*; propagate=True tìm trên các trạng thái đã lan truyền ràng buộc
+
+        Mỗi nút chỉ rẽ nhánh tại ô ít lựa chọn nhất của chính trạng thái đó. g (số ô đã điền)
+        cộng số ô trống là hằng số, nên thứ tự do h = số ô trống * 10 + số lựa chọn của ô kế
+        tiếp quyết định, giống heuristic_cost. Trạng thái là chuỗi size * size byte, có tập đã thăm và
+        bộ đếm để phá hòa ổn định.
+        """
+        if propagate:
+            return self.solve_by_astar_propagation()
+        start = self.snapshot()
+        cell, mask, empties = self.analyze_state(start)
+        counter = 0
+        queue = [(empties * 10 + mask.bit_count(), counter, start, cell, mask)]
+        visited = set()
+        # Mỗi phần tử hàng đợi: bộ 5 phần tử và một chuỗi size * size byte
+        state_bytes = sys.getsizeof((0, 0, start, 0, 0)) + sys.getsizeof(start)
+        self.memory = {"queue": state_bytes, "visited": 0}
+        self.nodes = 0
 
         while queue:
-            _, next_board = heapq.heappop(queue)
-            self.show_values(next_board)
+            _, _, state, cell, mask = heapq.heappop(queue)
+            if state in visited:
+                continue
+            visited.add(state)
+            self.nodes += 1
+            self.memory["visited"] = sys.getsizeof(visited) + len(visited) * sys.getsizeof(start)
 
-            if not self.get_empty_cells():
+            self.record_board(state)
+            if cell is None:
+                self.load_state(state)
                 return True  # Hoàn thành
-            
-            for state in self.generate_next_states():
-                heapq.heappush(queue, state)
+
+            for num in digits(mask):
+                child = state[:cell] + bytes((num,)) + state[cell + 1:]
+                if child in visited:
+                    continue
+                next_cell, next_mask, empties = self.analyze_state(child)
+                if next_cell is not None and next_mask == 0:
+                    continue  # Ngõ cụt, không cần đưa vào hàng đợi
+                counter += 1
+                heapq.heappush(queue, (empties * 10 + next_mask.bit_count(), counter, child, next_cell, next_mask))
+            self.memory["queue"] = max(self.memory["queue"], len(queue) * state_bytes)
         return False
 
+    def solve_by_astar_propagation(self):
+        """A* như solve_by_astar, nhưng mỗi trạng thái là bộ mặt nạ ứng viên của mọi ô sau khi
+        Propagator lan truyền tới điểm bất động; h = số ô chưa chắc chắn * 10 + số ứng viên của ô
+        rẽ nhánh. Bảng 16x16, 25x25 chỉ cần vài chục nút thay vì hàng trăm nghìn."""
+        propagator = Propagator(self.value_rows())
+        self.nodes = 0
+        self.memory = {"queue": 0, "visited": 0}
+        if not propagator.consistent or not propagator.propagate():
+            return False
+        start = tuple(propagator.candidates)
+        state_bytes = sys.getsizeof((0, 0, start, 0)) + sys.getsizeof(start)
+        queue, visited = [], set()
+        counter = 0
+
+        def push(state):
+            nonlocal counter
+            open_cells = [cell for cell, mask in enumerate(state) if mask & (mask - 1)]
+            cell = min(open_cells, key=lambda cell: state[cell].bit_count()) if open_cells else None
+            counter += 1
+            heapq.heappush(queue, (len(open_cells) * 10 + (state[cell].bit_count() if open_cells else 0), counter, state, cell))
+            self.memory["queue"] = max(self.memory["queue"], len(queue) * state_bytes)
 
+        push(start)
+        while queue:
+            _, _, state, cell = heapq.heappop(queue)
+            if state in visited:
+                continue
+            visited.add(state)
+            self.nodes += 1
+            self.memory["visited"] = sys.getsizeof(visited) + len(visited) * sys.getsizeof(start)
+
+            if cell is None or self.trace is not None:
+                values = bytes(mask.bit_length() if mask.bit_count() == 1 else 0 for mask in state)
+                self.record_board(values)
+            if cell is None:
+                self.load_state(values)
+                return True  # Hoàn thành
+
+            for num in digits(state[cell]):
+                # Nạp trạng thái cha vào propagator rồi gán và lan truyền; trail không cần giữ giữa các nút
+                propagator.candidates = list(state)
+                propagator.trail.clear()
+                propagator.singles.clear()
+                if propagator.assign(cell, num) and propagator.propagate():
+                    child = tuple(propagator.candidates)
+                    if child not in visited:
+                        push(child)
+        return False
+
+
+# Tên và cách gọi của từng cách giải, dùng chung cho CLI giải hàng loạt và benchmark
+SOLVE_METHODS = {
+    "dfs": lambda solver: solver.solve_by_dfs(),
+    "mrv": lambda solver: solver.solve_by_dfs(mrv=True),
+    "propagation": lambda solver: solver.solve_by_dfs(propagate=True),
+    "dlx": lambda solver: solver.solve_by_dlx(),
+    "greedy": lambda solver: solver.solve_by_greedy(),
+    "greedy-propagation": lambda solver: solver.solve_by_greedy(propagate=True),
+    "astar": lambda solver: solver.solve_by_astar(),
+    "astar-propagation": lambda solver: solver.solve_by_astar(propagate=True),
+}
     
-def compare_algorithms():
-    board1 = Board()
+def compare_algorithms(mode="rss", box_size=BOX_SIZE):
+    """So sánh thời gian và bộ nhớ của DFS và A*; mode là một trong MEMORY_MODES"""
+    try:  # Chỉ phần đo đạc cần gói measure ở thư mục gốc; chạy từ gốc repo: python -m sudoku.sudoku_solver
+        from .sudoku_measure import MemoryMeter
+    except ImportError:
+        from sudoku_measure import MemoryMeter
+    board1 = Board(box_size)
     board2 = board1.copy()
-    solver1 = SudokuSolver(board1.board)
-    solver2 = SudokuSolver(board2.board)
+    solver1 = SudokuSolver(board1)
+    solver2 = SudokuSolver(board2)
 
     # Measure DFS memory usage
-    tracemalloc.start()
-    start_time = time.time()
-    solver1.solve_by_dfs()
-    dfs_time = time.time() - start_time
-    dfs_memory = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-
-    # Measure Greedy memory usage
-    tracemalloc.start()
-    start_time = time.time()
-    solver2.solve_by_astar()
-    greedy_time = time.time() - start_time
-    greedy_memory = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
+    with MemoryMeter(mode, solver1) as dfs_meter:
+        start_time = time.perf_counter()
+        solver1.solve_by_dfs()
+        dfs_time = time.perf_counter() - start_time
+
+    # Measure A* memory usage
+    with MemoryMeter(mode, solver2) as astar_meter:
+        start_time = time.perf_counter()
+        solver2.solve_by_astar()
+        astar_time = time.perf_counter() - start_time
 
     print(f"DFS Time: {dfs_time} seconds")
-    print(f"DFS Memory: {dfs_memory[1] - dfs_memory[0]} bytes")
-    print(f"A* Time: {greedy_time} seconds")
-    print(f"A* Memory: {greedy_memory[1] - greedy_memory[0]} bytes")
+    print(f"DFS Memory ({mode}): {dfs_meter.usage[1]} bytes")
+    print(f"A* Time: {astar_time} seconds")
+    print(f"A* Memory ({mode}): {astar_meter.usage[1]} bytes")
 
 
 if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "rss"
     for i in range(10):
         print("Loop",i,":")
-        compare_algorithms()
-    
\ No newline at end of file
+        compare_algorithms(mode)
@@ -0,0 +1,123 @@
+from array import array
+
+class StepTrace:
+    """Các bước của một lần giải, mỗi bước một số nguyên 4 byte
+
+    Bước không âm là cell << 8 | num (gán num vào ô cell, num = 0 là xóa); bước âm -1 - k là
+    nạp cả bảng boards[k] (A*, lan truyền). Chỉ lần nạp đầu giữ cả bảng (bytes); các lần sau
+    là array các thay đổi cell << 8 | num so với trạng thái ngay trước bước đó, nên các bước
+    phải được áp dụng theo thứ tự. Sau limit bước, hoặc khi boards đã chiếm max_bytes byte, thì
+    ngừng ghi và đặt truncated; khi phát lại, phần còn thiếu được bù bằng cách nhảy tới kết quả.
+    Một luồng giải có thể ghi trong khi luồng giao diện đang phát: mỗi bước chỉ được thêm sau
+    khi dữ liệu của nó đã có.
+    """
+    def __init__(self, limit=1_000_000, max_bytes=64 << 20):
+        self.steps = array("i")
+        self.boards = []
+        self.limit = limit
+        self.max_bytes = max_bytes
+        self.board_bytes = 0
+        self.current = None  # Trạng thái bảng sau các bước đã ghi, có từ lần nạp đầu tiên
+        self.truncated = False
+
+    def __len__(self):
+        return len(self.steps)
+
+    def full(self):
+        if len(self.steps) >= self.limit or self.board_bytes >= self.max_bytes:
+            self.truncated = True
+        return self.truncated
+
+    def set(self, cell, num):
+        if not self.full():
+            if self.current is not None:
+                self.current[cell] = num
+            self.steps.append(cell << 8 | num)
+
+    def load(self, values):
+        if self.full():
+            return
+        if self.current is None:
+            board = bytes(values)
+            self.current = bytearray(board)
+        else:
+            current = self.current
+            board = array("i", [cell << 8 | num for cell, num in enumerate(values) if num != current[cell]])
+            current[:] = values
+        self.board_bytes += len(board) * (board.itemsize if isinstance(board, array) else 1)
+        self.boards.append(board)
+        self.steps.append(-len(self.boards))
+
+    def apply(self, values, index):
+        """Áp dụng bước index lên mảng giá trị values"""
+        step = self.steps[index]
+        if step < 0:
+            board = self.boards[-1 - step]
+            if isinstance(board, bytes):
+                values[:] = board
+            else:
+                for change in board:
+                    values[change >> 8] = change & 0xFF
+        else:
+            values[step >> 8] = step & 0xFF
+
+class Playback:
+    """Phát lại một StepTrace lên một Board với tốc độ rate bước mỗi giây
+
+    Bảng được đưa về start khi bắt đầu và về kết quả cuối khi phát xong hoặc khi finish() (nhảy
+    tới kết quả). Mặc định kết quả cuối là trạng thái bảng lúc tạo Playback; với running=True
+    trace vẫn đang được luồng giải ghi, Playback phát theo các bước đã có và chỉ kết thúc sau
+    khi luồng đó gọi complete().
+    """
+    def __init__(self, board, trace, start, rate=30, running=False):
+        self.board = board
+        self.trace = trace
+        self.final = None if running else bytes(board.values)
+        self.rate = rate
+        self.position = 0
+        self.budget = 0.0  # Phần lẻ của số bước đến hạn, cộng dồn qua các khung hình
+        self.skip = False  # finish() khi chưa giải xong: nhảy tới kết quả ngay khi có
+        board.values[:] = start
+
+    def complete(self, final):
+        """Gọi từ luồng giải khi xong; chỉ gán một thuộc tính, bảng vẫn do luồng giao diện ghi"""
+        self.final = bytes(final)
+
+    def solving(self):
+        return self.final is None
+
+    def done(self):
+        return not self.solving() and self.position >= len(self.trace)
+
+    def advance(self, seconds):
+        """Áp dụng các bước đến hạn sau seconds giây; False khi đã phát xong
+
+        Khi rate lớn hơn số khung hình mỗi giây, một khung hình áp dụng nhiều bước và chỉ vẽ
+        trạng thái cuối (bỏ khung hình trung gian).
+        """
+        if self.skip and not self.solving():
+            self.finish()
+            return False
+        self.budget += seconds * self.rate
+        count = int(self.budget)
+        self.budget -= count
+        length = len(self.trace)
+        end = min(length, self.position + count)
+        if end == length and self.solving():
+            self.budget = 0.0  # Đang chờ luồng giải thì không dồn bước cho các khung hình sau
+        values = self.board.values
+        for index in range(self.position, end):
+            self.trace.apply(values, index)
+        self.position = end
+        if self.done():
+            self.finish()
+            return False
+        return True
+
+    def finish(self):
+        """Nhảy tới kết quả; nếu chưa giải xong thì nhảy ở khung hình đầu tiên sau khi xong"""
+        if self.solving():
+            self.skip = True
+            return
+        self.board.values[:] = self.final
+        self.position = len(self.trace)
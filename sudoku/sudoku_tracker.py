@@ -0,0 +1,95 @@
+try:
+    from .sudoku_initialization import box_size_of, geometry
+    from .sudoku_propagation import digits
+except ImportError:
+    from sudoku_initialization import box_size_of, geometry
+    from sudoku_propagation import digits
+
+class CandidateTracker:
+    """Ứng viên của các ô trống, cập nhật tăng dần khi gán/gỡ một số
+
+    buckets[k] là tập ô trống còn k ứng viên, cho MRV không cần quét lại cả bảng.
+    counts[u][num] là số ô trống trong nhóm u còn num là ứng viên, cho Degree Heuristic.
+    """
+    def __init__(self, values):
+        geo = self.geometry = geometry(box_size_of(values))
+        self.cell_units = geo.cell_units
+        self.values = [int(values[cell // geo.size][cell % geo.size]) for cell in range(geo.cells)]
+        self.masks = [0] * geo.cells
+        self.counts = [[0] * (geo.size + 1) for _ in geo.units]
+        self.buckets = [set() for _ in range(geo.size + 1)]
+        self.consistent = True
+
+        used = [0] * len(geo.units)
+        for cell, num in enumerate(self.values):
+            if num == 0:
+                continue
+            bit = 1 << (num - 1)
+            for u in self.cell_units[cell]:
+                if used[u] & bit:
+                    self.consistent = False
+                used[u] |= bit
+
+        for cell, num in enumerate(self.values):
+            if num != 0:
+                continue
+            mask = geo.full_mask
+            for u in self.cell_units[cell]:
+                mask &= ~used[u]
+            self.masks[cell] = mask
+            self.buckets[mask.bit_count()].add(cell)
+            for num in digits(mask):
+                for u in self.cell_units[cell]:
+                    self.counts[u][num] += 1
+
+    def mrv_cell(self):
+        """Ô trống ít ứng viên nhất (ô đầu tiên theo thứ tự hàng khi hòa), None nếu đã đầy"""
+        for bucket in self.buckets:
+            if bucket:
+                return min(bucket)
+        return None
+
+    def degree(self, cell, num):
+        """Số ô trống cùng hàng, cột, khối còn num là ứng viên, như heuristic_degree"""
+        return sum(self.counts[u][num] for u in self.cell_units[cell])
+
+    def remove_candidate(self, cell, num):
+        mask = self.masks[cell]
+        self.buckets[mask.bit_count()].discard(cell)
+        self.masks[cell] = mask & ~(1 << (num - 1))
+        self.buckets[self.masks[cell].bit_count()].add(cell)
+        for u in self.cell_units[cell]:
+            self.counts[u][num] -= 1
+
+    def add_candidate(self, cell, num):
+        mask = self.masks[cell]
+        self.buckets[mask.bit_count()].discard(cell)
+        self.masks[cell] = mask | (1 << (num - 1))
+        self.buckets[self.masks[cell].bit_count()].add(cell)
+        for u in self.cell_units[cell]:
+            self.counts[u][num] += 1
+
+    def assign(self, cell, num):
+        """Điền num vào ô; trả về các ô cùng nhóm đã mất ứng viên num để unassign hoàn tác"""
+        mask = self.masks[cell]
+        self.buckets[mask.bit_count()].discard(cell)
+        for candidate in digits(mask):
+            for u in self.cell_units[cell]:
+                self.counts[u][candidate] -= 1
+        self.values[cell] = num
+
+        bit = 1 << (num - 1)
+        changed = [peer for peer in self.geometry.peers[cell] if self.values[peer] == 0 and self.masks[peer] & bit]
+        for peer in changed:
+            self.remove_candidate(peer, num)
+        return changed
+
+    def unassign(self, cell, num, changed):
+        for peer in changed:
+            self.add_candidate(peer, num)
+        self.values[cell] = 0
+        mask = self.masks[cell]
+        for candidate in digits(mask):
+            for u in self.cell_units[cell]:
+                self.counts[u][candidate] += 1
+        self.buckets[mask.bit_count()].add(cell)
@@ -0,0 +1,154 @@
+from itertools import product
+
+try:
+    from .sudoku_initialization import BOX_SIZE, numpy
+    from .sudoku_propagation import Propagator
+except ImportError:
+    from sudoku_initialization import BOX_SIZE, numpy
+    from sudoku_propagation import Propagator
+
+UNIT_KINDS = ("row", "column", "box")
+
+def unit_name(unit, size):
+    """Tên của nhóm thứ unit theo thứ tự hàng, cột, khối (như Geometry.units)"""
+    return f"{UNIT_KINDS[unit // size]} {unit % size}"
+
+def validate_batch(boards, chunk=1 << 16):
+    """Kiểm tra một lô lời giải: mảng (B, size, size) hoặc (B, size * size)
+
+    Trả về (ok, first): ok[b] cho biết bảng b đúng, first[b] là nhóm đầu tiên bị vi phạm theo
+    thứ tự hàng, cột, khối (-1 nếu đúng). Mỗi ô đổi thành một bit qua bảng tra; một nhóm đúng
+    khi phép OR các bit của nó bằng mặt nạ đầy. Xử lý từng đoạn chunk bảng để giới hạn bộ nhớ.
+    """
+    np = numpy()
+    boards = np.asarray(boards)
+    cells = boards.shape[-1] * (boards.shape[-2] if boards.ndim == 3 else 1)
+    n = int(cells ** 0.25 + 0.5)
+    size = n * n
+    if boards.ndim not in (2, 3) or n ** 4 != cells:
+        raise ValueError(f"Expected boards of shape (B, N, N) or (B, N * N), got {boards.shape}")
+    boards = boards.reshape(len(boards), cells)
+
+    # Giá trị ngoài 1..size ứng với bit 0, nên nhóm chứa nó không thể đủ
+    table = np.zeros(size + 2, dtype=np.uint32)
+    table[1:size + 1] = 1 << np.arange(size, dtype=np.uint32)
+    full = (1 << size) - 1
+
+    ok = np.empty(len(boards), dtype=bool)
+    first = np.empty(len(boards), dtype=np.int64)
+    for start in range(0, len(boards), chunk):
+        part = boards[start:start + chunk]
+        masks = table[np.clip(part, 0, size + 1)]
+        grid = masks.reshape(-1, size, size)
+        boxes = masks.reshape(-1, n, n, n, n)
+        units = np.concatenate((
+            np.bitwise_or.reduce(grid, axis=2),
+            np.bitwise_or.reduce(grid, axis=1),
+            np.bitwise_or.reduce(np.bitwise_or.reduce(boxes, axis=4), axis=2).reshape(-1, size),
+        ), axis=1)
+        bad = units != full
+        ok[start:start + chunk] = ~bad.any(axis=1)
+        first[start:start + chunk] = np.where(ok[start:start + chunk], -1, bad.argmax(axis=1))
+    return ok, first
+
+def fold(x, axes, op):
+    """Gộp x theo các trục axes bằng op, cộng dồn từng lát cắt (nhanh hơn nhiều so với x.sum(axis)
+    khi trục gộp ngắn như ở đây)"""
+    index = [slice(None)] * x.ndim
+    result = None
+    for position in product(*(range(x.shape[axis]) for axis in axes)):
+        for axis, i in zip(axes, position):
+            index[axis] = i
+        part = x[tuple(index)]
+        result = part.copy() if result is None else op(result, part, out=result)
+    return result
+
+def unit_counts(cand, n):
+    """Số ô có từng ứng viên trong mỗi hàng, cột, khối của một lô uint8 (b, size, size, size)"""
+    np = numpy()
+    boxes = cand.reshape(len(cand), n, n, n, n, n * n)
+    return fold(cand, (2,), np.add), fold(cand, (1,), np.add), fold(boxes, (2, 4), np.add)
+
+def spread(rows, cols, boxes, n):
+    """Đưa giá trị theo nhóm (kết quả của unit_counts sau khi so sánh) về từng ô, OR theo 3 nhóm của ô"""
+    np = numpy()
+    size = n * n
+    by_box = np.broadcast_to(boxes[:, :, None, :, None, :], (len(boxes), n, n, n, n, size)).reshape(len(boxes), size, size, size)
+    return rows[:, :, None, :] | cols[:, None, :, :] | by_box
+
+def any_unit(*units):
+    """Bảng nào có ít nhất một phần tử True trong các mảng (b, ...)"""
+    return numpy().concatenate([unit.reshape(len(unit), -1) for unit in units], axis=1).any(axis=1)
+
+def propagate_batch(candidates, box_size=BOX_SIZE):
+    """Naked single và hidden single cho cả lô tới điểm bất động, sửa candidates tại chỗ
+
+    candidates là mảng bool (B, cells, size). Hàng, cột, khối được gộp qua reshape và cộng
+    từng lát cắt nên không sao chép theo chỉ số; mỗi vòng chỉ xử lý các bảng còn thay đổi.
+    Trả về mảng bool (B,) đánh dấu bảng mâu thuẫn.
+    """
+    np = numpy()
+    n = box_size
+    size = n * n
+    contradiction = np.zeros(len(candidates), dtype=bool)
+    active = np.arange(len(candidates))
+    while len(active):
+        cand = candidates[active].reshape(len(active), size, size, size).view(np.uint8)
+        before = fold(cand, (3,), np.add)
+
+        # Naked single: số của ô đã xác định bị loại khỏi các ô khác cùng nhóm
+        single = (before == 1)[..., None]
+        placed = unit_counts(cand * single, n)
+        bad = any_unit(*(counts > 1 for counts in placed))
+        cand &= ~spread(*(counts > 0 for counts in placed), n) | single
+
+        # Hidden single: số chỉ còn ở một ô của nhóm thì ô đó phải là số đó
+        counts = unit_counts(cand, n)
+        bad |= any_unit(*(unit == 0 for unit in counts))
+        hidden = (spread(*(unit == 1 for unit in counts), n) & cand.view(bool)).view(np.uint8)
+        hidden_count = fold(hidden, (3,), np.add)
+        bad |= any_unit(hidden_count > 1)
+        cand = np.where((hidden_count > 0)[..., None], hidden, cand)
+        after = fold(cand, (3,), np.add)
+        bad |= any_unit(after == 0)
+
+        candidates[active] = cand.view(bool).reshape(len(active), size * size, size)
+        contradiction[active] = bad
+        changed = (after != before).reshape(len(active), -1).any(axis=1)
+        active = active[changed & ~bad]
+    return contradiction
+
+def solve_batch(boards, fallback=True):
+    """Giải cả lô đề (B, size, size) hoặc (B, size * size), 0 là ô trống
+
+    Lan truyền chạy trên cả lô bằng propagate_batch; chỉ những bảng còn dở mới được giải tiếp
+    từng bảng bằng Propagator.search (nếu fallback). Trả về (lời giải (B, cells) uint8 với 0 ở ô
+    chưa giải được, mảng bool giải xong, mảng bool giải xong chỉ nhờ lan truyền).
+    """
+    np = numpy()
+    boards = np.asarray(boards)
+    cells = boards.shape[-1] * (boards.shape[-2] if boards.ndim == 3 else 1)
+    n = int(cells ** 0.25 + 0.5)
+    size = n * n
+    if boards.ndim not in (2, 3) or n ** 4 != cells:
+        raise ValueError(f"Expected boards of shape (B, N, N) or (B, N * N), got {boards.shape}")
+    boards = boards.reshape(len(boards), cells)
+    if ((boards < 0) | (boards > size)).any():
+        raise ValueError(f"Cell values must be in 0..{size}")
+
+    # Ô trống có mọi ứng viên, ô đã điền chỉ có số của nó
+    digits = np.arange(1, size + 1)
+    candidates = (boards[:, :, None] == digits) | (boards[:, :, None] == 0)
+    contradiction = propagate_batch(candidates, n)
+
+    single = candidates.sum(axis=2) == 1
+    solutions = np.where(single, candidates.argmax(axis=2) + 1, 0).astype(np.uint8)
+    propagated = single.all(axis=1) & ~contradiction
+    solved = propagated.copy()
+    if fallback:
+        for b in np.flatnonzero(~propagated & ~contradiction):
+            propagator = Propagator(solutions[b].reshape(size, size))
+            if propagator.search():
+                solutions[b] = [mask.bit_length() for mask in propagator.candidates]
+                solved[b] = True
+    return solutions, solved, propagated
@@ -0,0 +1,30 @@
+"""Sudoku boards shared by the tests"""
+import random
+
+from sudoku import geometry
+from sudoku.sudoku_benchmark import load_corpus
+
+def pattern_solution(box_size):
+    """A valid solved N²xN² grid as a flat bytearray: the classic shifted-rows pattern"""
+    size = box_size * box_size
+    return bytearray((box_size * (x % box_size) + x // box_size + y) % size + 1 for x in range(size) for y in range(size))
+
+def blank_cells(solution, count, seed=0):
+    """A copy of solution with count random cells set to 0"""
+    values = bytearray(solution)
+    for cell in random.Random(seed).sample(range(len(values)), count):
+        values[cell] = 0
+    return values
+
+def rows_of(values):
+    size = int(len(values) ** 0.5 + 0.5)
+    return [list(values[x * size:(x + 1) * size]) for x in range(size)]
+
+def is_valid_solution(values, puzzle):
+    """Every unit holds each number once and every given of puzzle is kept"""
+    geo = geometry(int(len(values) ** 0.25 + 0.5))
+    full = set(range(1, geo.size + 1))
+    return all({values[cell] for cell in unit} == full for unit in geo.units) and all(not given or given == value for given, value in zip(puzzle, values))
+
+def corpus(*names):
+    return [entry for name in names for entry in load_corpus(name)]
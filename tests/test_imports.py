@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules only the CLIs, the pools, the spill files, NumPy paths or the game need
+HEAVY = ("argparse", "concurrent.futures", "multiprocessing", "tempfile", "numpy", "pygame")
+
+@pytest.mark.parametrize("package", ["pipe", "sudoku"])
+def test_package_import_stays_light(package):
+    code = f"import sys, {package}; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    loaded = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+    assert loaded == []
+
+@pytest.mark.parametrize("package", ["pipe", "sudoku"])
+def test_package_import_leaves_sys_path_alone(package):
+    code = f"import sys; path = list(sys.path); import {package}; print(sys.path == path)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout.split() == ["True"]
@@ -0,0 +1,71 @@
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import pipe
+import sudoku
+from measure import MEMORY_MODES, MemoryMeter, current_rss, peak_rss
+
+def test_packages_share_the_meter():
+    assert sudoku.MemoryMeter is MemoryMeter
+    assert issubclass(pipe.MemoryMeter, MemoryMeter) and pipe.MemoryMeter.stats == "memoryStats"
+    assert set(MEMORY_MODES) == {"rss", "sampling", "internal", "tracemalloc"}
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown memory mode"):
+        MemoryMeter("heap")
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads /proc and getrusage")
+def test_rss_helpers():
+    assert current_rss() > 0 and peak_rss() > 0
+
+def test_rss_mode_reports_growth():
+    with MemoryMeter("rss") as meter:
+        block = bytearray(64 << 20)
+        block[::4096] = b"x" * len(block[::4096])  # Touch every page so it is resident
+    assert meter.usage[0] >= 0 and meter.usage[1] >= 0
+    del block
+
+def test_sampling_mode_stops_its_thread():
+    with MemoryMeter("sampling", interval=0.0005) as meter:
+        sampler = meter.thread
+        assert sampler.is_alive()
+        block = bytearray(64 << 20)
+        block[::4096] = b"x" * len(block[::4096])
+    assert not sampler.is_alive() and sampler not in threading.enumerate()
+    assert meter.usage[1] >= meter.usage[0] >= 0
+    if sys.platform.startswith("linux"):
+        assert meter.usage[1] >= 32 << 20
+    del block
+
+def test_internal_mode_sums_the_solver_accounting():
+    with MemoryMeter("internal", SimpleNamespace(memory={"a": 10, "b": 32})) as meter:
+        pass
+    assert meter.usage == (0, 42)
+    with pipe.MemoryMeter("internal", SimpleNamespace(memoryStats={"frontier": 7, "visited": 5})) as meter:
+        pass
+    assert meter.usage == (0, 12)
+    with MemoryMeter("internal", object()) as meter:
+        pass
+    assert meter.usage == (0, 0)
+
+def test_internal_mode_reads_real_solvers():
+    solver = sudoku.SudokuSolver(sudoku.Board(3))
+    with sudoku.MemoryMeter("internal", solver) as meter:
+        solver.solve_by_dfs()
+    assert meter.usage[1] == sum(solver.memory.values()) > 0
+
+    graph = pipe.readGraph("7x7.json")
+    with pipe.MemoryMeter("internal", graph) as meter:
+        graph.heuristicSolve()
+    assert meter.usage[1] == sum(graph.memoryStats.values()) > 0
+
+def test_tracemalloc_mode_sees_allocations_and_stops():
+    import tracemalloc
+    with MemoryMeter("tracemalloc") as meter:
+        block = bytearray(1 << 20)
+        del block
+    assert meter.usage[1] >= 1 << 20 and meter.usage[0] < 1 << 20
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,136 @@
+import copy
+import random
+
+import pytest
+
+from pipe import ContractedGraph, Graph, SolverProfiler, compactTransforms, parseGraph, readGraph, verifySolution
+from pipe.algorithm import EPOINT_BASE_STATES, IPIPE_BASE_STATES, LPIPE_BASE_STATES, TPIPE_BASE_STATES, Transform
+
+BUNDLED = ["2x1.json", "2x2.json", "3x3.json", "4x4.json", "5x5.json", "7x7.json", "10x10.json", "15x15.json", "20x20.json", "25x25.json"]
+# Piece for a cell with one or three open sides; two open sides make a straight or an elbow
+PIECES = {1: ("E", EPOINT_BASE_STATES), 3: ("T", TPIPE_BASE_STATES)}
+
+def randomBoard(rows, cols, seed=0):
+    """A solvable board: a random spanning tree of the grid with no cross pieces, every cell turned at random"""
+    rng = random.Random(seed)
+    parent = list(range(rows * cols))
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    edges = [((i, j), (i, j + 1)) for i in range(rows) for j in range(cols - 1)] + [((i, j), (i + 1, j)) for i in range(rows - 1) for j in range(cols)]
+    rng.shuffle(edges)
+    sides = {(i, j): [False] * 4 for i in range(rows) for j in range(cols)}
+    for a, b in edges:
+        if sum(sides[a]) == 3 or sum(sides[b]) == 3 or find(a[0] * cols + a[1]) == find(b[0] * cols + b[1]):
+            continue
+        parent[find(a[0] * cols + a[1])] = find(b[0] * cols + b[1])
+        horizontal = a[0] == b[0]
+        sides[a][2 if horizontal else 3] = sides[b][0 if horizontal else 1] = True
+    assert len({find(x) for x in range(rows * cols)}) == 1, "degree cap split the tree; pick another seed"
+
+    data = []
+    for i in range(rows):
+        row = []
+        for j in range(cols):
+            value = sides[(i, j)]
+            if sum(value) == 2:
+                kind, states = ("I", IPIPE_BASE_STATES) if value in IPIPE_BASE_STATES else ("L", LPIPE_BASE_STATES)
+            else:
+                kind, states = PIECES[sum(value)]
+            row += [{"type": kind, "index": (states.index(value) + rng.randrange(len(states))) % len(states)}]
+        data += [row]
+    return data
+
+def finalIndices(graph, transforms):
+    return [[(cell.index + sum(t.times for t in transforms if (t.row, t.col) == (i, j))) % len(cell.baseState) for j, cell in enumerate(row)] for i, row in enumerate(graph.graph)]
+
+def test_compact_transforms_fold_by_period():
+    graph = parseGraph([[{"type": "I", "index": 0}, {"type": "L", "index": 1}], [{"type": "T", "index": 2}, {"type": "E", "index": 3}]])
+    transforms = [Transform(0, 0, 2), Transform(0, 1, 1), Transform(1, 0, 1), Transform(0, 1, 3), Transform(1, 0, 1), Transform(1, 1, 3), Transform(1, 0, 3)]
+    compact = compactTransforms(graph.graph, transforms)
+    # The straight pipe turns a full period and the elbow 1 + 3 turns, so both drop out
+    assert [(t.row, t.col, t.times) for t in compact] == [(1, 0, 1), (1, 1, 3)]
+    assert finalIndices(graph, compact) == finalIndices(graph, transforms)
+
+def test_compact_transforms_drop_zero_turns():
+    graph = readGraph("4x4.json")
+    assert compactTransforms(graph.graph, [Transform(0, 0, 0), Transform(1, 1, 4), Transform(2, 2, 8)]) == []
+    assert compactTransforms(graph.graph, []) == []
+
+@pytest.mark.parametrize("name", BUNDLED)
+def test_frontier_solves_bundled_boards(name):
+    result = readGraph(name).frontierSolve()
+    assert result is not None and verifySolution(readGraph(name), result[0])
+
+@pytest.mark.parametrize("rows, cols", [(5, 200), (200, 5), (1, 50), (50, 1), (12, 12)])
+def test_frontier_solves_long_strips(rows, cols):
+    data = randomBoard(rows, cols, seed=rows * 1000 + cols)
+    transforms, maxElement, _ = parseGraph(data).frontierSolve()
+    assert verifySolution(parseGraph(data), transforms)
+    assert maxElement < 1000  # The frontier spans the short side whichever way the strip lies
+
+@pytest.mark.parametrize("data", [
+    [[{"type": "E", "index": 0}, {"type": "E", "index": 0}], [{"type": "E", "index": 0}, {"type": "E", "index": 0}]],
+    [[{"type": "I", "index": 0}, {"type": "I", "index": 0}]],
+    [[{"type": "L", "index": 0}, {"type": "L", "index": 0}], [{"type": "L", "index": 0}, {"type": "L", "index": 0}]],
+])
+def test_frontier_reports_unsolvable_boards(data):
+    assert parseGraph(data).frontierSolve() is None
+
+def rotatedCopy(graph, rng):
+    """A copy of graph with every unlocked cell turned at random"""
+    board = copy.deepcopy(graph.graph)
+    for row in board:
+        for cell in row:
+            if not cell.locked:
+                cell.index = rng.randrange(len(cell.baseState))
+    return board
+
+@pytest.mark.parametrize("name", ["5x5.json", "10x10.json", "20x20.json"])
+@pytest.mark.parametrize("preprocess", [False, True])
+def test_contracted_components_match_connected_component(name, preprocess):
+    graph = readGraph(name)
+    if preprocess:
+        graph.preProcessing()
+        assert any(cell.locked for row in graph.graph for cell in row)
+    contracted = ContractedGraph(graph.graph)
+    rng = random.Random(name)
+    for _ in range(30):
+        board = rotatedCopy(graph, rng)
+        assert contracted.components(board) == Graph.connectedComponent(board)
+
+def test_contracted_components_on_random_strips():
+    rng = random.Random(1)
+    for seed in range(5):
+        graph = parseGraph(randomBoard(4, 30, seed))
+        for row in graph.graph:
+            for cell in row:
+                cell.locked = rng.random() < 0.5
+        contracted = ContractedGraph(graph.graph)
+        for _ in range(10):
+            board = rotatedCopy(graph, rng)
+            assert contracted.components(board) == Graph.connectedComponent(board)
+
+@pytest.mark.parametrize("name", ["7x7.json", "10x10.json"])
+def test_heuristic_search_is_reproducible(name):
+    runs = [readGraph(name).heuristicSolve() for _ in range(3)]
+    assert verifySolution(readGraph(name), runs[0][0])
+    assert len({(tuple((t.row, t.col, t.times) for t in result[0]), result[2], result[4]) for result in runs}) == 1
+
+def blindRun(name, **options):
+    graph = readGraph(name)
+    graph.profiler = SolverProfiler()
+    result = graph.profiler.run(graph.blindSolve, **options)
+    assert verifySolution(readGraph(name), result[0])
+    return graph.profiler.report()["phases"]["connectedComponent"]["calls"]
+
+@pytest.mark.parametrize("name", ["4x4.json", "5x5.json", "7x7.json"])
+def test_lazy_blind_search_scores_fewer_states(name):
+    assert blindRun(name, lazy=True) < blindRun(name)
+
+def test_lazy_blind_search_with_spilled_frontier(tmp_path):
+    # Spilled entries lose their stored boards and are rebuilt from their transforms
+    assert blindRun("5x5.json", lazy=True, spillDir=str(tmp_path), hotLimit=8) > 0
+    assert list(tmp_path.iterdir()) == []
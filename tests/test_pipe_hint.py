@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from pipe import readGraph, verifySolution
+from pipe.algorithm import Transform
+from pipe.hint import HintEngine, propagateDomains
+
+BOARDS = ["4x4.json", "7x7.json", "10x10.json"]
+
+def rotations(graph):
+    return [[cell.index for cell in row] for row in graph.graph]
+
+def movesTo(graph, target):
+    """The left rotations that turn the board into target, as Transforms for verifySolution"""
+    moves = []
+    for i, row in enumerate(graph.graph):
+        for j, cell in enumerate(row):
+            period = len(cell.baseState)
+            times = next(t for t in range(period) if tuple(cell.baseState[(cell.index + t) % period]) == target[i][j])
+            if times:
+                moves.append(Transform(i, j, times))
+    return moves
+
+@pytest.mark.parametrize("name", BOARDS)
+def test_following_hints_solves_the_board(name):
+    graph = readGraph(name)
+    engine = HintEngine(graph)
+    assert not engine.isSolved()
+    for _ in range(graph.row * graph.col):
+        move = engine.hint()
+        if move is None:
+            break
+        for _ in range(move.times):
+            engine.rotate(move.row, move.col)
+    assert engine.hint() is None and engine.isSolved()
+    assert engine.mismatches == 0 and not engine.wrong
+
+@pytest.mark.parametrize("name", BOARDS)
+def test_incremental_counters_match_a_fresh_engine(name):
+    graph = readGraph(name)
+    engine = HintEngine(graph)
+    rng = random.Random(0)
+    for _ in range(200):
+        engine.rotate(rng.randrange(graph.row), rng.randrange(graph.col), left=rng.random() < 0.5)
+        fresh = HintEngine(graph, engine.target)
+        assert (engine.mismatches, engine.wrong) == (fresh.mismatches, fresh.wrong)
+        assert engine.isSolved() == fresh.isSolved()
+
+@pytest.mark.parametrize("name", BOARDS)
+def test_domains_keep_the_solution(name):
+    graph = readGraph(name)
+    target = HintEngine.solveTarget(graph)
+    domains = propagateDomains(graph.graph)
+    assert all(target[i][j] in domains[i][j] for i in range(graph.row) for j in range(graph.col))
+    assert any(len(domain) == 1 for row in domains for domain in row)
+
+def test_target_is_computed_without_touching_the_board():
+    graph = readGraph("7x7.json")
+    before = rotations(graph)
+    engine = HintEngine(graph)
+    assert rotations(graph) == before
+    assert verifySolution(readGraph("7x7.json"), movesTo(graph, engine.target))
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from pipe import NullProfiler, SolverProfiler, readGraph, verifySolution
+
+def profiledSolve(name, method, profiler):
+    graph = readGraph(name)
+    graph.profiler = profiler
+    result = profiler.run(getattr(graph, method))
+    assert verifySolution(readGraph(name), result[0])
+    return profiler.report()
+
+def test_null_profiler_passes_calls_through():
+    profiler = readGraph("5x5.json").profiler
+    assert isinstance(profiler, NullProfiler) and not isinstance(profiler, SolverProfiler)
+    assert profiler.call("sum", sum, [1, 2]) == 3
+    assert profiler.run(max, 1, 2) == 2
+    with profiler.phase("heap"):
+        pass
+
+def test_phase_timers_and_frontier_histogram():
+    profiler = SolverProfiler()
+    for _ in range(3):
+        with profiler.phase("heap"):
+            pass
+    assert profiler.call("max", max, 4, 5) == 5
+    for size in (0, 1, 2, 3, 4, 7, 8):
+        profiler.frontierSize(size)
+    report = profiler.report()
+    assert report["phases"]["heap"]["calls"] == 3 and report["phases"]["max"]["calls"] == 1
+    assert report["frontier"] == {"0": 1, "1": 1, "2-3": 2, "4-7": 2, "8-15": 1}
+
+@pytest.mark.parametrize("method, phases", [
+    ("heuristicSolve", {"preProcessing", "contract", "connectedComponent", "heap", "materialize", "noHopeState"}),
+    ("blindSolve", {"heap", "materialize", "hash", "connectedComponent"}),
+])
+def test_solver_phases_are_reported(method, phases):
+    report = profiledSolve("7x7.json", method, SolverProfiler())
+    assert report["solver"] == method and report["mode"] is None and report["seconds"] > 0
+    assert phases <= set(report["phases"])
+    assert all(phase["calls"] > 0 and 0 <= phase["share"] <= 1 for phase in report["phases"].values())
+    assert sum(report["frontier"].values()) > 0
+
+def test_cprofile_mode_lists_solver_functions():
+    report = profiledSolve("7x7.json", "heuristicSolve", SolverProfiler("cprofile"))
+    functions = [entry["function"] for entry in report["cprofile"]]
+    assert 0 < len(functions) <= 20 and any(name.startswith("heuristicSolve (algorithm.py:") for name in functions)
+
+def test_sampling_mode_samples_the_solver_module_and_stops():
+    threads = threading.active_count()
+    report = profiledSolve("5x5.json", "blindSolve", SolverProfiler("sampling", sampleInterval=0.001))
+    assert report["samples"] and all(" (line " in location for location in report["samples"])
+    assert threading.active_count() == threads
+
+def test_failed_run_is_still_timed():
+    profiler = SolverProfiler("sampling")
+    def fail():
+        raise RuntimeError("solver crashed")
+    with pytest.raises(RuntimeError):
+        profiler.run(fail)
+    assert profiler.total > 0 and profiler.report()["solver"] == "fail"
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        SolverProfiler("perf")
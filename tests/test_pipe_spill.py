@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from pipe import spill
+from pipe.algorithm import Transform, readGraph, verifySolution
+from pipe.spill import SpillingPriorityQueue, SpillingVisitedSet
+
+@pytest.fixture
+def fewRuns(monkeypatch):
+    # Merge after a handful of runs so small tests exercise the merge paths
+    monkeypatch.setattr(spill, "MAX_RUNS", 3)
+
+def test_queue_pops_in_priority_order_and_stays_within_hot_limit(tmp_path, fewRuns):
+    rng = random.Random(1)
+    queue = SpillingPriorityQueue(str(tmp_path), hotLimit=8, makeTransform=Transform)
+    merges = []
+    mergeRuns = queue.mergeRuns
+
+    def undecodedMerge():
+        # Runs must be merged without decoding a single entry into RAM
+        def decode(flags, transforms):
+            raise AssertionError("mergeRuns decoded an entry")
+        queue.decode = decode
+        mergeRuns()
+        del queue.decode
+        merges.append(len(queue.runs))
+    queue.mergeRuns = undecodedMerge
+
+    expected = []
+    for seq in range(400):
+        connected = rng.randrange(50)
+        transforms = [Transform(seq % 7, seq % 5, 1 + seq % 3)]
+        queue.insert(connected, {"visited": False, "transforms": transforms})
+        expected += [(connected, seq, (seq % 7, seq % 5, 1 + seq % 3))]
+        if rng.random() < 0.3:
+            entry = queue.delete()
+            expected.sort()
+            assert (entry[0], entry[1]) == expected[0][:2]
+            assert [(t.row, t.col, t.times) for t in entry[2]["transforms"]] == [expected.pop(0)[2]]
+        assert len(queue.hot) <= queue.hotLimit
+    assert merges and all(runs <= 1 for runs in merges)
+
+    expected.sort()
+    while not queue.isEmpty():
+        entry = queue.delete()
+        assert (entry[0], entry[1]) == expected.pop(0)[:2]
+        assert len(queue.hot) <= queue.hotLimit
+    assert expected == []
+    queue.close()
+    assert list(tmp_path.iterdir()) == []
+
+def test_visited_set_merges_runs_on_disk(tmp_path, fewRuns):
+    visited = SpillingVisitedSet(str(tmp_path), hotLimit=5)
+    states = [tuple(random.Random(i).randrange(4) for _ in range(12)) for i in range(300)]
+    for state in states:
+        visited.add(state)
+        visited.add(state)
+        assert len(visited.runs) <= spill.MAX_RUNS + 1
+    assert len(visited) == len(set(states))
+    assert all(state in visited for state in states)
+    assert (9,) * 12 not in visited
+    for _, _, values in visited.runs:
+        assert all(a < b for a, b in zip(values, values[1:]))
+    visited.close()
+    assert list(tmp_path.iterdir()) == []
+
+@pytest.mark.parametrize("solver", ["blindSolve", "heuristicSolve"])
+def test_spilling_solvers_find_valid_solutions(tmp_path, fewRuns, solver):
+    name = "4x4.json" if solver == "blindSolve" else "10x10.json"
+    graph = readGraph(name)
+    result = getattr(graph, solver)(spillDir=str(tmp_path), hotLimit=4)
+    assert verifySolution(readGraph(name), result[0])
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,44 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from solve_service import SolveService
+
+PUZZLE = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+REQUEST = {"puzzle": "sudoku", "board": [[int(c) if c != "." else 0 for c in PUZZLE[r * 9:(r + 1) * 9]] for r in range(9)]}
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_identical_requests_share_a_solve_and_the_cache():
+    async def scenario():
+        service = SolveService(workers=1, batch_window=0)
+        try:
+            first, second = await asyncio.gather(service.solve(REQUEST), service.solve(REQUEST))
+            third = await service.solve(REQUEST)
+        finally:
+            service.close()
+        return service, first, second, third
+
+    service, first, second, third = run(scenario())
+    assert first["ok"] and first["solution"] == second["solution"] == third["solution"]
+    assert third["cached"]
+    assert service.stats["coalesced"] == 1 and service.stats["batches"] == 1
+
+def test_service_recovers_from_a_dead_worker():
+    async def scenario():
+        service = SolveService(workers=1, batch_window=0)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                await asyncio.wrap_future(service.pool.submit(os._exit, 1))
+            failed = await service.solve(REQUEST)
+            solved = await service.solve(REQUEST)
+        finally:
+            service.close()
+        return failed, solved
+
+    failed, solved = run(scenario())
+    assert not failed["ok"] and "Worker failed" in failed["error"]
+    assert solved["ok"] and not solved["cached"]
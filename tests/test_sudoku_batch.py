@@ -0,0 +1,34 @@
+import io
+
+import pytest
+
+from sudoku import encode_values, solve_stream
+from sudoku.sudoku_batch import VECTORIZED, solve_line
+
+from boards import blank_cells, corpus, pattern_solution
+
+PUZZLES = corpus("easy")[:3] + corpus("hard")[:3]
+# (0, 8) must be 9 to finish its row, but (1, 8) already holds 9
+DEAD = "12345678." + "........9" + "." * 63
+
+def test_solve_line_formats():
+    puzzle, solution = PUZZLES[0]
+    answer, status, millis = solve_line(encode_values(puzzle) + " ignored columns\n").split()
+    assert (answer, status) == (encode_values(solution), "solved") and float(millis) >= 0
+    assert solve_line(DEAD).split()[:2] == [DEAD, "unsolvable"]
+    assert solve_line("12x").split()[:2] == ["-", "invalid"]
+
+@pytest.mark.parametrize("method", ["propagation", "dlx", VECTORIZED])
+def test_solve_stream_keeps_input_order(method):
+    big = blank_cells(pattern_solution(4), 100)
+    lines = ["# comment\n", "\n"] + [encode_values(puzzle) + "\n" for puzzle, _ in PUZZLES] + [DEAD + "\n", "bad\n", encode_values(big) + "\n"]
+    out = io.StringIO()
+    total, solved = solve_stream(lines, out, method, workers=2, chunk=2)
+    results = [line.split() for line in out.getvalue().splitlines()]
+    assert (total, solved) == (len(PUZZLES) + 3, len(PUZZLES) + 1)
+    assert [r[0] for r in results[:len(PUZZLES)]] == [encode_values(solution) for _, solution in PUZZLES]
+    assert [r[1] for r in results[len(PUZZLES):]] == ["unsolvable", "invalid", "solved"]
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        solve_stream([], io.StringIO(), "fastest")
@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from sudoku.sudoku_benchmark import compare, percentile, run, run_once, summarize
+
+from boards import corpus
+
+def test_percentile_nearest_rank():
+    odd, even = [1, 2, 3, 4, 5], [10, 20, 30, 40]
+    assert [percentile(odd, q) for q in (0, 20, 50, 90, 99, 100)] == [1, 1, 3, 5, 5, 5]
+    assert [percentile(even, q) for q in (0, 25, 50, 51, 75, 90, 100)] == [10, 10, 20, 30, 30, 40, 40]
+    assert percentile([7], 50) == 7 and percentile([], 50) is None
+
+def test_summarize():
+    assert summarize([3, 1, 2, 4]) == {"p50": 2, "p90": 4, "p99": 4, "max": 4, "mean": 2.5}
+    assert summarize([]) == {"p50": None, "p90": None, "p99": None, "max": None, "mean": None}
+
+def result(p50, nodes=100, solved=10, timeouts=0):
+    return {"solved": solved, "timeouts": timeouts, "seconds": {"p50": p50, "p90": p50, "p99": p50}, "nodes": {"p50": nodes, "p90": nodes, "p99": nodes}}
+
+def test_compare_threshold():
+    baseline = {"mrv": {"easy": result(0.010)}}
+    assert compare({"mrv": {"easy": result(0.0119)}}, baseline, tolerance=0.2) == []
+    slower = compare({"mrv": {"easy": result(0.0121)}}, baseline, tolerance=0.2)
+    assert len(slower) == 3 and slower[0] == "mrv/easy: p50 10.00 ms -> 12.10 ms"
+    assert compare({"mrv": {"easy": result(0.0121)}}, baseline, tolerance=0.5) == []
+
+def test_compare_ignores_noise_on_fast_puzzles_but_not_node_counts():
+    baseline = {"dlx": {"easy": result(0.0001, nodes=50)}}
+    assert compare({"dlx": {"easy": result(0.0009, nodes=50)}}, baseline) == []
+    assert compare({"dlx": {"easy": result(0.0001, nodes=61)}}, baseline) == ["dlx/easy: p%d nodes 50 -> 61" % q for q in (50, 90, 99)]
+
+def test_compare_counts_and_missing_entries():
+    baseline = {"mrv": {"hard": result(1.0)}}
+    regressions = compare({"mrv": {"hard": result(1.0, solved=8, timeouts=2), "easy": result(9.0)}, "dlx": {"hard": result(9.0)}}, baseline)
+    assert regressions == ["mrv/hard: solved 10 -> 8", "mrv/hard: timeouts 0 -> 2"]
+
+def test_timeouts_are_counted():
+    results = run(["dfs"], ["pathological"], timeout=0.001, repeat=1, warmup=0)
+    assert results["dfs"]["pathological"]["timeouts"] > 0
+
+def test_alarm_timeout_needs_the_main_thread():
+    puzzle, solution = corpus("easy")[0]
+    outcome = {}
+    def work():
+        with pytest.raises(RuntimeError, match="main thread"):
+            run_once("dlx", puzzle, 1.0, "internal")
+        outcome["values"] = run_once("dlx", puzzle, 0, "internal")[3]
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    assert outcome["values"] == solution
@@ -0,0 +1,79 @@
+from itertools import islice
+
+import pytest
+
+from sudoku import DancingLinks
+
+from boards import blank_cells, corpus, is_valid_solution, pattern_solution, rows_of
+
+def links(dlx):
+    return [list(dlx.left), list(dlx.right), list(dlx.up), list(dlx.down), list(dlx.size)]
+
+def flat(grid):
+    return bytearray(num for row in grid for num in row)
+
+@pytest.mark.parametrize("box_size", [3, 4])
+def test_cover_and_uncover_restore_every_link(box_size):
+    dlx = DancingLinks(rows_of(bytearray(box_size ** 4)))
+    before = links(dlx)
+    columns = 4 * dlx.geometry.cells
+    for col in (1, columns // 3, columns):
+        dlx.cover(col)
+        assert links(dlx) != before
+        dlx.uncover(col)
+        assert links(dlx) == before
+    # Nested selections undone in reverse order
+    nodes = [dlx.first[option] for option in (0, dlx.geometry.size + 1, 2 * dlx.geometry.size * dlx.geometry.size + 2)]
+    for node in nodes:
+        dlx.select(node)
+    for node in reversed(nodes):
+        dlx.unselect(node)
+    assert links(dlx) == before and dlx.solution == []
+
+@pytest.mark.parametrize("puzzle, solution", corpus("hard")[:3])
+def test_exhausted_search_restores_the_matrix(puzzle, solution):
+    dlx = DancingLinks(rows_of(puzzle))
+    before = links(dlx)
+    assert [flat(grid) for grid in dlx.solutions()] == [solution]
+    assert links(dlx) == before
+
+@pytest.mark.parametrize("box_size, cells", [(3, [(0, 0), (0, 4)]), (3, [(0, 0), (5, 0)]), (3, [(0, 0), (1, 1)]), (4, [(2, 3), (2, 15)]), (4, [(0, 0), (3, 3)])])
+def test_clashing_givens_are_inconsistent(box_size, cells):
+    puzzle = bytearray(box_size ** 4)
+    size = box_size * box_size
+    for x, y in cells:
+        puzzle[x * size + y] = size
+    dlx = DancingLinks(rows_of(puzzle))
+    assert not dlx.consistent
+    assert list(dlx.solutions()) == []
+
+@pytest.mark.parametrize("box_size", [3, 4])
+def test_grid_decodes_option_indices(box_size):
+    size = box_size * box_size
+    for x, y, num in [(0, 0, 1), (0, size - 1, 2), (size - 1, 0, size), (2, 7, size // 2), (size - 1, size - 1, 3)]:
+        puzzle = bytearray(size * size)
+        puzzle[x * size + y] = num
+        dlx = DancingLinks(rows_of(puzzle))
+        assert dlx.solution == [(x * size + y) * size + num - 1]
+        grid = dlx.grid()
+        assert grid[x][y] == num
+        assert sum(map(bool, flat(grid))) == 1
+
+@pytest.mark.parametrize("puzzle, solution", corpus("easy")[:3] + corpus("pathological")[:3])
+def test_proper_9x9_puzzle_has_exactly_one_solution(puzzle, solution):
+    assert [flat(grid) for grid in DancingLinks(rows_of(puzzle)).solutions()] == [solution]
+
+def test_proper_16x16_puzzle_has_exactly_one_solution():
+    # One blank per row: each is forced by the rest of its row
+    solution = pattern_solution(4)
+    puzzle = bytearray(solution)
+    for x in range(16):
+        puzzle[x * 16 + (x * 5) % 16] = 0
+    assert [flat(grid) for grid in DancingLinks(rows_of(puzzle)).solutions()] == [solution]
+
+@pytest.mark.parametrize("box_size, blanks", [(3, 60), (4, 180)])
+def test_under_constrained_puzzle_has_several_solutions(box_size, blanks):
+    puzzle = blank_cells(pattern_solution(box_size), blanks)
+    found = [flat(grid) for grid in islice(DancingLinks(rows_of(puzzle)).solutions(), 3)]
+    assert len(found) == 3 and len(set(map(bytes, found))) == 3
+    assert all(is_valid_solution(values, puzzle) for values in found)
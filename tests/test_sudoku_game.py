@@ -0,0 +1,25 @@
+import time
+
+import pytest
+
+pytest.importorskip("pygame")
+
+from sudoku import SOLVE_METHODS, Board, StepTrace, SudokuSolver
+from sudoku.sudoku_game import GAME_METHODS, game_method
+
+def test_large_boards_use_propagating_methods():
+    assert [game_method(state, 3) for state in GAME_METHODS] == ["dfs", "greedy", "astar"]
+    for box_size in (4, 5):
+        assert all(game_method(state, box_size).endswith("propagation") for state in GAME_METHODS)
+
+@pytest.mark.parametrize("state", GAME_METHODS)
+@pytest.mark.parametrize("box_size", [3, 4, 5])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_game_buttons_solve_dealt_boards_quickly(state, box_size, seed):
+    # The board Game deals, solved with a trace as start_solving does; plain DFS/greedy/A* ran for minutes on 25x25
+    board = Board(box_size, seed=seed)
+    solver = SudokuSolver(board, StepTrace())
+    start = time.perf_counter()
+    assert SOLVE_METHODS[game_method(state, box_size)](solver)
+    assert time.perf_counter() - start < 5
+    assert board.is_solved()
@@ -0,0 +1,65 @@
+import pytest
+
+from sudoku import DIFFICULTIES, PuzzleGenerator, count_solutions, decode_values, rate
+from sudoku.sudoku_benchmark import CORPORA_DIR
+from sudoku.sudoku_generator import generate_chunk
+
+from boards import is_valid_solution
+
+def rated_corpus(name):
+    with open(CORPORA_DIR / f"{name}.txt") as f:
+        return [line.split() for line in f if line.strip() and not line.startswith("#")]
+
+@pytest.mark.parametrize("seed", range(3))
+def test_generated_puzzle_is_unique_and_matches_its_solution(seed):
+    board, solution, level = PuzzleGenerator(3, seed).generate()
+    puzzle = board.values
+    assert is_valid_solution(solution, puzzle)
+    assert count_solutions(puzzle) == 1
+    assert rate(puzzle) == level
+    # Every remaining clue is needed: removing any one allows a second solution
+    for cell in range(0, 81, 7):
+        if puzzle[cell]:
+            reduced = bytearray(puzzle)
+            reduced[cell] = 0
+            assert count_solutions(reduced) == 2
+
+def test_same_seed_gives_the_same_puzzle():
+    first, second, other = (PuzzleGenerator(3, seed).generate()[0].to_string() for seed in (7, 7, 8))
+    assert first == second != other
+
+@pytest.mark.parametrize("max_difficulty", [0, 1])
+def test_max_difficulty_is_respected(max_difficulty):
+    for seed in range(3):
+        _, _, level = PuzzleGenerator(3, seed).generate(max_difficulty)
+        assert level <= max_difficulty
+
+def test_16x16_solution_grid():
+    # Carving a whole 16x16 puzzle takes most of a minute; the random full grid is the part that differs from 9x9
+    solution = PuzzleGenerator(4, 0).solution()
+    assert len(solution) == 256 and is_valid_solution(solution, solution)
+    assert solution != PuzzleGenerator(4, 1).solution()
+
+@pytest.mark.parametrize("name", ["easy", "medium", "hard"])
+def test_rate_matches_the_corpus_labels(name):
+    for puzzle, _, difficulty in rated_corpus(name):
+        assert DIFFICULTIES[rate(decode_values(puzzle))] == difficulty
+
+def test_rate_rejects_broken_puzzles():
+    clash = bytearray(81)
+    clash[0] = clash[1] = 5
+    with pytest.raises(ValueError):
+        rate(clash)
+    # (0, 8) must be 9 to finish its row, but (1, 8) already holds 9
+    dead = bytearray(81)
+    dead[0:8] = bytes(range(1, 9))
+    dead[17] = 9
+    with pytest.raises(ValueError):
+        rate(dead)
+
+def test_generate_chunk_lines_round_trip():
+    for seed, line in zip((3, 4), generate_chunk([3, 4])):
+        puzzle, solution, difficulty = line.split()
+        assert puzzle == PuzzleGenerator(3, seed).generate()[0].to_string()
+        assert is_valid_solution(decode_values(solution), decode_values(puzzle))
+        assert difficulty in DIFFICULTIES
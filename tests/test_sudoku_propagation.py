@@ -0,0 +1,84 @@
+import pytest
+
+from sudoku import Propagator
+
+from boards import blank_cells, corpus, is_valid_solution, pattern_solution, rows_of
+
+HARD = corpus("hard", "pathological")
+RULES = ("propagate_singles", "hidden_singles", "naked_subsets", "pointing")
+
+def solved_values(propagator):
+    return bytearray(mask.bit_length() for mask in propagator.candidates)
+
+@pytest.mark.parametrize("puzzle, solution", HARD[:10])
+def test_rules_never_remove_the_solution(puzzle, solution):
+    propagator = Propagator(rows_of(puzzle))
+    assert propagator.propagate()
+    for mask, num in zip(propagator.candidates, solution):
+        assert mask >> (num - 1) & 1
+
+def test_undo_restores_candidates_after_each_rule():
+    changed = set()
+    for puzzle, _ in HARD:
+        for rule in RULES + ("propagate",):
+            propagator = Propagator(rows_of(puzzle))
+            # Every rule starts from the board with the givens' singles propagated
+            if rule != "propagate_singles":
+                assert propagator.propagate_singles()
+            before = list(propagator.candidates)
+            mark = propagator.checkpoint()
+            getattr(propagator, rule)()
+            if propagator.candidates != before:
+                changed.add(rule)
+            propagator.undo(mark)
+            assert propagator.candidates == before
+    # Otherwise the loop above proves nothing about that rule
+    assert changed == set(RULES + ("propagate",))
+
+@pytest.mark.parametrize("puzzle, solution", HARD[:10])
+def test_undo_restores_candidates_after_a_wrong_guess(puzzle, solution):
+    propagator = Propagator(rows_of(puzzle))
+    assert propagator.propagate()
+    before = list(propagator.candidates)
+    cell = next(cell for cell, mask in enumerate(before) if mask.bit_count() > 1)
+    wrong = next(num for num in range(1, 10) if before[cell] >> (num - 1) & 1 and num != solution[cell])
+    mark = propagator.checkpoint()
+    if propagator.assign(cell, wrong):
+        propagator.search()
+    propagator.undo(mark)
+    assert propagator.candidates == before
+    assert propagator.search() and solved_values(propagator) == solution
+
+@pytest.mark.parametrize("puzzle, solution", corpus("easy", "medium")[::5] + HARD)
+def test_search_finds_the_unique_solution(puzzle, solution):
+    propagator = Propagator(rows_of(puzzle))
+    assert propagator.count() == 1
+    assert propagator.search()
+    assert solved_values(propagator) == solution
+
+@pytest.mark.parametrize("box_size, blanks, limit", [(3, 60, 5), (4, 150, 2)])
+def test_count_stops_at_the_limit_and_leaves_the_state_unchanged(box_size, blanks, limit):
+    puzzle = blank_cells(pattern_solution(box_size), blanks)
+    propagator, fresh = Propagator(rows_of(puzzle)), Propagator(rows_of(puzzle))
+    assert propagator.count(limit) == limit
+    assert propagator.candidates == fresh.candidates
+    assert propagator.propagate() and fresh.propagate()
+    assert propagator.candidates == fresh.candidates
+    assert propagator.search() and is_valid_solution(solved_values(propagator), puzzle)
+
+def test_clashing_givens_are_a_contradiction():
+    puzzle = bytearray(81)
+    puzzle[0] = puzzle[5] = 7
+    assert not Propagator(rows_of(puzzle)).search()
+    assert Propagator(rows_of(puzzle)).count() == 0
+
+def test_a_cell_without_candidates_is_a_contradiction():
+    # (0, 8) must be 9 to finish its row, but (1, 8) already holds 9
+    puzzle = bytearray(81)
+    puzzle[0:8] = bytes(range(1, 9))
+    puzzle[17] = 9
+    propagator = Propagator(rows_of(puzzle))
+    assert propagator.consistent
+    assert not propagator.propagate()
+    assert not Propagator(rows_of(puzzle)).search()
+    assert Propagator(rows_of(puzzle)).count() == 0
@@ -0,0 +1,73 @@
+import pytest
+
+from sudoku import SOLVE_METHODS, Board, Cell, CellView, SudokuSolver
+
+from boards import blank_cells, corpus, is_valid_solution, pattern_solution
+
+EASY = corpus("easy")[::4]
+HARD = corpus("hard")[::4] + corpus("pathological")
+# Plain row-major DFS takes seconds even on some easy puzzles, A* on the hard ones
+FAST = ("mrv", "propagation", "dlx", "greedy", "greedy-propagation", "astar-propagation")
+
+def solve(method, values):
+    board = Board(int(len(values) ** 0.25 + 0.5), bytearray(values))
+    solver = SudokuSolver(board)
+    return SOLVE_METHODS[method](solver), board
+
+@pytest.mark.parametrize("method", SOLVE_METHODS)
+@pytest.mark.parametrize("puzzle, solution", EASY[:2])
+def test_every_method_solves_easy_puzzles(method, puzzle, solution):
+    found, board = solve(method, puzzle)
+    assert found and board.values == solution and board.is_solved()
+
+@pytest.mark.parametrize("method", FAST)
+@pytest.mark.parametrize("puzzle, solution", EASY + HARD)
+def test_fast_methods_solve_corpus_puzzles(method, puzzle, solution):
+    found, board = solve(method, puzzle)
+    assert found and board.values == solution
+
+@pytest.mark.parametrize("method", ("propagation", "dlx", "greedy-propagation", "astar-propagation"))
+@pytest.mark.parametrize("box_size, blanks", [(4, 160), (5, 300)])
+def test_large_boards(method, box_size, blanks):
+    puzzle = blank_cells(pattern_solution(box_size), blanks, seed=box_size)
+    found, board = solve(method, puzzle)
+    assert found and board.is_solved() and is_valid_solution(board.values, puzzle)
+
+@pytest.mark.parametrize("method", SOLVE_METHODS)
+def test_unsolvable_puzzle_is_reported(method):
+    # (0, 8) must be 9 to finish its row, but (1, 8) already holds 9
+    puzzle = bytearray(81)
+    puzzle[0:8] = bytes(range(1, 9))
+    puzzle[17] = 9
+    found, board = solve(method, puzzle)
+    assert not found
+    assert not board.is_solved()
+
+@pytest.mark.parametrize("method", SOLVE_METHODS)
+def test_board_solves_skip_cell_views(method, monkeypatch):
+    # The search reads and writes the board's array; per-cell property access made DFS 2x slower
+    def per_cell(view, *args):
+        raise AssertionError("solver went through CellView")
+    monkeypatch.setattr(CellView, "value", property(per_cell, per_cell))
+    puzzle, solution = EASY[0]
+    found, board = solve(method, puzzle)
+    assert found and board.values == solution
+
+@pytest.mark.parametrize("method", SOLVE_METHODS)
+def test_cell_grids_match_boards(method):
+    puzzle, solution = EASY[1]
+    cells = [[Cell(x, y, puzzle[x * 9 + y]) for y in range(9)] for x in range(9)]
+    solver, board_solver = SudokuSolver(cells), SudokuSolver(Board(3, bytearray(puzzle)))
+    assert SOLVE_METHODS[method](solver) and SOLVE_METHODS[method](board_solver)
+    assert bytes(cell.value for row in cells for cell in row) == solution
+    assert solver.nodes == board_solver.nodes
+
+def test_dlx_modes_count_and_list_solutions():
+    puzzle, solution = EASY[0]
+    solver = SudokuSolver(Board(3, bytearray(puzzle)))
+    assert solver.solve_by_dlx("count") == 1
+    assert solver.solve_by_dlx("all") == [[list(solution[x * 9:(x + 1) * 9]) for x in range(9)]]
+    open_puzzle = SudokuSolver(Board(3, blank_cells(pattern_solution(3), 70)))
+    assert open_puzzle.solve_by_dlx("count", limit=3) == 3
+    with pytest.raises(ValueError):
+        solver.solve_by_dlx("fastest")
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from sudoku import SOLVE_METHODS, Board, SudokuSolver
+from sudoku.sudoku_trace import Playback, StepTrace
+
+from boards import blank_cells, corpus, pattern_solution
+
+PUZZLE, SOLUTION = corpus("easy")[0]
+
+def traced_solve(method, limit=1_000_000, max_bytes=64 << 20):
+    board = Board(3, bytearray(PUZZLE))
+    trace = StepTrace(limit, max_bytes)
+    SOLVE_METHODS[method](SudokuSolver(board, trace))
+    return board, trace
+
+@pytest.mark.parametrize("method", SOLVE_METHODS)
+def test_replay_reaches_the_solution(method):
+    board, trace = traced_solve(method)
+    assert board.values == SOLUTION and not trace.truncated
+    values = bytearray(PUZZLE)
+    for index in range(len(trace)):
+        trace.apply(values, index)
+    assert values == SOLUTION
+
+def test_truncated_trace_finishes_on_the_result():
+    board, trace = traced_solve("mrv", limit=5)
+    assert len(trace) == 5 and trace.truncated
+    playback = Playback(board, trace, PUZZLE, rate=1000)
+    assert board.values == PUZZLE
+    assert not playback.advance(1)
+    assert board.values == SOLUTION
+
+def test_board_loads_are_stored_as_changes():
+    # A* on 25x25 loads a whole board per node; full copies added up to hundreds of MB
+    trace = StepTrace()
+    values = blank_cells(pattern_solution(5), 300)
+    trace.set(0, 7)  # Trước lần nạp đầu thì chưa biết bảng, lần nạp đầu giữ cả bảng
+    states = [None]
+    for cell in range(300):
+        values[cell], values[cell + 1] = values[cell + 1], values[cell]
+        trace.load(values)
+        states.append(bytes(values))
+        values[cell] = 0
+        trace.set(cell, 0)
+        states.append(bytes(values))
+    assert trace.board_bytes < 625 + 300 * 2 * 4
+
+    replay = bytearray(625)
+    for index, state in enumerate(states):
+        trace.apply(replay, index)
+        assert state is None or replay == state
+
+def test_board_bytes_cap_truncates_the_trace():
+    board, trace = traced_solve("astar", max_bytes=100)
+    assert trace.truncated and trace.board_bytes < 100 + 81
+    playback = Playback(board, trace, PUZZLE, rate=1000)
+    assert not playback.advance(10)
+    assert board.values == SOLUTION
+
+def test_fast_playback_applies_several_steps_per_frame():
+    board, trace = traced_solve("mrv")
+    playback = Playback(board, trace, PUZZLE, rate=100)
+    assert playback.advance(1 / 60) and playback.position == 1
+    assert playback.advance(1 / 60) and playback.position == 3  # Phần lẻ được cộng dồn
+    playback.rate = 6000
+    assert playback.advance(1 / 60) and playback.position == 103
+    playback.finish()
+    assert playback.done() and board.values == SOLUTION
+
+def test_playback_follows_a_running_solve():
+    shown = Board(3, bytearray(PUZZLE))
+    board, trace = shown.copy(), StepTrace()
+    playback = Playback(shown, trace, PUZZLE, rate=1e9, running=True)
+    release = threading.Event()
+
+    def work():
+        solver = SudokuSolver(board, trace)
+        solver.record(0, 0, 9)
+        release.wait()
+        SOLVE_METHODS["mrv"](SudokuSolver(board, trace))
+        playback.complete(board.values)
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    while not len(trace):
+        pass
+    assert playback.advance(1) and shown.values[0] == 9  # Bước đã ghi được phát ngay
+    playback.finish()
+    assert playback.advance(1) and not playback.done()  # Chưa giải xong thì chỉ hẹn nhảy tới kết quả
+    release.set()
+    thread.join()
+    assert not playback.advance(0) and shown.values == SOLUTION
@@ -0,0 +1,133 @@
+import random
+
+import numpy as np
+import pytest
+
+from sudoku import Propagator, geometry, propagate_batch, solve_batch, unit_name, validate_batch
+
+from boards import blank_cells, corpus, is_valid_solution, pattern_solution, rows_of
+
+PUZZLES = corpus("easy") + corpus("hard") + corpus("pathological")
+# (0, 8) must be 9 to finish its row, but (1, 8) already holds 9
+DEAD = bytearray(range(1, 9)) + bytearray(1) + bytearray(8) + bytearray([9]) + bytearray(63)
+
+def first_bad_unit(values):
+    """The scalar check: index of the first unit in Geometry.units order not holding 1..size once each"""
+    geo = geometry(int(len(values) ** 0.25 + 0.5))
+    full = set(range(1, geo.size + 1))
+    for index, unit in enumerate(geo.units):
+        if sorted(values[cell] for cell in unit) != sorted(full):
+            return index
+    return -1
+
+def shuffled_solution(box_size, rng):
+    """A random valid solution: the pattern grid with its numbers relabelled"""
+    size = box_size * box_size
+    labels = list(range(1, size + 1))
+    rng.shuffle(labels)
+    return bytearray(labels[num - 1] for num in pattern_solution(box_size))
+
+def validation_batch(box_size, count, seed=0):
+    """Valid solutions mixed with ones broken by a swap, a blank or an out-of-range value"""
+    rng = random.Random(seed)
+    size = box_size * box_size
+    boards = []
+    for i in range(count):
+        values = shuffled_solution(box_size, rng)
+        a, b = rng.sample(range(size * size), 2)
+        kind = i % 4
+        if kind == 1:
+            values[a], values[b] = values[b], values[a]
+        elif kind == 2:
+            values[a] = 0
+        elif kind == 3:
+            values[a] = rng.choice((size + 1, 255))
+        boards.append(list(values))
+    return np.array(boards, dtype=np.uint8)
+
+@pytest.mark.parametrize("box_size", [2, 3, 4])
+def test_validator_matches_scalar_check(box_size):
+    boards = validation_batch(box_size, 200, seed=box_size)
+    ok, first = validate_batch(boards, chunk=64)
+    expected = [first_bad_unit(list(values)) for values in boards]
+    assert first.tolist() == expected
+    assert ok.tolist() == [index == -1 for index in expected]
+    assert ok.any() and not ok.all()
+
+def test_validator_accepts_square_boards():
+    boards = validation_batch(3, 40)
+    flat = validate_batch(boards)
+    square = validate_batch(boards.reshape(-1, 9, 9))
+    assert all((a == b).all() for a, b in zip(flat, square))
+
+def test_unit_names_follow_geometry_order():
+    assert [unit_name(unit, 9) for unit in (0, 8, 9, 26)] == ["row 0", "row 8", "column 0", "box 8"]
+
+@pytest.mark.parametrize("shape", [(3, 80), (3, 9, 8), (81,), (2, 3, 9, 9)])
+def test_validator_rejects_bad_shapes(shape):
+    with pytest.raises(ValueError):
+        validate_batch(np.zeros(shape, dtype=np.uint8))
+
+def singles_fixpoint(values):
+    """Candidate masks after the scalar naked and hidden singles, the rules propagate_batch applies; None on a contradiction"""
+    propagator = Propagator(rows_of(values))
+    while True:
+        mark = len(propagator.trail)
+        if not (propagator.propagate_singles() and propagator.hidden_singles()):
+            return None
+        if len(propagator.trail) == mark:
+            return propagator.candidates
+
+def batch_masks(candidates):
+    return [[sum(1 << num for num in np.flatnonzero(cell)) for cell in board] for board in candidates]
+
+@pytest.mark.parametrize("box_size, puzzles", [
+    (3, [puzzle for puzzle, _ in PUZZLES] + [DEAD]),
+    (4, [blank_cells(pattern_solution(4), blanks, seed=blanks) for blanks in (60, 120, 160, 200)]),
+])
+def test_batch_propagation_matches_scalar_singles(box_size, puzzles):
+    size = box_size * box_size
+    boards = np.array([list(values) for values in puzzles])[:, :, None]
+    candidates = (boards == np.arange(1, size + 1)) | (boards == 0)
+    contradiction = propagate_batch(candidates, box_size)
+    expected = [singles_fixpoint(values) for values in puzzles]
+    assert contradiction.tolist() == [masks is None for masks in expected]
+    for masks, found, bad in zip(expected, batch_masks(candidates), contradiction):
+        if not bad:
+            assert found == masks
+
+def test_solve_batch_matches_corpus_solutions():
+    boards = np.array([list(puzzle) for puzzle, _ in PUZZLES])
+    solutions, solved, propagated = solve_batch(boards.reshape(-1, 9, 9))
+    assert solved.all()
+    assert solutions.tolist() == [list(solution) for _, solution in PUZZLES]
+    expected = [all(mask.bit_count() == 1 for mask in singles_fixpoint(puzzle)) for puzzle, _ in PUZZLES]
+    assert propagated.tolist() == expected
+    assert any(expected) and not all(expected)
+
+def test_solve_batch_without_fallback_leaves_open_cells():
+    boards = np.array([list(puzzle) for puzzle, _ in PUZZLES])
+    solutions, solved, propagated = solve_batch(boards, fallback=False)
+    assert (solved == propagated).all()
+    for values, (puzzle, solution), done in zip(solutions, PUZZLES, solved):
+        assert done == (0 not in values)
+        assert all(num in (0, expected) for num, expected in zip(values, solution))
+
+def test_solve_batch_reports_unsolvable_boards():
+    # Propagation alone can't refute the second board: every cell keeps a candidate until the search
+    hard = bytearray(PUZZLES[-1][0])
+    empty = hard.index(0)
+    hard[empty] = next(num for num in range(1, 10) if num != PUZZLES[-1][1][empty] and singles_fixpoint(hard[:empty] + bytes([num]) + hard[empty + 1:]))
+    solutions, solved, propagated = solve_batch(np.array([list(DEAD), list(hard), list(PUZZLES[0][0])]))
+    assert solved.tolist() == [False, False, True] and not propagated[:2].any()
+
+def test_solve_batch_large_boards():
+    puzzles = [blank_cells(pattern_solution(4), 180, seed=seed) for seed in range(3)]
+    solutions, solved, _ = solve_batch(np.array([list(values) for values in puzzles]))
+    assert solved.all() and all(is_valid_solution(bytearray(values), puzzle) for values, puzzle in zip(solutions, puzzles))
+
+def test_solve_batch_rejects_out_of_range_values():
+    boards = np.zeros((2, 81), dtype=np.int64)
+    boards[1, 5] = 10
+    with pytest.raises(ValueError):
+        solve_batch(boards)